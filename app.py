@@ -4,6 +4,11 @@ from flask_migrate import Migrate
 from config import Config
 from models import db
 from routes import register_blueprints
+from resources.search import search_cli
+from resources.counters import stats_cli
+from resources.notifications import notifications_cli
+from resources.swap_matching import swap_cli
+from resources.review_queue import requests_cli
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -16,6 +21,13 @@ migrate = Migrate(app, db)
 # Register Blueprints
 register_blueprints(app)
 
+# Register CLI commands
+app.cli.add_command(search_cli)
+app.cli.add_command(stats_cli)
+app.cli.add_command(notifications_cli)
+app.cli.add_command(swap_cli)
+app.cli.add_command(requests_cli)
+
 
 with app.app_context():
     db.create_all()
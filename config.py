@@ -13,4 +13,35 @@ class Config:
     DB_HOST = os.getenv('DB_HOST')
     DB_PORT = os.getenv('DB_PORT', 3306)
     DB_NAME = os.getenv('DB_NAME')
-    SQLALCHEMY_DATABASE_URI = f'mysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = f'mysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+    # Password Hashing Configurations
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))  # bcrypt cost factor, existing hashes are upgraded on login
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))  # concurrent signup/login/password-change hashes per process
+    BULK_HASH_WORKERS = int(os.getenv('BULK_HASH_WORKERS', max((os.cpu_count() or 2) // 2, 1)))  # concurrent import hashes per process, a separate pool
+
+    # Bulk Import Configurations
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv('BULK_IMPORT_CHUNK_SIZE', 500))  # rows validated and inserted per transaction
+
+    # Review Queue Configurations
+    REVIEW_QUEUE_URGENCY_HOURS = int(os.getenv('REVIEW_QUEUE_URGENCY_HOURS', 24))  # waiting time one urgency level is worth (run `flask requests rebuild-queue` after changing)
+    REVIEW_QUEUE_APPEAL_HOURS = int(os.getenv('REVIEW_QUEUE_APPEAL_HOURS', 72))  # waiting time an appeal is worth
+    REVIEW_QUEUE_LEASE_SECONDS = int(os.getenv('REVIEW_QUEUE_LEASE_SECONDS', 600))  # how long a claimed request is hidden from other staff
+
+    # Swap Configurations
+    SWAP_MAX_CYCLE_LENGTH = int(os.getenv('SWAP_MAX_CYCLE_LENGTH', 4))  # most students exchanging placements in one matched swap (2 = direct swaps only)
+
+    # Notification Configurations
+    NOTIFICATION_FANOUT_MODE = os.getenv('NOTIFICATION_FANOUT_MODE', 'inline')  # 'inline' or 'outbox' (run `flask notifications process-outbox`)
+    SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))  # keepalive interval, also the re-check interval for other processes' writes
+    SSE_MAX_DURATION = int(os.getenv('SSE_MAX_DURATION', 300))  # seconds before a stream closes and the client reconnects
+    NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', 90))  # read notifications older than this leave the hot table
+    NOTIFICATION_RETENTION_MODE = os.getenv('NOTIFICATION_RETENTION_MODE', 'archive')  # 'archive' (to notifications_archive) or 'delete'
+    NOTIFICATION_RETENTION_BATCH_SIZE = int(os.getenv('NOTIFICATION_RETENTION_BATCH_SIZE', 1000))  # rows per purge transaction
+    NOTIFICATION_RETENTION_PAUSE = float(os.getenv('NOTIFICATION_RETENTION_PAUSE', 0.1))  # seconds between purge batches
+
+    # Cache Configurations
+    COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', 30))  # seconds a paginated total is reused
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))  # seconds an authenticated user/role is reused
+    TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', 300))  # seconds a verified token signature is trusted
+    REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', 60))  # seconds before roles/specialities/sections/groups are reloaded
\ No newline at end of file
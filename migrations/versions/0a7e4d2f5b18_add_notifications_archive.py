@@ -0,0 +1,59 @@
+"""add notifications_archive and the retention index
+
+Revision ID: 0a7e4d2f5b18
+Revises: f18d2c6b9a47
+Create Date: 2026-10-18 16:05:44.219830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a7e4d2f5b18'
+down_revision = 'f18d2c6b9a47'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_notifications_archive_user_created', 'notifications_archive', ['user_id', 'created_at']),
+    ('ix_notifications_read_created', 'notifications', ['is_read', 'created_at']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # db.create_all() may already have built the table and these indexes
+    if 'notifications_archive' not in _existing_tables():
+        op.create_table('notifications_archive',
+            sa.Column('notification_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('notification_type', sa.String(length=128), nullable=False),
+            sa.Column('is_read', sa.Boolean(), nullable=False),
+            sa.Column('archived_at', sa.TIMESTAMP(), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('notification_id')
+        )
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables and name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    tables = _existing_tables()
+    if 'notifications' in tables and 'ix_notifications_read_created' in _existing_indexes('notifications'):
+        op.drop_index('ix_notifications_read_created', table_name='notifications')
+
+    op.drop_table('notifications_archive')
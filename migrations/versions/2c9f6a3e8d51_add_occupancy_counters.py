@@ -0,0 +1,78 @@
+"""add group_occupancy and section_occupancy
+
+Revision ID: 2c9f6a3e8d51
+Revises: 0a7e4d2f5b18
+Create Date: 2026-10-18 17:12:30.486512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c9f6a3e8d51'
+down_revision = '0a7e4d2f5b18'
+branch_labels = None
+depends_on = None
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = _existing_tables()
+    # db.create_all() may already have built the (empty) tables
+    if 'group_occupancy' not in tables:
+        op.create_table('group_occupancy',
+            sa.Column('group_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('students', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('group_id')
+        )
+    if 'section_occupancy' not in tables:
+        op.create_table('section_occupancy',
+            sa.Column('section_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('students', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('section_id')
+        )
+    if not {'groups', 'sections', 'students'} <= tables:
+        return
+
+    # start from the current placements, whoever created the tables
+    group_occupancy = sa.table('group_occupancy', sa.column('group_id'), sa.column('students'),
+                               sa.column('created_at'), sa.column('updated_at'))
+    section_occupancy = sa.table('section_occupancy', sa.column('section_id'), sa.column('students'),
+                                 sa.column('created_at'), sa.column('updated_at'))
+    groups = sa.table('groups', sa.column('group_id'))
+    sections = sa.table('sections', sa.column('section_id'))
+    students = sa.table('students', sa.column('section_id'), sa.column('tutorial_group_id'), sa.column('lab_group_id'))
+    op.execute(group_occupancy.delete())
+    op.execute(section_occupancy.delete())
+    op.execute(group_occupancy.insert().from_select(
+        ['group_id', 'students', 'created_at', 'updated_at'],
+        sa.select(
+            groups.c.group_id,
+            sa.select(sa.func.count()).where(sa.or_(
+                students.c.tutorial_group_id == groups.c.group_id,
+                students.c.lab_group_id == groups.c.group_id,
+            )).scalar_subquery(),
+            sa.func.now(), sa.func.now(),
+        )
+    ))
+    op.execute(section_occupancy.insert().from_select(
+        ['section_id', 'students', 'created_at', 'updated_at'],
+        sa.select(
+            sections.c.section_id,
+            sa.select(sa.func.count()).where(students.c.section_id == sections.c.section_id).scalar_subquery(),
+            sa.func.now(), sa.func.now(),
+        )
+    ))
+
+
+def downgrade():
+    op.drop_table('section_occupancy')
+    op.drop_table('group_occupancy')
@@ -0,0 +1,52 @@
+"""add indexes on hot filter columns
+
+Revision ID: 3f9a1c2b7d41
+Revises: 
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7d41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_requests_student_type_status', 'requests', ['student_id', 'request_type', 'status']),
+    ('ix_requests_created_at', 'requests', ['created_at', 'request_id']),
+    ('ix_notifications_user_read_created', 'notifications', ['user_id', 'is_read', 'created_at']),
+    ('ix_notifications_user_created', 'notifications', ['user_id', 'created_at', 'notification_id']),
+    ('ix_students_section_id', 'students', ['section_id']),
+    ('ix_students_tutorial_group_id', 'students', ['tutorial_group_id']),
+    ('ix_students_lab_group_id', 'students', ['lab_group_id']),
+    ('ix_students_created_at', 'students', ['created_at', 'student_id']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # tables are created by db.create_all(), which already builds these
+    # indexes on a fresh database, so only add the missing ones
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables and name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    tables = _existing_tables()
+    for name, table, columns in reversed(INDEXES):
+        if table in tables and name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
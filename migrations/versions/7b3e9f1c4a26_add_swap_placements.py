@@ -0,0 +1,75 @@
+"""add current/requested placements to swap requests
+
+Revision ID: 7b3e9f1c4a26
+Revises: 2c9f6a3e8d51
+Create Date: 2026-10-18 18:40:11.902634
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9f1c4a26'
+down_revision = '2c9f6a3e8d51'
+branch_labels = None
+depends_on = None
+
+
+# table -> [(column, foreign key, referenced table, referenced column)], placement index
+PLACEMENTS = {
+    'swap_group_requests': ([
+        ('current_group_id', 'fk_swap_group_requests_current_group', 'groups', 'group_id'),
+        ('requested_group_id', 'fk_swap_group_requests_requested_group', 'groups', 'group_id'),
+    ], 'ix_swap_group_requests_placement'),
+    'swap_section_requests': ([
+        ('current_section_id', 'fk_swap_section_requests_current_section', 'sections', 'section_id'),
+        ('requested_section_id', 'fk_swap_section_requests_requested_section', 'sections', 'section_id'),
+    ], 'ix_swap_section_requests_placement'),
+}
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # existing swaps never recorded where they wanted to go, so they keep NULL
+    # placements and are left out of automatic matching; db.create_all() builds
+    # the columns with a new table but never adds them to an existing one
+    tables = _existing_tables()
+    for table, (columns, index) in PLACEMENTS.items():
+        if table not in tables:
+            continue
+        missing = [column for column in columns if column[0] not in _existing_columns(table)]
+        if missing:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                for column, foreign_key, referenced_table, referenced_column in missing:
+                    batch_op.add_column(sa.Column(column, sa.Integer(), nullable=True))
+                    batch_op.create_foreign_key(foreign_key, referenced_table, [column], [referenced_column])
+        if index not in _existing_indexes(table):
+            op.create_index(index, table, [column for column, *_ in columns])
+
+
+def downgrade():
+    with op.batch_alter_table('swap_section_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_swap_section_requests_placement')
+        batch_op.drop_constraint('fk_swap_section_requests_requested_section', type_='foreignkey')
+        batch_op.drop_constraint('fk_swap_section_requests_current_section', type_='foreignkey')
+        batch_op.drop_column('requested_section_id')
+        batch_op.drop_column('current_section_id')
+
+    with op.batch_alter_table('swap_group_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_swap_group_requests_placement')
+        batch_op.drop_constraint('fk_swap_group_requests_requested_group', type_='foreignkey')
+        batch_op.drop_constraint('fk_swap_group_requests_current_group', type_='foreignkey')
+        batch_op.drop_column('requested_group_id')
+        batch_op.drop_column('current_group_id')
@@ -0,0 +1,57 @@
+"""add search_tokens name index
+
+Revision ID: 8c2e5d0a6b13
+Revises: 3f9a1c2b7d41
+Create Date: 2026-10-18 10:41:07.552964
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2e5d0a6b13'
+down_revision = '3f9a1c2b7d41'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_search_tokens_type_token', ['entity_type', 'token', 'entity_id']),
+    ('ix_search_tokens_entity', ['entity_type', 'entity_id']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # db.create_all() may already have built the table and its indexes
+    if 'search_tokens' not in _existing_tables():
+        op.create_table('search_tokens',
+            sa.Column('search_token_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('entity_type', sa.String(length=32), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('token', sa.String(length=64), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('search_token_id')
+        )
+    for name, columns in INDEXES:
+        if name not in _existing_indexes('search_tokens'):
+            op.create_index(name, 'search_tokens', columns)
+
+    # run `flask search reindex` afterwards to index the existing names
+
+
+def downgrade():
+    with op.batch_alter_table('search_tokens', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_tokens_entity')
+        batch_op.drop_index('ix_search_tokens_type_token')
+
+    op.drop_table('search_tokens')
@@ -0,0 +1,97 @@
+"""add swap_board
+
+Revision ID: 9d4f2a7c1e60
+Revises: 7b3e9f1c4a26
+Create Date: 2026-10-18 19:26:05.118730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f2a7c1e60'
+down_revision = '7b3e9f1c4a26'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_swap_board_speciality', ['speciality_id', 'status', 'urgency', 'created_at', 'request_id']),
+    ('ix_swap_board_placement', ['swap_type', 'requested_id', 'status', 'urgency', 'created_at', 'request_id']),
+    ('ix_swap_board_student', ['student_id', 'created_at', 'request_id']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    tables = _existing_tables()
+    # db.create_all() may already have built the (empty) table and its indexes
+    if 'swap_board' not in tables:
+        op.create_table('swap_board',
+            sa.Column('request_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('swap_type', sa.String(length=16), nullable=False),
+            sa.Column('swap_request_id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('student_name', sa.String(length=255), nullable=True),
+            sa.Column('speciality_id', sa.Integer(), nullable=True),
+            sa.Column('current_id', sa.Integer(), nullable=True),
+            sa.Column('requested_id', sa.Integer(), nullable=True),
+            sa.Column('requested_student_id', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=64), nullable=False),
+            sa.Column('urgency', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('request_id')
+        )
+    for name, columns in INDEXES:
+        if name not in _existing_indexes('swap_board'):
+            op.create_index(name, 'swap_board', columns)
+    if not {'requests', 'students', 'swap_group_requests', 'swap_section_requests'} <= tables:
+        return
+
+    # add the existing swaps that are not on the board yet
+    swap_board = sa.table('swap_board', *(sa.column(name) for name in (
+        'request_id', 'swap_type', 'swap_request_id', 'student_id', 'student_name', 'speciality_id',
+        'current_id', 'requested_id', 'requested_student_id', 'status', 'urgency', 'created_at', 'updated_at',
+    )))
+    requests = sa.table('requests', sa.column('request_id'), sa.column('student_id'), sa.column('status'),
+                        sa.column('urgency'), sa.column('created_at'))
+    students = sa.table('students', sa.column('student_id'), sa.column('speciality_id'),
+                        sa.column('first_name', sa.String), sa.column('last_name', sa.String))
+    for swap_type, table_name, id_column, placement in (
+        ('group', 'swap_group_requests', 'swap_group_request_id', 'group_id'),
+        ('section', 'swap_section_requests', 'swap_section_request_id', 'section_id'),
+    ):
+        swaps = sa.table(table_name, sa.column(id_column), sa.column('request_id'), sa.column('requested_student_id'),
+                         sa.column(f'current_{placement}'), sa.column(f'requested_{placement}'))
+        op.execute(swap_board.insert().from_select(
+            ['request_id', 'swap_type', 'swap_request_id', 'student_id', 'student_name', 'speciality_id',
+             'current_id', 'requested_id', 'requested_student_id', 'status', 'urgency', 'created_at', 'updated_at'],
+            sa.select(
+                requests.c.request_id, sa.literal(swap_type), swaps.c[id_column], requests.c.student_id,
+                students.c.first_name + ' ' + students.c.last_name, students.c.speciality_id,
+                swaps.c[f'current_{placement}'], swaps.c[f'requested_{placement}'], swaps.c.requested_student_id,
+                requests.c.status, requests.c.urgency, requests.c.created_at, sa.func.now(),
+            )
+            .select_from(swaps)
+            .join(requests, requests.c.request_id == swaps.c.request_id)
+            .join(students, students.c.student_id == requests.c.student_id)
+            .where(~sa.exists().where(swap_board.c.request_id == requests.c.request_id))
+        ))
+
+
+def downgrade():
+    with op.batch_alter_table('swap_board', schema=None) as batch_op:
+        batch_op.drop_index('ix_swap_board_student')
+        batch_op.drop_index('ix_swap_board_placement')
+        batch_op.drop_index('ix_swap_board_speciality')
+
+    op.drop_table('swap_board')
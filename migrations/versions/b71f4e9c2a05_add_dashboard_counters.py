@@ -0,0 +1,37 @@
+"""add dashboard_counters
+
+Revision ID: b71f4e9c2a05
+Revises: 8c2e5d0a6b13
+Create Date: 2026-10-18 11:26:53.014877
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71f4e9c2a05'
+down_revision = '8c2e5d0a6b13'
+branch_labels = None
+depends_on = None
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    # db.create_all() may already have built the table
+    if 'dashboard_counters' not in _existing_tables():
+        op.create_table('dashboard_counters',
+            sa.Column('name', sa.String(length=64), nullable=False),
+            sa.Column('value', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('name')
+        )
+    # the rows are filled by the first dashboard read or `flask stats rebuild-counters`
+
+
+def downgrade():
+    op.drop_table('dashboard_counters')
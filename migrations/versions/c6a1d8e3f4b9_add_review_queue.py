@@ -0,0 +1,91 @@
+"""add review_queue
+
+Revision ID: c6a1d8e3f4b9
+Revises: 9d4f2a7c1e60
+Create Date: 2026-10-18 20:03:47.551209
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a1d8e3f4b9'
+down_revision = '9d4f2a7c1e60'
+branch_labels = None
+depends_on = None
+
+# default REVIEW_QUEUE_URGENCY_HOURS / REVIEW_QUEUE_APPEAL_HOURS; run
+# `flask requests rebuild-queue` when the application uses other weights
+URGENCY_HOURS = 24
+APPEAL_HOURS = 72
+
+
+INDEXES = [
+    ('ix_review_queue_priority', ['priority_at', 'request_id']),
+    ('ix_review_queue_type_priority', ['request_type', 'priority_at', 'request_id']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    tables = _existing_tables()
+    # db.create_all() may already have built the (empty) table and its indexes
+    if 'review_queue' not in tables:
+        op.create_table('review_queue',
+            sa.Column('request_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('request_type', sa.String(length=64), nullable=False),
+            sa.Column('priority_at', sa.DateTime(), nullable=False),
+            sa.Column('claimed_by', sa.Integer(), nullable=True),
+            sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('request_id')
+        )
+    for name, columns in INDEXES:
+        if name not in _existing_indexes('review_queue'):
+            op.create_index(name, 'review_queue', columns)
+    if 'requests' not in tables:
+        return
+
+    # add the requests waiting for staff that are not queued yet
+    review_queue = sa.table('review_queue', sa.column('request_id'), sa.column('request_type'), sa.column('priority_at'),
+                            sa.column('created_at'), sa.column('updated_at'))
+    requests = sa.table('requests', sa.column('request_id'), sa.column('request_type'), sa.column('created_at', sa.DateTime),
+                        sa.column('urgency'), sa.column('status'))
+    rows = op.get_bind().execute(
+        sa.select(requests.c.request_id, requests.c.request_type, requests.c.created_at, requests.c.urgency, requests.c.status)
+        .where(
+            requests.c.status.in_(['pending', 'appealed']), requests.c.request_type.in_(['group', 'section']),
+            ~sa.exists().where(review_queue.c.request_id == requests.c.request_id),
+        )
+    ).all()
+    now = datetime.utcnow()
+    if rows:
+        op.bulk_insert(review_queue, [
+            {
+                'request_id': request_id, 'request_type': request_type,
+                'priority_at': (created_at or now) - timedelta(
+                    hours=urgency * URGENCY_HOURS + (APPEAL_HOURS if status == 'appealed' else 0)
+                ),
+                'created_at': now, 'updated_at': now,
+            }
+            for request_id, request_type, created_at, urgency, status in rows
+        ])
+
+
+def downgrade():
+    with op.batch_alter_table('review_queue', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_queue_type_priority')
+        batch_op.drop_index('ix_review_queue_priority')
+
+    op.drop_table('review_queue')
@@ -0,0 +1,45 @@
+"""add teacher assignment indexes
+
+Revision ID: d4a81f6e3c92
+Revises: b71f4e9c2a05
+Create Date: 2026-10-18 12:03:38.771402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a81f6e3c92'
+down_revision = 'b71f4e9c2a05'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_teacher_groups_teacher_group', 'teacher_groups', ['teacher_id', 'group_id']),
+    ('ix_teacher_sections_teacher_section', 'teacher_sections', ['teacher_id', 'section_id']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # db.create_all() builds these with the tables on a fresh database
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables and name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    tables = _existing_tables()
+    for name, table, columns in reversed(INDEXES):
+        if table in tables and name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
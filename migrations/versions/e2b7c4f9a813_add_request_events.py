@@ -0,0 +1,80 @@
+"""add request_events
+
+Revision ID: e2b7c4f9a813
+Revises: c6a1d8e3f4b9
+Create Date: 2026-10-18 20:41:19.370482
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c4f9a813'
+down_revision = 'c6a1d8e3f4b9'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_request_events_request', ['request_id', 'event_id']),
+    ('ix_request_events_student', ['student_id', 'created_at', 'event_id']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    tables = _existing_tables()
+    # db.create_all() may already have built the (empty) table and its indexes
+    if 'request_events' not in tables:
+        op.create_table('request_events',
+            sa.Column('event_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('request_id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('request_type', sa.String(length=64), nullable=False),
+            sa.Column('from_status', sa.String(length=64), nullable=True),
+            sa.Column('to_status', sa.String(length=64), nullable=False),
+            sa.Column('reason', sa.Text(), nullable=True),
+            sa.Column('comment', sa.String(length=512), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('event_id')
+        )
+    for name, columns in INDEXES:
+        if name not in _existing_indexes('request_events'):
+            op.create_index(name, 'request_events', columns)
+    if 'requests' not in tables:
+        return
+
+    # the earlier history was overwritten: each request without events starts from its current state
+    request_events = sa.table('request_events', *(sa.column(name) for name in (
+        'request_id', 'student_id', 'request_type', 'to_status', 'reason', 'comment', 'created_at', 'updated_at',
+    )))
+    requests = sa.table('requests', sa.column('request_id'), sa.column('student_id'), sa.column('request_type'),
+                        sa.column('status'), sa.column('reason'), sa.column('comment'),
+                        sa.column('created_at'), sa.column('updated_at'))
+    op.execute(request_events.insert().from_select(
+        ['request_id', 'student_id', 'request_type', 'to_status', 'reason', 'comment', 'created_at', 'updated_at'],
+        sa.select(
+            requests.c.request_id, requests.c.student_id, requests.c.request_type, requests.c.status,
+            requests.c.reason, requests.c.comment,
+            sa.func.coalesce(requests.c.updated_at, requests.c.created_at), sa.func.now(),
+        )
+        .where(~sa.exists().where(request_events.c.request_id == requests.c.request_id))
+        .order_by(requests.c.request_id)
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('request_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_request_events_student')
+        batch_op.drop_index('ix_request_events_request')
+
+    op.drop_table('request_events')
@@ -0,0 +1,53 @@
+"""add notification_outbox
+
+Revision ID: e5c3b8a1f7d2
+Revises: d4a81f6e3c92
+Create Date: 2026-10-18 14:02:37.551203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c3b8a1f7d2'
+down_revision = 'd4a81f6e3c92'
+branch_labels = None
+depends_on = None
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # db.create_all() may already have built the table and its index
+    if 'notification_outbox' not in _existing_tables():
+        op.create_table('notification_outbox',
+            sa.Column('outbox_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('audience', sa.String(length=64), nullable=False),
+            sa.Column('audience_args', sa.JSON(), nullable=True),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('notification_type', sa.String(length=128), nullable=False),
+            sa.Column('status', sa.String(length=32), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('processed_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('outbox_id')
+        )
+    if 'ix_notification_outbox_status_id' not in _existing_indexes('notification_outbox'):
+        op.create_index('ix_notification_outbox_status_id', 'notification_outbox', ['status', 'outbox_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('notification_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_outbox_status_id')
+
+    op.drop_table('notification_outbox')
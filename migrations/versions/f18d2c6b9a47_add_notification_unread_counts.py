@@ -0,0 +1,48 @@
+"""add notification_unread_counts
+
+Revision ID: f18d2c6b9a47
+Revises: e5c3b8a1f7d2
+Create Date: 2026-10-18 15:20:08.734126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f18d2c6b9a47'
+down_revision = 'e5c3b8a1f7d2'
+branch_labels = None
+depends_on = None
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = _existing_tables()
+    # db.create_all() may already have built the (empty) table
+    if 'notification_unread_counts' not in tables:
+        op.create_table('notification_unread_counts',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('unread', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('user_id'),
+            # without users, db.create_all() builds that table afterwards
+            *([sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], )] if 'users' in tables else [])
+        )
+
+    # start from the current unread notifications, whoever created the table
+    if 'notifications' in tables:
+        op.execute("DELETE FROM notification_unread_counts")
+        op.execute(
+            "INSERT INTO notification_unread_counts (user_id, unread, created_at, updated_at) "
+            "SELECT user_id, COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM notifications "
+            "WHERE is_read = 0 GROUP BY user_id"
+        )
+
+
+def downgrade():
+    op.drop_table('notification_unread_counts')
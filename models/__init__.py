@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import configure_mappers
 
 # Initialize SQLAlchemy
 db = SQLAlchemy()
@@ -22,4 +23,15 @@ from .change_section_request import ChangeSectionRequest
 from .notification import Notification
 from .swap_group_request import SwapGroupRequest
 from .swap_section_request import SwapSectionRequest
+from .search_token import SearchToken
+from .dashboard_counter import DashboardCounter
+from .notification_outbox import NotificationOutbox
+from .notification_unread_count import NotificationUnreadCount
+from .notification_archive import NotificationArchive
+from .occupancy import GroupOccupancy, SectionOccupancy
+from .swap_board import SwapBoardEntry
+from .review_queue import ReviewQueueEntry
+from .request_event import RequestEvent
 
+# resolve backrefs (Student.user, Group.section, ...) so they can be used in loader options
+configure_mappers()
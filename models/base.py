@@ -1,16 +1,47 @@
 from datetime import datetime
 from . import db
 
+# (model, id, expand) -> serialized row, or None to fall back to the relationship.
+# Installed by resources.reference for the models flagged __reference__.
+reference_resolver = None
+
 class BaseModel(db.Model):
     __abstract__ = True  # This ensures the base model is not created as a table
 
+    # relationship name -> foreign key column for the related objects to_dict() can embed
+    __expandable__ = {}
+    # small, rarely written tables whose rows are embedded from the reference cache
+    __reference__ = False
+
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     updated_at = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, expand=None):
+        return self.embed({
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
+        }, expand)
+    
+    def embed(self, data, expand=None):
+        """
+        Add the related objects to a serialized row.
+        expand=None embeds every relation recursively, otherwise expand is a tree
+        like {"section": {"speciality": {}}} and only those relations are touched,
+        the others stay as their foreign key id.
+        """
+        for relation in self.__expandable__:
+            if expand is not None and relation not in expand:
+                continue
+            subtree = None if expand is None else expand[relation]
+            target = self.__mapper__.relationships[relation].mapper.class_
+            if target.__reference__ and reference_resolver is not None:
+                related_id = getattr(self, self.__expandable__[relation])
+                cached = reference_resolver(target, related_id, subtree) if related_id is not None else None
+                if cached is not None:
+                    data[relation] = cached
+                    continue
+            related = getattr(self, relation)
+            data[relation] = related.to_dict(subtree) if related else None
+        return data
     
     
@@ -8,15 +8,18 @@ class ChangeGroupRequest(BaseModel):
     current_group_id = db.Column(db.Integer, db.ForeignKey('groups.group_id'), nullable=False)
     requested_group_id = db.Column(db.Integer, db.ForeignKey('groups.group_id'), nullable=False)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {
+        'request': 'request_id',
+        'current_group': 'current_group_id',
+        'requested_group': 'requested_group_id',
+    }
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'change_group_request_id': self.change_group_request_id,
             'request_id': self.request_id,
-            'request': self.request.to_dict() if self.request else None,
             'current_group_id': self.current_group_id,
-            'current_group': self.current_group.to_dict() if self.current_group else None,
             'requested_group_id': self.requested_group_id,
-            'requested_group': self.requested_group.to_dict() if self.requested_group else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -0,0 +1,15 @@
+from .base import BaseModel, db
+
+class DashboardCounter(BaseModel):
+    __tablename__ = 'dashboard_counters'
+    
+    name = db.Column(db.String(64), primary_key=True, nullable=False)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'name': self.name,
+            'value': self.value,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
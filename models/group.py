@@ -2,6 +2,7 @@ from .base import BaseModel, db
 
 class Group(BaseModel):
     __tablename__ = 'groups'
+    __reference__ = True  # served from resources.reference when embedded
     
     group_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     section_id = db.Column(db.Integer, db.ForeignKey('sections.section_id'), nullable=False)
@@ -14,14 +15,16 @@ class Group(BaseModel):
     teacher_groups = db.relationship('TeacherGroup', backref='group', lazy=True)
     change_group_requests_current = db.relationship('ChangeGroupRequest', foreign_keys='ChangeGroupRequest.current_group_id', backref='current_group', lazy=True)
     change_group_requests_requested = db.relationship('ChangeGroupRequest', foreign_keys='ChangeGroupRequest.requested_group_id', backref='requested_group', lazy=True)
-    def to_dict(self):
-        return {
+    
+    __expandable__ = {'section': 'section_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'group_id': self.group_id,
             'section_id': self.section_id,
-            'section': self.section.to_dict() if self.section else None,
             'group_type': self.group_type,
             'group_name': self.group_name,
             'max_capacity': self.max_capacity,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
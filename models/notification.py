@@ -2,6 +2,14 @@ from .base import BaseModel, db
 
 class Notification(BaseModel):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # a user's notifications filtered by read state, newest first
+        db.Index('ix_notifications_user_read_created', 'user_id', 'is_read', 'created_at'),
+        # a user's notifications newest first without a read filter (and its cursor)
+        db.Index('ix_notifications_user_created', 'user_id', 'created_at', 'notification_id'),
+        # the retention job's scan for old read notifications
+        db.Index('ix_notifications_read_created', 'is_read', 'created_at'),
+    )
     
     notification_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
@@ -10,15 +18,16 @@ class Notification(BaseModel):
     notification_type = db.Column(db.String(128), nullable=False)
     is_read = db.Column(db.Boolean, nullable=False)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {'user': 'user_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'notification_id': self.notification_id,
             'user_id': self.user_id,
-            'user': self.user.to_dict() if self.user else None,
             'title': self.title,
             'message': self.message,
             'notification_type': self.notification_type,
             'is_read': self.is_read,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
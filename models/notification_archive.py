@@ -0,0 +1,29 @@
+from .base import BaseModel, db
+
+class NotificationArchive(BaseModel):
+    __tablename__ = 'notifications_archive'
+    __table_args__ = (
+        db.Index('ix_notifications_archive_user_created', 'user_id', 'created_at'),
+    )
+    
+    # same id as the row had in notifications
+    notification_id = db.Column(db.Integer, primary_key=True, autoincrement=False, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    notification_type = db.Column(db.String(128), nullable=False)
+    is_read = db.Column(db.Boolean, nullable=False)
+    archived_at = db.Column(db.TIMESTAMP, nullable=False)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'notification_id': self.notification_id,
+            'user_id': self.user_id,
+            'title': self.title,
+            'message': self.message,
+            'notification_type': self.notification_type,
+            'is_read': self.is_read,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
@@ -0,0 +1,35 @@
+from .base import BaseModel, db
+
+class NotificationOutbox(BaseModel):
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        # the worker's poll: oldest pending jobs first
+        db.Index('ix_notification_outbox_status_id', 'status', 'outbox_id'),
+    )
+    
+    outbox_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
+    audience = db.Column(db.String(64), nullable=False)
+    audience_args = db.Column(db.JSON, nullable=True)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    notification_type = db.Column(db.String(128), nullable=False)
+    status = db.Column(db.String(32), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    processed_at = db.Column(db.TIMESTAMP, nullable=True)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'outbox_id': self.outbox_id,
+            'audience': self.audience,
+            'audience_args': self.audience_args,
+            'title': self.title,
+            'message': self.message,
+            'notification_type': self.notification_type,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
@@ -0,0 +1,15 @@
+from .base import BaseModel, db
+
+class NotificationUnreadCount(BaseModel):
+    __tablename__ = 'notification_unread_counts'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), primary_key=True, nullable=False)
+    unread = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'user_id': self.user_id,
+            'unread': self.unread,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
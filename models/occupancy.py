@@ -0,0 +1,34 @@
+from .base import BaseModel, db
+
+# Live student counts per group and section, kept apart from groups/sections so
+# that student moves do not invalidate the reference cache of those tables.
+# No foreign keys: the rows of a deleted group or section are removed in the same flush.
+
+class GroupOccupancy(BaseModel):
+    __tablename__ = 'group_occupancy'
+    
+    group_id = db.Column(db.Integer, primary_key=True, autoincrement=False, nullable=False)
+    students = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'group_id': self.group_id,
+            'students': self.students,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
+
+
+class SectionOccupancy(BaseModel):
+    __tablename__ = 'section_occupancy'
+    
+    section_id = db.Column(db.Integer, primary_key=True, autoincrement=False, nullable=False)
+    students = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'section_id': self.section_id,
+            'students': self.students,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
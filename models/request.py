@@ -2,6 +2,12 @@ from .base import BaseModel, db
 
 class Request(BaseModel):
     __tablename__ = 'requests'
+    __table_args__ = (
+        # active-request check: student_id + request_type + status IN (...)
+        db.Index('ix_requests_student_type_status', 'student_id', 'request_type', 'status'),
+        # newest-first listing and keyset pagination
+        db.Index('ix_requests_created_at', 'created_at', 'request_id'),
+    )
     
     request_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=False)
@@ -16,15 +22,16 @@ class Request(BaseModel):
     swap_group_requests = db.relationship('SwapGroupRequest', backref='request', lazy=True)
     swap_section_requests = db.relationship('SwapSectionRequest', backref='request', lazy=True)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {'student': 'student_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'request_id': self.request_id,
             'student_id': self.student_id,
-            'student': self.student.to_dict() if self.student else None,
             'status': self.status,
             'reason': self.reason,
             'urgency': self.urgency,
             'type': self.request_type,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -0,0 +1,37 @@
+from .base import BaseModel, db
+
+# Append-only history of requests: one row per creation, status change, reason
+# or comment change and deletion, written in the transaction of the change.
+# No foreign key so the history outlives the request.
+
+class RequestEvent(BaseModel):
+    __tablename__ = 'request_events'
+    __table_args__ = (
+        # request timeline
+        db.Index('ix_request_events_request', 'request_id', 'event_id'),
+        # student timeline, newest first
+        db.Index('ix_request_events_student', 'student_id', 'created_at', 'event_id'),
+    )
+    
+    event_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
+    request_id = db.Column(db.Integer, nullable=False)
+    student_id = db.Column(db.Integer, nullable=False)
+    request_type = db.Column(db.String(64), nullable=False)
+    from_status = db.Column(db.String(64), nullable=True)
+    to_status = db.Column(db.String(64), nullable=False)
+    reason = db.Column(db.Text, nullable=True)
+    comment = db.Column(db.String(512), nullable=True)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'event_id': self.event_id,
+            'request_id': self.request_id,
+            'student_id': self.student_id,
+            'request_type': self.request_type,
+            'from_status': self.from_status,
+            'to_status': self.to_status,
+            'reason': self.reason,
+            'comment': self.comment,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
@@ -0,0 +1,31 @@
+from .base import BaseModel, db
+
+# Pending and appealed change requests waiting for staff, ordered by
+# priority_at: the creation time moved earlier for urgency and appeals, so the
+# next item is the first entry of an index instead of a sort of the requests.
+# Maintained by resources.review_queue; a claim is a lease that expires.
+# No foreign keys: the entry of a deleted request is removed in the same flush.
+
+class ReviewQueueEntry(BaseModel):
+    __tablename__ = 'review_queue'
+    __table_args__ = (
+        db.Index('ix_review_queue_priority', 'priority_at', 'request_id'),
+        db.Index('ix_review_queue_type_priority', 'request_type', 'priority_at', 'request_id'),
+    )
+    
+    request_id = db.Column(db.Integer, primary_key=True, autoincrement=False, nullable=False)
+    request_type = db.Column(db.String(64), nullable=False)
+    priority_at = db.Column(db.DateTime, nullable=False)
+    claimed_by = db.Column(db.Integer, nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'request_id': self.request_id,
+            'request_type': self.request_type,
+            'priority_at': self.priority_at.isoformat() if self.priority_at else None,
+            'claimed_by': self.claimed_by,
+            'lease_expires_at': self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
@@ -2,6 +2,7 @@ from .base import BaseModel, db
 
 class Role(BaseModel):
     __tablename__ = 'roles'
+    __reference__ = True  # served from resources.reference when embedded
     
     role_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     role_name = db.Column(db.String(64), nullable=False)
@@ -9,7 +10,7 @@ class Role(BaseModel):
     
     users = db.relationship('User', backref='role', lazy=True)
     
-    def to_dict(self):
+    def to_dict(self, expand=None):
         return {
             'role_id': self.role_id,
             'role_name': self.role_name,
@@ -0,0 +1,25 @@
+from .base import BaseModel, db
+
+class SearchToken(BaseModel):
+    __tablename__ = 'search_tokens'
+    __table_args__ = (
+        # prefix lookups: entity_type = ? AND token LIKE 'abc%'
+        db.Index('ix_search_tokens_type_token', 'entity_type', 'token', 'entity_id'),
+        # re-indexing one person
+        db.Index('ix_search_tokens_entity', 'entity_type', 'entity_id'),
+    )
+    
+    search_token_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
+    entity_type = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    token = db.Column(db.String(64), nullable=False)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'search_token_id': self.search_token_id,
+            'entity_type': self.entity_type,
+            'entity_id': self.entity_id,
+            'token': self.token,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
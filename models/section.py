@@ -2,6 +2,7 @@ from .base import BaseModel, db
 
 class Section(BaseModel):
     __tablename__ = 'sections'
+    __reference__ = True  # served from resources.reference when embedded
     
     section_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     speciality_id = db.Column(db.Integer, db.ForeignKey('specialities.speciality_id'), nullable=False)
@@ -12,13 +13,14 @@ class Section(BaseModel):
     students = db.relationship('Student', backref='section', lazy=True)
     teacher_sections = db.relationship('TeacherSection', backref='section', lazy=True)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {'speciality': 'speciality_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'section_id': self.section_id,
             'speciality_id': self.speciality_id,
-            'speciality': self.speciality.to_dict() if self.speciality else None,
             'name': self.name,
             'max_capacity': self.max_capacity,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -2,6 +2,7 @@ from .base import BaseModel, db
 
 class Speciality(BaseModel):
     __tablename__ = 'specialities'
+    __reference__ = True  # served from resources.reference when embedded
     
     speciality_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     name = db.Column(db.String(128), nullable=False, unique=True)
@@ -10,7 +11,7 @@ class Speciality(BaseModel):
     sections = db.relationship('Section', backref='speciality', lazy=True)
     students = db.relationship('Student', backref='speciality', lazy=True)
     
-    def to_dict(self):
+    def to_dict(self, expand=None):
         return {
             'speciality_id': self.speciality_id,
             'name': self.name,
@@ -9,14 +9,15 @@ class Staff(BaseModel):
     last_name = db.Column(db.String(64), nullable=False)
     grade = db.Column(db.String(128), nullable=False)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {'user': 'user_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'staff_id': self.staff_id,
             'user_id': self.user_id,
-            'user': self.user.to_dict() if self.user else None,
             'first_name': self.first_name,
             'last_name': self.last_name,
             'grade': self.grade,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -1,8 +1,20 @@
+from sqlalchemy import and_
+from sqlalchemy.orm import aliased
+
 from .base import BaseModel, db
+from .speciality import Speciality
+from .section import Section
+from .group import Group
 
 
 class Student(BaseModel):
     __tablename__ = 'students'
+    __table_args__ = (
+        db.Index('ix_students_section_id', 'section_id'),
+        db.Index('ix_students_tutorial_group_id', 'tutorial_group_id'),
+        db.Index('ix_students_lab_group_id', 'lab_group_id'),
+        db.Index('ix_students_created_at', 'created_at', 'student_id'),
+    )
     
     student_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
@@ -26,11 +38,19 @@ class Student(BaseModel):
     swap_group_requests_requested = db.relationship('SwapGroupRequest', foreign_keys='SwapGroupRequest.requested_student_id', backref='requested_student', lazy=True)
     swap_section_requests_current = db.relationship('SwapSectionRequest', foreign_keys='SwapSectionRequest.current_student_id', backref='current_student', lazy=True)
     swap_section_requests_requested = db.relationship('SwapSectionRequest', foreign_keys='SwapSectionRequest.requested_student_id', backref='requested_student', lazy=True)
-    def to_dict(self):
-        return {
+    
+    __expandable__ = {
+        'user': 'user_id',
+        'speciality': 'speciality_id',
+        'section': 'section_id',
+        'tutorial_group': 'tutorial_group_id',
+        'lab_group': 'lab_group_id',
+    }
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'student_id': self.student_id,
             'user_id': self.user_id,
-            'user': self.user.to_dict() if self.user else None,
             'first_name': self.first_name,
             'last_name': self.last_name,
             'birth_date': self.birth_date.strftime('%d/%m/%Y') if self.birth_date else None,
@@ -40,41 +60,83 @@ class Student(BaseModel):
             'phone_number': self.phone_number,
             'observation': self.observation,
             'speciality_id': self.speciality_id,
-            'speciality': self.speciality.to_dict() if self.speciality else None,
             'section_id': self.section_id,
-            'section': self.section.to_dict() if self.section else None,
             'status': self.status,
             'tutorial_group_id': self.tutorial_group_id,
-            'tutorial_group': self.tutorial_group.to_dict() if self.tutorial_group else None,
             'lab_group_id': self.lab_group_id,
-            'lab_group': self.lab_group.to_dict() if self.lab_group else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        }, expand)
     
     @staticmethod
     def validate_student(data, db):
-        # check speciality exist
-        speciality = db.session.execute(db.select(Speciality).filter_by(speciality_id=data["speciality_id"])).first()
-        if not speciality:
-            return {"error": "Invalid speciality"} 
-        
-        # check if section exist and within the same speciality
-        section = db.session.execute(db.select(Section).filter_by(section_id=data["section_id"], speciality_id=data["speciality_id"])).first()
-        
-        if not section:
+        # speciality, section within it and both groups within the section, in one outer-joined query
+        tutorial_group, lab_group = aliased(Group), aliased(Group)
+        row = db.session.execute(
+            db.select(Speciality.speciality_id, Section.section_id, tutorial_group.group_id, lab_group.group_id)
+            .outerjoin(Section, and_(
+                Section.speciality_id == Speciality.speciality_id,
+                Section.section_id == data["section_id"],
+            ))
+            .outerjoin(tutorial_group, and_(
+                tutorial_group.section_id == Section.section_id,
+                tutorial_group.group_id == data["tutorial_group_id"],
+                tutorial_group.group_type == "tutorial",
+            ))
+            .outerjoin(lab_group, and_(
+                lab_group.section_id == Section.section_id,
+                lab_group.group_id == data["lab_group_id"],
+                lab_group.group_type == "lab",
+            ))
+            .where(Speciality.speciality_id == data["speciality_id"])
+        ).first()
+
+        if not row:
+            return {"error": "Invalid speciality"}
+        if row[1] is None:
             return {"error": "Invalid section"}
-            
-        # check if valid group_td within the section
-        group_td = db.session.execute(db.select(Group).filter_by(group_type="tutorial", group_id=data["tutorial_group_id"], section_id=data["section_id"])).first()
-        if not group_td:
+        if row[2] is None:
             return {"error": "Invalid group tutorial"}
-            
-        # check if valid group_tp within the section
-        group_tp = db.session.execute(db.select(Group).filter_by(group_type="lab", group_id=data["lab_group_id"], section_id=data["section_id"])).first()
-        if not group_tp:
+        if row[3] is None:
             return {"error": "Invalid group lab"}
-        
         return None
-    
-    
\ No newline at end of file
+
+    @staticmethod
+    def placement_map(payloads, db):
+        """{speciality_id: {section_id: {group_id: group_type}}} for every speciality the payloads reference."""
+        speciality_ids = {data["speciality_id"] for data in payloads}
+        rows = db.session.execute(
+            db.select(Speciality.speciality_id, Section.section_id, Group.group_id, Group.group_type)
+            .outerjoin(Section, Section.speciality_id == Speciality.speciality_id)
+            .outerjoin(Group, Group.section_id == Section.section_id)
+            .where(Speciality.speciality_id.in_(speciality_ids))
+        ).all()
+
+        placements = {}
+        for speciality_id, section_id, group_id, group_type in rows:
+            sections = placements.setdefault(speciality_id, {})
+            if section_id is not None:
+                groups = sections.setdefault(section_id, {})
+                if group_id is not None:
+                    groups[group_id] = group_type
+        return placements
+
+    @staticmethod
+    def validate_students(payloads, db):
+        """Batch form of validate_student: one error (or None) per payload, from a single prefetch."""
+        placements = Student.placement_map(payloads, db)
+        errors = []
+        for data in payloads:
+            sections = placements.get(data["speciality_id"])
+            groups = sections.get(data["section_id"]) if sections is not None else None
+            if sections is None:
+                errors.append({"error": "Invalid speciality"})
+            elif groups is None:
+                errors.append({"error": "Invalid section"})
+            elif groups.get(data["tutorial_group_id"]) != "tutorial":
+                errors.append({"error": "Invalid group tutorial"})
+            elif groups.get(data["lab_group_id"]) != "lab":
+                errors.append({"error": "Invalid group lab"})
+            else:
+                errors.append(None)
+        return errors
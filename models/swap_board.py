@@ -0,0 +1,46 @@
+from .base import BaseModel, db
+
+# One row per swap request with what the swap listing shows and filters on, so
+# the board is an index range read instead of a UNION over both swap tables.
+# Maintained by resources.swap_board from the flushes that touch swaps, their
+# requests or their students' names; `flask swaps rebuild-board` recomputes it.
+
+class SwapBoardEntry(BaseModel):
+    __tablename__ = 'swap_board'
+    __table_args__ = (
+        # opportunities: open swaps of a speciality, most urgent then newest first
+        db.Index('ix_swap_board_speciality', 'speciality_id', 'status', 'urgency', 'created_at', 'request_id'),
+        # open swaps that want a given group or section
+        db.Index('ix_swap_board_placement', 'swap_type', 'requested_id', 'status', 'urgency', 'created_at', 'request_id'),
+        # a student's own swaps, newest first
+        db.Index('ix_swap_board_student', 'student_id', 'created_at', 'request_id'),
+    )
+    
+    request_id = db.Column(db.Integer, primary_key=True, autoincrement=False, nullable=False)
+    swap_type = db.Column(db.String(16), nullable=False)
+    swap_request_id = db.Column(db.Integer, nullable=False)
+    student_id = db.Column(db.Integer, nullable=False)
+    student_name = db.Column(db.String(255), nullable=True)
+    speciality_id = db.Column(db.Integer, nullable=True)
+    current_id = db.Column(db.Integer, nullable=True)
+    requested_id = db.Column(db.Integer, nullable=True)
+    requested_student_id = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(64), nullable=False)
+    urgency = db.Column(db.Integer, nullable=False)
+    
+    def to_dict(self, expand=None):
+        return self.embed({
+            'request_id': self.request_id,
+            'swap_type': self.swap_type,
+            'swap_request_id': self.swap_request_id,
+            'student_id': self.student_id,
+            'student_name': self.student_name,
+            'speciality_id': self.speciality_id,
+            'current_id': self.current_id,
+            'requested_id': self.requested_id,
+            'requested_student_id': self.requested_student_id,
+            'status': self.status,
+            'urgency': self.urgency,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }, expand)
@@ -2,21 +2,32 @@ from .base import BaseModel, db
 
 class SwapGroupRequest(BaseModel):
     __tablename__ = 'swap_group_requests'
+    __table_args__ = (
+        # swap matcher: open swaps leaving a group for another
+        db.Index('ix_swap_group_requests_placement', 'current_group_id', 'requested_group_id'),
+    )
     
     swap_group_request_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     request_id = db.Column(db.Integer, db.ForeignKey('requests.request_id'), nullable=False)
     current_student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=False)
     requested_student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=True)
+    current_group_id = db.Column(db.Integer, db.ForeignKey('groups.group_id'), nullable=True)
+    requested_group_id = db.Column(db.Integer, db.ForeignKey('groups.group_id'), nullable=True)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {
+        'request': 'request_id',
+        'current_student': 'current_student_id',
+        'requested_student': 'requested_student_id',
+    }
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'swap_group_request_id': self.swap_group_request_id,
             'request_id': self.request_id,
-            'request': self.request.to_dict() if self.request else None,
             'current_student_id': self.current_student_id,
-            'current_student': self.current_student.to_dict() if self.current_student else None,
             'requested_student_id': self.requested_student_id,
-            'requested_student': self.requested_student.to_dict() if self.requested_student else None,
+            'current_group_id': self.current_group_id,
+            'requested_group_id': self.requested_group_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -2,21 +2,32 @@ from .base import BaseModel, db
 
 class SwapSectionRequest(BaseModel):
     __tablename__ = 'swap_section_requests'
+    __table_args__ = (
+        # swap matcher: open swaps leaving a section for another
+        db.Index('ix_swap_section_requests_placement', 'current_section_id', 'requested_section_id'),
+    )
     
     swap_section_request_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     request_id = db.Column(db.Integer, db.ForeignKey('requests.request_id'), nullable=False)
     current_student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=False)
     requested_student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=True)
+    current_section_id = db.Column(db.Integer, db.ForeignKey('sections.section_id'), nullable=True)
+    requested_section_id = db.Column(db.Integer, db.ForeignKey('sections.section_id'), nullable=True)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {
+        'request': 'request_id',
+        'current_student': 'current_student_id',
+        'requested_student': 'requested_student_id',
+    }
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'swap_section_request_id': self.swap_section_request_id,
             'request_id': self.request_id,
-            'request': self.request.to_dict() if self.request else None,
             'current_student_id': self.current_student_id,
-            'current_student': self.current_student.to_dict() if self.current_student else None,
             'requested_student_id': self.requested_student_id,
-            'requested_student': self.requested_student.to_dict() if self.requested_student else None,
+            'current_section_id': self.current_section_id,
+            'requested_section_id': self.requested_section_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -12,14 +12,15 @@ class Teacher(BaseModel):
     teacher_sections = db.relationship('TeacherSection', backref='teacher', lazy=True)
     teacher_groups = db.relationship('TeacherGroup', backref='teacher', lazy=True)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {'user': 'user_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'teacher_id': self.teacher_id,
             'user_id': self.user_id,
-            'user': self.user.to_dict() if self.user else None,
             'first_name': self.first_name,
             'last_name': self.last_name,
             'grade': self.grade,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -2,18 +2,24 @@ from .base import BaseModel, db
 
 class TeacherGroup(BaseModel):
     __tablename__ = 'teacher_groups'
+    __table_args__ = (
+        db.Index('ix_teacher_groups_teacher_group', 'teacher_id', 'group_id'),
+    )
     
     teacher_groups_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     teacher_id = db.Column(db.Integer, db.ForeignKey('teachers.teacher_id'), nullable=False)
     group_id = db.Column(db.Integer, db.ForeignKey('groups.group_id'), nullable=False)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {
+        'teacher': 'teacher_id',
+        'group': 'group_id',
+    }
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'teacher_groups_id': self.teacher_groups_id,
             'teacher_id': self.teacher_id,
-            'teacher': self.teacher.to_dict() if self.teacher else None,
             'group_id': self.group_id,
-            'group': self.group.to_dict() if self.group else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -2,18 +2,24 @@ from .base import BaseModel, db
 
 class TeacherSection(BaseModel):
     __tablename__ = 'teacher_sections'
+    __table_args__ = (
+        db.Index('ix_teacher_sections_teacher_section', 'teacher_id', 'section_id'),
+    )
     
     teacher_section_id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     teacher_id = db.Column(db.Integer, db.ForeignKey('teachers.teacher_id'), nullable=False)
     section_id = db.Column(db.Integer, db.ForeignKey('sections.section_id'), nullable=False)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {
+        'teacher': 'teacher_id',
+        'section': 'section_id',
+    }
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'teacher_section_id': self.teacher_section_id,
             'teacher_id': self.teacher_id,
-            'teacher': self.teacher.to_dict() if self.teacher else None,
             'section_id': self.section_id,
-            'section': self.section.to_dict() if self.section else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }, expand)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from .base import BaseModel, db
-import bcrypt
+from resources import hashing
 
 
 class User(BaseModel):
@@ -15,26 +15,33 @@ class User(BaseModel):
     staffs = db.relationship('Staff', backref='user', lazy=True)
     notifications = db.relationship('Notification', backref='user', lazy=True)
     
-    def to_dict(self):
-        return {
+    __expandable__ = {'role': 'role_id'}
+    
+    def to_dict(self, expand=None):
+        return self.embed({
             'user_id': self.user_id,
             'email': self.email,
             'role_id': self.role_id,
-            'role': self.role.to_dict() if self.role else None, 
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        }, expand)
         
     @staticmethod    
     def hash_password(password):
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed_password.decode('utf-8')
+        # runs on the interactive hashing pool at Config.BCRYPT_ROUNDS
+        return hashing.hash_password(password)
     
     @staticmethod
     def check_password(input_password, stored_hash):
-        return bcrypt.checkpw(
-            input_password.encode('utf-8'),
-            stored_hash.encode('utf-8')
-        )
-    
\ No newline at end of file
+        return hashing.check_password(input_password, stored_hash)
+    
+    def verify_password(self, input_password):
+        """
+        check_password() against this user's hash, upgrading the hash in place
+        when BCRYPT_ROUNDS changed since it was made. The caller commits.
+        """
+        if not self.check_password(input_password, self.password_hash):
+            return False
+        if hashing.needs_rehash(self.password_hash):
+            self.password_hash = self.hash_password(input_password)
+        return True
@@ -8,9 +8,82 @@ from flask_jwt_extended import (
     verify_jwt_in_request
 )
 import jwt
+import hashlib
+import time
+from collections import namedtuple
 from datetime import datetime, timedelta
 
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
 
+from models import db, User, Role
+from resources.cache import TTLCache
+
+
+# What protected routes know about the caller. Plain tuples, so a cached
+# principal is never tied to a session that has been closed.
+PrincipalRole = namedtuple("PrincipalRole", ["role_id", "role_name", "permission_level"])
+Principal = namedtuple("Principal", ["user_id", "email", "role_id", "role"])
+
+_principals = TTLCache()
+_verified_tokens = TTLCache()
+
+
+def load_principal(user_id):
+    """User and role in one query, served from the per-process cache when possible."""
+    principal = _principals.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = db.session.execute(
+        select(User.user_id, User.email, User.role_id, Role.role_name, Role.permission_level)
+        .outerjoin(Role, User.role_id == Role.role_id)
+        .where(User.user_id == user_id)
+    ).first()
+    if not row:
+        return None
+
+    role = PrincipalRole(row.role_id, row.role_name, row.permission_level) if row.role_name is not None else None
+    principal = Principal(row.user_id, row.email, row.role_id, role)
+    _principals.set(user_id, principal, current_app.config.get("PRINCIPAL_CACHE_TTL", 60))
+    return principal
+
+
+def invalidate_principal(user_id=None):
+    """Forget one cached principal, or all of them when user_id is None."""
+    if user_id is None:
+        _principals.clear()
+    else:
+        _principals.pop(user_id)
+
+
+def _principal_changes(session):
+    return session.info.setdefault("principal_changes", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    changes = _principal_changes(session)
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changes.add(obj.user_id)
+        elif isinstance(obj, Role):
+            changes.add(None)  # a role change affects every user holding it
+    # drop them right away too, so this request does not read stale entries
+    for user_id in changes:
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    # and again once committed, in case another request cached the old row meanwhile
+    for user_id in session.info.pop("principal_changes", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    session.info.pop("principal_changes", None)
 
 
 # JWT token helper functions
@@ -33,6 +106,24 @@ def decode_token(token):
     except jwt.InvalidTokenError:
         return None
 
+def verify_token_cached(token):
+    """decode_token() that skips the signature check for tokens verified recently"""
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    now = time.time()
+
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        return payload if payload.get('exp', now + 1) > now else None
+
+    payload = decode_token(token)
+    if payload:
+        ttl = current_app.config.get("TOKEN_CACHE_TTL", 300)
+        if 'exp' in payload:
+            ttl = min(ttl, payload['exp'] - now)
+        if ttl > 0:
+            _verified_tokens.set(key, payload, ttl)
+    return payload
+
 # Auth middleware decorator
 def token_required(f):
     @wraps(f)
@@ -49,12 +140,12 @@ def token_required(f):
             return jsonify({'error': 'Authentication token is missing'}), 401
         
         # Decode token
-        data = decode_token(token)
+        data = verify_token_cached(token)
         if not data:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
         # Get user
-        current_user = User.query.get(data['user_id'])
+        current_user = load_principal(data['user_id'])
         if not current_user:
             return jsonify({'error': 'User not found'}), 401
         
@@ -0,0 +1,190 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import select, update, case
+
+from models import (
+    db, Request, ChangeGroupRequest, ChangeSectionRequest, Student, Group, Section,
+    GroupOccupancy, SectionOccupancy
+)
+from resources.occupancy import adjust_occupancy, read_occupancy
+from resources.reference import reference_row
+from resources.notifications import send_notifications
+from resources.review_queue import dequeue
+from resources.request_events import record_events
+
+PENDING, APPROVED, REJECTED = "pending", "approved", "rejected"
+
+TITLES = {
+    "group": "Change Group Request Response",
+    "section": "Change Section Request Response",
+}
+
+
+def _candidates(request_types, limit, lock):
+    """Pending change requests with their student's placement, most urgent then oldest first."""
+    queries = []
+    if "group" in request_types:
+        queries.append(("group", select(
+            Request.request_id, Request.student_id, Request.urgency, Request.created_at,
+            ChangeGroupRequest.requested_group_id, Student.user_id,
+            Student.section_id, Student.tutorial_group_id, Student.lab_group_id,
+        ).join(ChangeGroupRequest, ChangeGroupRequest.request_id == Request.request_id)))
+    if "section" in request_types:
+        queries.append(("section", select(
+            Request.request_id, Request.student_id, Request.urgency, Request.created_at,
+            ChangeSectionRequest.requested_section_id, Student.user_id,
+            Student.section_id, Student.tutorial_group_id, Student.lab_group_id,
+        ).join(ChangeSectionRequest, ChangeSectionRequest.request_id == Request.request_id)))
+
+    rows = []
+    for kind, query in queries:
+        query = (
+            query.join(Student, Student.student_id == Request.student_id)
+            .where(Request.status == PENDING, Request.request_type == kind)
+            .order_by(Request.urgency.desc(), Request.created_at, Request.request_id)
+        )
+        if limit:
+            query = query.limit(limit)
+        if lock:
+            # requests another reviewer holds are left for the next run
+            query = query.with_for_update(skip_locked=True)
+        rows.extend((kind, row) for row in db.session.execute(query).all())
+
+    rows.sort(key=lambda item: (-item[1].urgency, item[1].created_at or datetime.min, item[1].request_id))
+    return rows[:limit] if limit else rows
+
+
+def _group_column(group):
+    return "tutorial_group_id" if group and group["group_type"] == "tutorial" else "lab_group_id"
+
+
+def batch_review(request_types=("group", "section"), limit=None, reject_unplaced=False, dry_run=False):
+    """
+    Decide every pending change request in priority order against the group and
+    section capacities, then apply the decisions with set-based statements in
+    the caller's transaction (nothing is written when dry_run).
+    A move frees the seat it leaves, which later requests in the run can take.
+    Returns (summary, results).
+    """
+    lock = not dry_run
+    candidates = _candidates(request_types, limit, lock)
+
+    group_ids = {row.requested_group_id for kind, row in candidates if kind == "group"}
+    section_ids = {row.requested_section_id for kind, row in candidates if kind == "section"}
+    groups = {group_id: reference_row(Group, group_id) for group_id in group_ids}
+    sections = {section_id: reference_row(Section, section_id) for section_id in section_ids}
+    # the placements students leave count as well, so a seat a move frees is
+    # real; locking them with the targets up front keeps single reviews from
+    # taking or freeing seats meanwhile
+    source_group_ids = {
+        getattr(row, _group_column(groups[row.requested_group_id]))
+        for kind, row in candidates if kind == "group" and groups[row.requested_group_id]
+    }
+    source_section_ids = {row.section_id for kind, row in candidates if kind == "section"}
+    group_occupancy = Counter(read_occupancy(GroupOccupancy, (group_ids | source_group_ids) - {None}, lock))
+    section_occupancy = Counter(read_occupancy(SectionOccupancy, (section_ids | source_section_ids) - {None}, lock))
+
+    placements = {}  # student_id -> current placement as the run moves them
+    results, approved, rejected = [], [], []
+    group_deltas, section_deltas = Counter(), Counter()
+
+    for kind, row in candidates:
+        placement = placements.setdefault(row.student_id, {
+            "section_id": row.section_id,
+            "tutorial_group_id": row.tutorial_group_id,
+            "lab_group_id": row.lab_group_id,
+        })
+        result = {"request_id": row.request_id, "student_id": row.student_id, "type": kind}
+
+        if kind == "group":
+            target_id, target = row.requested_group_id, groups.get(row.requested_group_id)
+            column = _group_column(target)
+            occupancy, deltas = group_occupancy, group_deltas
+        else:
+            target_id, target = row.requested_section_id, sections.get(row.requested_section_id)
+            column = "section_id"
+            occupancy, deltas = section_occupancy, section_deltas
+        result["target_id"] = target_id
+
+        if target is None:
+            decision, reason = REJECTED, "target no longer exists"
+        elif placement[column] == target_id:
+            decision, reason = APPROVED, "already placed"
+        elif occupancy[target_id] < target["max_capacity"]:
+            decision, reason = APPROVED, None
+            occupancy[target_id] += 1
+            occupancy[placement[column]] -= 1
+            deltas[target_id] += 1
+            deltas[placement[column]] -= 1
+            placement[column] = target_id
+        elif reject_unplaced:
+            decision, reason = REJECTED, "no seat left"
+        else:
+            decision, reason = PENDING, "no seat left"
+
+        result.update(decision=decision, reason=reason)
+        results.append(result)
+        if decision == APPROVED:
+            approved.append((kind, row))
+        elif decision == REJECTED:
+            rejected.append((kind, row))
+
+    summary = {
+        "considered": len(results),
+        "approved": len(approved),
+        "rejected": len(rejected),
+        "left_pending": len(results) - len(approved) - len(rejected),
+    }
+    if not dry_run:
+        _apply(approved, rejected, placements, group_deltas, section_deltas)
+    return summary, results
+
+
+def _apply(approved, rejected, placements, group_deltas, section_deltas):
+    now = datetime.utcnow()
+    for status, decided in ((APPROVED, approved), (REJECTED, rejected)):
+        if decided:
+            db.session.execute(
+                update(Request)
+                .where(Request.request_id.in_([row.request_id for _, row in decided]), Request.status == PENDING)
+                .values(status=status, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+    approved_students = {row.student_id for _, row in approved}
+    moved = {student_id: placement for student_id, placement in placements.items() if student_id in approved_students}
+    if moved:
+        # one UPDATE moves every student: column = CASE student_id WHEN ... END
+        db.session.execute(
+            update(Student)
+            .where(Student.student_id.in_(list(moved)))
+            .values({
+                column: case(
+                    {student_id: placement[column] for student_id, placement in moved.items()},
+                    value=Student.student_id,
+                )
+                for column in ("section_id", "tutorial_group_id", "lab_group_id")
+            } | {"updated_at": now})
+            .execution_options(synchronize_session=False)
+        )
+    # bulk statements skip the flush hooks
+    adjust_occupancy(db.session.connection(), group_deltas, section_deltas)
+    dequeue(db.session.connection(), [row.request_id for _, row in approved + rejected])
+    record_events(db.session.connection(), [
+        dict(request_id=row.request_id, student_id=row.student_id, kind=kind, from_status=PENDING, to_status=status)
+        for status, decided in ((APPROVED, approved), (REJECTED, rejected))
+        for kind, row in decided
+    ])
+
+    send_notifications(
+        [
+            {"user_id": row.user_id, "title": TITLES[kind], "message": "request approved, you have been moved!",
+             "notification_type": "success"}
+            for kind, row in approved
+        ] + [
+            {"user_id": row.user_id, "title": TITLES[kind], "message": "request rejected.",
+             "notification_type": "warning"}
+            for kind, row in rejected
+        ]
+    )
@@ -0,0 +1,106 @@
+import threading
+import time
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ttl seconds."""
+
+    def __init__(self, ttl=30, max_entries=4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict()
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at < now]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            # still full: drop the entries closest to expiry
+            for key, _ in sorted(self._entries.items(), key=lambda item: item[1][1])[:self.max_entries // 4 or 1]:
+                del self._entries[key]
+
+
+# Write versions per table. Caches put the versions of the tables they read
+# into their keys, so a committed write makes the old entries unreachable.
+_table_versions = {}
+_versions_lock = threading.Lock()
+
+
+def table_version(table_name):
+    return _table_versions.get(table_name, 0)
+
+
+def bump_tables(table_names):
+    with _versions_lock:
+        for table_name in table_names:
+            _table_versions[table_name] = _table_versions.get(table_name, 0) + 1
+
+
+def _written_tables(session):
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    tables = _written_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            tables.add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state):
+    # bulk insert/update/delete statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table_name = getattr(orm_execute_state.statement.table, "name", None)
+        if table_name:
+            _written_tables(orm_execute_state.session).add(table_name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        bump_tables(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_tables(session):
+    session.info.pop("written_tables", None)
+
+
+def mark_written(session, *table_names):
+    """Record tables written with core statements on session.connection(), which no hook sees."""
+    _written_tables(session).update(table_names)
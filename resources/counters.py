@@ -0,0 +1,120 @@
+from collections import Counter
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect, select, update, insert, func
+from sqlalchemy.orm import Session
+
+from models import (
+    db, DashboardCounter, Student, Teacher, Staff, Section, Request,
+    ChangeGroupRequest, ChangeSectionRequest, SwapGroupRequest, SwapSectionRequest
+)
+
+APPEALED = "appealed"
+
+# rows of these models count towards the named counters
+COUNTED_MODELS = {
+    Student: "total_students",
+    Teacher: "total_teachers",
+    Staff: "total_staff",
+    Section: "total_sections",
+    ChangeGroupRequest: "group_changes",
+    SwapGroupRequest: "group_changes",
+    ChangeSectionRequest: "section_changes",
+    SwapSectionRequest: "section_changes",
+}
+
+
+def _count(model):
+    return select(func.count()).select_from(model).scalar_subquery()
+
+
+# how each counter is computed from scratch
+COUNTER_QUERIES = {
+    "total_students": select(_count(Student)),
+    "total_teachers": select(_count(Teacher)),
+    "total_staff": select(_count(Staff)),
+    "total_sections": select(_count(Section)),
+    "group_changes": select(_count(ChangeGroupRequest) + _count(SwapGroupRequest)),
+    "section_changes": select(_count(ChangeSectionRequest) + _count(SwapSectionRequest)),
+    "appeals": select(func.count()).select_from(Request).where(Request.status == APPEALED),
+}
+
+
+def adjust_counters(connection, deltas):
+    """Apply {counter name: delta} on the caller's connection, i.e. in its transaction."""
+    table = DashboardCounter.__table__
+    now = datetime.utcnow()
+    for name, delta in deltas.items():
+        if delta:
+            connection.execute(
+                update(table).where(table.c.name == name).values(value=table.c.value + delta, updated_at=now)
+            )
+
+
+def _status_delta(old_status, new_status):
+    return int(new_status == APPEALED) - int(old_status == APPEALED)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_counter_changes(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if type(obj) in COUNTED_MODELS:
+            deltas[COUNTED_MODELS[type(obj)]] += 1
+        if isinstance(obj, Request):
+            deltas["appeals"] += _status_delta(None, obj.status)
+    for obj in session.deleted:
+        if type(obj) in COUNTED_MODELS:
+            deltas[COUNTED_MODELS[type(obj)]] -= 1
+        if isinstance(obj, Request):
+            deltas["appeals"] += _status_delta(obj.status, None)
+    for obj in session.dirty:
+        if isinstance(obj, Request):
+            history = inspect(obj).attrs.status.history
+            if history.deleted or history.added:
+                old_status = history.deleted[0] if history.deleted else None
+                new_status = history.added[0] if history.added else obj.status
+                deltas["appeals"] += _status_delta(old_status, new_status)
+    if any(deltas.values()):
+        adjust_counters(session.connection(), deltas)
+
+
+def rebuild_counters():
+    """
+    Recompute every counter from the source tables and store the result. Each
+    counter is a single UPDATE computing its own value under the counter's row
+    lock, so a concurrent adjust_counters() either commits first and is counted
+    or waits for this commit and applies its delta on top; a missing counter is
+    inserted.
+    """
+    table = DashboardCounter.__table__
+    now = datetime.utcnow()
+    connection = db.session.connection()
+    for name, query in COUNTER_QUERIES.items():
+        value = func.coalesce(query.scalar_subquery(), 0)
+        result = connection.execute(update(table).where(table.c.name == name).values(value=value, updated_at=now))
+        if not result.rowcount:
+            connection.execute(insert(table).values(name=name, value=value, created_at=now, updated_at=now))
+    values = dict(connection.execute(select(table.c.name, table.c.value)).all())
+    db.session.commit()
+    return {name: values[name] for name in COUNTER_QUERIES}
+
+
+def read_counters():
+    """All dashboard counters in one primary-key read; rebuilt if any is missing."""
+    values = dict(db.session.execute(select(DashboardCounter.name, DashboardCounter.value)).all())
+    if any(name not in values for name in COUNTER_QUERIES):
+        return rebuild_counters()
+    return {name: values[name] for name in COUNTER_QUERIES}
+
+
+stats_cli = AppGroup("stats", help="Maintain the dashboard counters.")
+
+
+@stats_cli.command("rebuild-counters")
+def rebuild_counters_command():
+    """Recompute the dashboard counters from scratch."""
+    for name, value in rebuild_counters().items():
+        click.echo(f"{name}: {value}")
@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from flask import current_app
+
+# bcrypt releases the GIL while hashing, so a thread pool spreads the work
+# over cores while capping how many hashes run at once. The calling request
+# still waits for its own hash; the pool only bounds the CPU a burst can take.
+# Each kind of work gets its own pool so signups and logins never queue
+# behind a bulk import.
+POOL_WORKERS = {
+    "interactive": "PASSWORD_HASH_WORKERS",
+    "bulk": "BULK_HASH_WORKERS",
+}
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _pool(kind="interactive"):
+    executor = _executors.get(kind)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(kind)
+            if executor is None:
+                workers = current_app.config.get(POOL_WORKERS[kind]) or 2
+                executor = _executors[kind] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"bcrypt-{kind}")
+    return executor
+
+
+def configured_rounds():
+    return current_app.config.get("BCRYPT_ROUNDS", 12)
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(str(password).encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check(password, stored_hash):
+    return bcrypt.checkpw(str(password).encode('utf-8'), stored_hash.encode('utf-8'))
+
+
+def hash_password_async(password):
+    """Future of the bcrypt hash of password at the configured cost."""
+    return _pool().submit(_hash, password, configured_rounds())
+
+
+def hash_password(password):
+    return hash_password_async(password).result()
+
+
+def hash_passwords(passwords):
+    """Hash many passwords in parallel on the bulk pool, keeping their order."""
+    rounds = configured_rounds()
+    return list(_pool("bulk").map(lambda password: _hash(password, rounds), passwords))
+
+
+def check_password(password, stored_hash):
+    return _pool().submit(_check, password, stored_hash).result()
+
+
+def hash_rounds(stored_hash):
+    """Cost factor of a "$2b$12$..." hash."""
+    try:
+        return int(stored_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(stored_hash):
+    return hash_rounds(stored_hash) != configured_rounds()
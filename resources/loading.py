@@ -0,0 +1,126 @@
+from sqlalchemy.orm import joinedload
+
+from models import (
+    User, Student, Section, Group, Request, Teacher, Staff, Notification,
+    ChangeGroupRequest, ChangeSectionRequest, SwapGroupRequest, SwapSectionRequest,
+    TeacherGroup, TeacherSection
+)
+from resources.serialization import relation_target
+import resources.reference  # installs the reference resolver used by to_dict()
+
+
+# Loading plans mirror what each model's to_dict() touches, so serializing a page
+# costs a fixed number of queries whatever the page size is.
+# Every relation embedded by to_dict() is many-to-one, so joinedload keeps the
+# whole tree in the same SELECT as the page itself without multiplying rows.
+# Each plan takes an optional parent loader so plans can be nested
+# (e.g. Request -> Student -> ...).
+# Reference relations (roles, specialities, sections, groups) are embedded from
+# resources.reference, so plans never join them.
+
+def _load(parent, relation):
+    if parent is None:
+        return joinedload(relation)
+    return parent.joinedload(relation)
+
+
+def user_plan(parent=None):
+    return []
+
+
+def section_plan(parent=None):
+    return []
+
+
+def group_plan(parent=None):
+    return []
+
+
+def student_plan(parent=None):
+    return [_load(parent, Student.user)]
+
+
+def teacher_plan(parent=None):
+    return [_load(parent, Teacher.user)]
+
+
+def staff_plan(parent=None):
+    return [_load(parent, Staff.user)]
+
+
+def notification_plan(parent=None):
+    return [_load(parent, Notification.user)]
+
+
+def request_plan(parent=None):
+    return student_plan(_load(parent, Request.student))
+
+
+def change_group_request_plan(parent=None):
+    return request_plan(_load(parent, ChangeGroupRequest.request))
+
+
+def change_section_request_plan(parent=None):
+    return request_plan(_load(parent, ChangeSectionRequest.request))
+
+
+def swap_group_request_plan(parent=None):
+    return [
+        *request_plan(_load(parent, SwapGroupRequest.request)),
+        *student_plan(_load(parent, SwapGroupRequest.current_student)),
+        *student_plan(_load(parent, SwapGroupRequest.requested_student)),
+    ]
+
+
+def swap_section_request_plan(parent=None):
+    return [
+        *request_plan(_load(parent, SwapSectionRequest.request)),
+        *student_plan(_load(parent, SwapSectionRequest.current_student)),
+        *student_plan(_load(parent, SwapSectionRequest.requested_student)),
+    ]
+
+
+def teacher_group_plan(parent=None):
+    return teacher_plan(_load(parent, TeacherGroup.teacher))
+
+
+def teacher_section_plan(parent=None):
+    return teacher_plan(_load(parent, TeacherSection.teacher))
+
+
+DEFAULT_PLANS = {
+    User: user_plan,
+    Section: section_plan,
+    Group: group_plan,
+    Student: student_plan,
+    Teacher: teacher_plan,
+    Staff: staff_plan,
+    Notification: notification_plan,
+    Request: request_plan,
+    ChangeGroupRequest: change_group_request_plan,
+    ChangeSectionRequest: change_section_request_plan,
+    SwapGroupRequest: swap_group_request_plan,
+    SwapSectionRequest: swap_section_request_plan,
+    TeacherGroup: teacher_group_plan,
+    TeacherSection: teacher_section_plan,
+}
+
+
+def expand_plan(model, expand, parent=None):
+    """Loading plan that joins exactly the relations of an expand tree."""
+    options = []
+    for relation, subtree in expand.items():
+        target = relation_target(model, relation)
+        if target.__reference__:
+            continue
+        loader = _load(parent, getattr(model, relation))
+        nested = expand_plan(target, subtree, loader)
+        options.extend(nested or [loader])
+    return options
+
+
+def plan_for(model, expand=None):
+    if expand is None:
+        plan = DEFAULT_PLANS.get(model)
+        return plan() if plan else []
+    return expand_plan(model, expand)
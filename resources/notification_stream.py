@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, select, func
+from sqlalchemy.orm import Session
+
+from models import db, Notification
+
+# In-process pub/sub that wakes the SSE streams of the users who got new
+# notifications. Only a wake-up is published, the stream then reads its new rows
+# from the database, so nothing is lost if a wake-up is missed. Streams served by
+# other processes are not woken up; they find the rows at their next heartbeat.
+
+
+class Subscription:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._event = threading.Event()
+
+    def wake(self):
+        self._event.set()
+
+    def wait(self, timeout):
+        """True when woken up before timeout."""
+        woken = self._event.wait(timeout)
+        self._event.clear()
+        return woken
+
+
+class NotificationBroker:
+    def __init__(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_ids):
+        with self._lock:
+            subscriptions = [sub for user_id in user_ids for sub in self._subscriptions.get(user_id, ())]
+        for subscription in subscriptions:
+            subscription.wake()
+
+    def publish_all(self):
+        with self._lock:
+            subscriptions = [sub for subs in self._subscriptions.values() for sub in subs]
+        for subscription in subscriptions:
+            subscription.wake()
+
+
+broker = NotificationBroker()
+
+# session.info key: user ids to wake after commit, or ALL_USERS when unknown
+_NOTIFIED = "notified_users"
+ALL_USERS = "all"
+
+
+def _mark_notified(session, user_ids):
+    notified = session.info.get(_NOTIFIED)
+    if notified == ALL_USERS:
+        return
+    if user_ids == ALL_USERS:
+        session.info[_NOTIFIED] = ALL_USERS
+    else:
+        session.info.setdefault(_NOTIFIED, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_notifications(session, flush_context):
+    user_ids = {obj.user_id for obj in session.new if isinstance(obj, Notification)}
+    if user_ids:
+        _mark_notified(session, user_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_inserted_notifications(orm_execute_state):
+    # bulk inserts from resources.notifications bypass the flush
+    statement = orm_execute_state.statement
+    if not orm_execute_state.is_insert or getattr(statement.table, "name", None) != Notification.__tablename__:
+        return
+    params = orm_execute_state.parameters
+    if isinstance(params, list) and params:
+        _mark_notified(orm_execute_state.session, {row["user_id"] for row in params})
+    else:
+        # INSERT ... SELECT: the recipients are only known to the database
+        _mark_notified(orm_execute_state.session, ALL_USERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_notifications(session):
+    notified = session.info.pop(_NOTIFIED, None)
+    if notified == ALL_USERS:
+        broker.publish_all()
+    elif notified:
+        broker.publish(notified)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_notifications(session):
+    session.info.pop(_NOTIFIED, None)
+
+
+def latest_notification_id(user_id):
+    return db.session.execute(
+        select(func.max(Notification.notification_id)).where(Notification.user_id == user_id)
+    ).scalar() or 0
+
+
+def _new_notifications(user_id, last_id, limit):
+    rows = db.session.execute(
+        select(Notification)
+        .where(Notification.user_id == user_id, Notification.notification_id > last_id)
+        .order_by(Notification.notification_id)
+        .limit(limit)
+    ).scalars().all()
+    events = [(row.notification_id, row.to_dict({})) for row in rows]
+    # end the transaction so the next read sees rows committed meanwhile
+    db.session.rollback()
+    return events
+
+
+def _format_event(notification_id, data):
+    return f"id: {notification_id}\nevent: notification\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_notifications(user_id, last_id=None):
+    """
+    Server-Sent Events generator of the user's notifications newer than last_id
+    (the Last-Event-ID of a reconnecting client); without it, only notifications
+    created after connecting are sent. Ends after SSE_MAX_DURATION seconds so the
+    worker is released; EventSource reconnects and resumes from the last id.
+    """
+    heartbeat = current_app.config.get("SSE_HEARTBEAT_SECONDS", 15)
+    max_duration = current_app.config.get("SSE_MAX_DURATION", 300)
+    batch_size = current_app.config.get("SSE_BATCH_SIZE", 100)
+
+    subscription = broker.subscribe(user_id)
+    try:
+        if last_id is None:
+            last_id = latest_notification_id(user_id)
+            db.session.rollback()
+        yield "retry: 3000\n\n"
+
+        deadline = time.monotonic() + max_duration
+        while time.monotonic() < deadline:
+            events = _new_notifications(user_id, last_id, batch_size)
+            for notification_id, data in events:
+                last_id = notification_id
+                yield _format_event(notification_id, data)
+            if len(events) == batch_size:
+                continue
+            if not subscription.wait(min(heartbeat, max(deadline - time.monotonic(), 0))):
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
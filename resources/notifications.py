@@ -0,0 +1,249 @@
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select, insert, update, delete, literal, union
+
+from models import db, Notification, NotificationArchive, NotificationOutbox, Staff, Teacher, TeacherGroup, TeacherSection
+from resources.unread_counts import adjust_unread, adjust_unread_from_select, rebuild_unread_counts
+
+NOTIFICATION_COLUMNS = ["user_id", "title", "message", "notification_type", "is_read", "created_at", "updated_at"]
+
+
+# Audiences are named so an outbox job can store who to notify and resolve it later.
+# Each one returns a SELECT of user_id.
+
+def staff_audience():
+    return select(Staff.user_id)
+
+
+def teachers_audience(group_ids=(), section_ids=()):
+    """Teachers assigned to any of the groups or sections."""
+    parts = []
+    if group_ids:
+        parts.append(
+            select(Teacher.user_id).join(TeacherGroup, TeacherGroup.teacher_id == Teacher.teacher_id)
+            .where(TeacherGroup.group_id.in_(group_ids))
+        )
+    if section_ids:
+        parts.append(
+            select(Teacher.user_id).join(TeacherSection, TeacherSection.teacher_id == Teacher.teacher_id)
+            .where(TeacherSection.section_id.in_(section_ids))
+        )
+    if not parts:
+        return None
+    # UNION (not ALL) so a teacher of several of the groups is notified once
+    return parts[0].distinct() if len(parts) == 1 else union(*parts)
+
+
+def users_audience(user_ids=()):
+    return list(dict.fromkeys(user_ids))
+
+
+AUDIENCES = {
+    "staff": staff_audience,
+    "teachers": teachers_audience,
+    "users": users_audience,
+}
+
+
+def fan_out(recipients, title, message, notification_type):
+    """
+    Insert one unread notification per recipient with a single statement:
+    INSERT ... SELECT when recipients is a query, one executemany for a list of user ids.
+    Runs in the caller's transaction. Returns the number of rows inserted.
+    """
+    if recipients is None:
+        return 0
+    now = datetime.utcnow()
+
+    if isinstance(recipients, (list, tuple)):
+        return send_notifications([
+            {"user_id": user_id, "title": title, "message": message, "notification_type": notification_type}
+            for user_id in recipients
+        ])
+
+    audience = recipients.subquery()
+    rows = select(
+        audience.c.user_id,
+        literal(title), literal(message), literal(notification_type),
+        literal(False), literal(now), literal(now),
+    )
+    result = db.session.execute(insert(Notification).from_select(NOTIFICATION_COLUMNS, rows))
+    adjust_unread_from_select(db.session.connection(), select(audience.c.user_id))
+    return result.rowcount
+
+
+def send_notifications(notifications):
+    """
+    Insert notifications that differ per recipient, a list of dicts with
+    user_id, title, message and notification_type, with one executemany.
+    Runs in the caller's transaction. Returns the number of rows inserted.
+    """
+    if not notifications:
+        return 0
+    now = datetime.utcnow()
+    db.session.execute(insert(Notification), [
+        {**notification, "is_read": False, "created_at": now, "updated_at": now}
+        for notification in notifications
+    ])
+    adjust_unread(db.session.connection(), Counter(notification["user_id"] for notification in notifications))
+    return len(notifications)
+
+
+def notify(audience, title, message, notification_type, **audience_args):
+    """
+    Notify a named audience. With NOTIFICATION_FANOUT_MODE = "outbox" only a job
+    row is added to the caller's transaction and the worker inserts the
+    notifications later; otherwise they are inserted right away.
+    """
+    if current_app.config.get("NOTIFICATION_FANOUT_MODE", "inline") == "outbox":
+        db.session.add(NotificationOutbox(
+            audience=audience,
+            audience_args=audience_args,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            status="pending",
+            attempts=0,
+        ))
+        return None
+    return fan_out(AUDIENCES[audience](**audience_args), title, message, notification_type)
+
+
+def process_outbox(batch_size=100, max_attempts=5):
+    """
+    Deliver up to batch_size pending jobs, each in its own transaction together
+    with its status change, so a job is delivered exactly once.
+    Returns the number of jobs processed.
+    """
+    job_ids = db.session.execute(
+        select(NotificationOutbox.outbox_id)
+        .where(NotificationOutbox.status == "pending")
+        .order_by(NotificationOutbox.outbox_id)
+        .limit(batch_size)
+    ).scalars().all()
+    db.session.commit()
+
+    for job_id in job_ids:
+        job = db.session.execute(
+            select(NotificationOutbox)
+            .where(NotificationOutbox.outbox_id == job_id, NotificationOutbox.status == "pending")
+            .with_for_update(skip_locked=True)
+        ).scalar()
+        if job is None:
+            # taken by another worker meanwhile
+            db.session.rollback()
+            continue
+        attempts = job.attempts + 1
+        try:
+            fan_out(AUDIENCES[job.audience](**(job.audience_args or {})), job.title, job.message, job.notification_type)
+            job.status = "done"
+            job.processed_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as error:
+            db.session.rollback()
+            db.session.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.outbox_id == job_id)
+                .values(
+                    attempts=attempts,
+                    last_error=str(error),
+                    status="failed" if attempts >= max_attempts else "pending",
+                )
+            )
+            db.session.commit()
+    return len(job_ids)
+
+
+ARCHIVED_COLUMNS = ["notification_id", "user_id", "title", "message", "notification_type", "is_read",
+                    "created_at", "updated_at", "archived_at"]
+
+
+def purge_notifications(days, mode="archive", batch_size=1000, pause=0.1, max_batches=None):
+    """
+    Move (mode="archive") or delete (mode="delete") read notifications older than
+    days, batch_size rows per transaction with a pause between batches so row
+    locks stay short. Unread notifications are never touched, so the unread
+    counters stay exact. Returns the number of rows removed from notifications.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    removed, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        ids = db.session.execute(
+            select(Notification.notification_id)
+            .where(Notification.is_read == True, Notification.created_at < cutoff)
+            # ix_notifications_read_created (with the primary key InnoDB appends) is already
+            # in this order, so each batch is a range scan that stops after batch_size rows
+            .order_by(Notification.created_at, Notification.notification_id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        if mode == "archive":
+            db.session.execute(insert(NotificationArchive).from_select(ARCHIVED_COLUMNS, select(
+                Notification.notification_id, Notification.user_id, Notification.title, Notification.message,
+                Notification.notification_type, Notification.is_read, Notification.created_at,
+                Notification.updated_at, literal(datetime.utcnow()),
+            ).where(Notification.notification_id.in_(ids))))
+        db.session.execute(
+            delete(Notification).where(Notification.notification_id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        removed, batches = removed + len(ids), batches + 1
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+    return removed
+
+
+notifications_cli = AppGroup("notifications", help="Deliver and maintain notifications.")
+
+
+@notifications_cli.command("process-outbox")
+@click.option("--batch-size", default=100, show_default=True)
+@click.option("--loop", is_flag=True, help="Keep polling instead of exiting once the outbox is empty.")
+@click.option("--interval", default=1.0, show_default=True, help="Seconds to sleep when the outbox is empty.")
+def process_outbox_command(batch_size, loop, interval):
+    """Insert the notifications of pending fan-out jobs."""
+    while True:
+        processed = process_outbox(batch_size)
+        if processed:
+            click.echo(f"{processed} jobs processed")
+        elif not loop:
+            break
+        else:
+            time.sleep(interval)
+
+
+@notifications_cli.command("rebuild-unread-counts")
+def rebuild_unread_counts_command():
+    """Recompute the per-user unread counters from the notifications table."""
+    rebuild_unread_counts()
+    click.echo("unread counters rebuilt")
+
+
+@notifications_cli.command("purge")
+@click.option("--days", type=int, help="Keep read notifications younger than this (default NOTIFICATION_RETENTION_DAYS).")
+@click.option("--mode", type=click.Choice(["archive", "delete"]), help="Default NOTIFICATION_RETENTION_MODE.")
+@click.option("--batch-size", type=int, help="Rows per transaction (default NOTIFICATION_RETENTION_BATCH_SIZE).")
+@click.option("--pause", type=float, help="Seconds between batches (default NOTIFICATION_RETENTION_PAUSE).")
+@click.option("--max-batches", type=int, help="Stop after this many batches, for time-boxed runs.")
+def purge_command(days, mode, batch_size, pause, max_batches):
+    """Archive or delete old read notifications in bounded batches."""
+    config = current_app.config
+    mode = mode or config.get("NOTIFICATION_RETENTION_MODE", "archive")
+    removed = purge_notifications(
+        days if days is not None else config.get("NOTIFICATION_RETENTION_DAYS", 90),
+        mode,
+        batch_size or config.get("NOTIFICATION_RETENTION_BATCH_SIZE", 1000),
+        pause if pause is not None else config.get("NOTIFICATION_RETENTION_PAUSE", 0.1),
+        max_batches,
+    )
+    click.echo(f"{removed} notifications {'archived' if mode == 'archive' else 'deleted'}")
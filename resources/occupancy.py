@@ -0,0 +1,239 @@
+from collections import Counter
+from datetime import datetime
+
+import click
+from sqlalchemy import event, inspect, select, update, delete, insert, exists, func, or_, literal
+from sqlalchemy.orm import Session
+
+from models import db, Student, Group, Section, GroupOccupancy, SectionOccupancy
+from resources.counters import stats_cli
+from resources.reference import reference_row
+
+# Placement columns of a student -> the occupancy they count towards
+GROUP_COLUMNS = ["tutorial_group_id", "lab_group_id"]
+SECTION_COLUMNS = ["section_id"]
+
+# occupancy model -> (placement model, id column, student columns it counts)
+OCCUPANCY = {
+    GroupOccupancy: (Group, "group_id", GROUP_COLUMNS),
+    SectionOccupancy: (Section, "section_id", SECTION_COLUMNS),
+}
+
+
+def _students(model):
+    """Scalar subquery counting the students of the placement row it is correlated with."""
+    placement, id_column, columns = OCCUPANCY[model]
+    key = getattr(placement, id_column)
+    return select(func.count()).where(or_(*(getattr(Student, column) == key for column in columns))).scalar_subquery()
+
+
+def _counted(model, now):
+    """SELECT of (id, students, created_at, updated_at) per placement, counted from the students table."""
+    placement, id_column, _ = OCCUPANCY[model]
+    return select(getattr(placement, id_column), _students(model), literal(now), literal(now))
+
+
+def _insert_missing(connection, model, row_ids):
+    """
+    Add the counter rows missing for row_ids, counted from the students table
+    as this transaction sees it (so including its own moves).
+    """
+    placement, id_column, _ = OCCUPANCY[model]
+    key = getattr(placement, id_column)
+    connection.execute(insert(model).from_select(
+        [id_column, "students", "created_at", "updated_at"],
+        _counted(model, datetime.utcnow()).where(
+            key.in_(row_ids), ~exists().where(getattr(model, id_column) == key)
+        ),
+    ))
+
+
+def adjust_occupancy(connection, group_deltas=None, section_deltas=None):
+    """
+    Apply {id: delta} to the group and section counters on the caller's
+    connection, after the students were moved; a missing counter is inserted
+    with the count of the students table instead.
+    """
+    now = datetime.utcnow()
+    for model, deltas in ((GroupOccupancy, group_deltas or {}), (SectionOccupancy, section_deltas or {})):
+        table = model.__table__
+        id_column = OCCUPANCY[model][1]
+        missing = []
+        for row_id, delta in deltas.items():
+            if delta and row_id is not None:
+                result = connection.execute(
+                    update(table).where(table.c[id_column] == row_id)
+                    .values(students=table.c.students + delta, updated_at=now)
+                )
+                if not result.rowcount:
+                    missing.append(row_id)
+        if missing:
+            _insert_missing(connection, model, missing)
+
+
+def read_occupancy(model, row_ids, lock=False):
+    """
+    {id: students} of the given groups or sections, locked in id order until
+    the transaction ends when lock. A missing counter row is inserted from the
+    students table (and locked) first; without lock it is only counted. Ids of
+    placements that do not exist are left out.
+    """
+    row_ids = sorted(set(row_ids))
+    if not row_ids:
+        return {}
+    key = getattr(model, OCCUPANCY[model][1])
+    query = select(key, model.students).order_by(key)
+    if lock:
+        query = query.with_for_update()
+    occupied = dict(db.session.execute(query.where(key.in_(row_ids))).all())
+
+    missing = [row_id for row_id in row_ids if row_id not in occupied]
+    if missing:
+        if lock:
+            _insert_missing(db.session.connection(), model, missing)
+            occupied.update(db.session.execute(query.where(key.in_(missing))).all())
+        else:
+            placement_key = getattr(OCCUPANCY[model][0], OCCUPANCY[model][1])
+            counted = _counted(model, datetime.utcnow()).where(placement_key.in_(missing))
+            occupied.update((row_id, students) for row_id, students, *_ in db.session.execute(counted))
+    return occupied
+
+
+def _placement_history(obj, columns):
+    """[(old id, new id)] for the placement columns that changed in this flush."""
+    moves = []
+    state = inspect(obj)
+    for column in columns:
+        history = state.attrs[column].history
+        if history.deleted or history.added:
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else getattr(obj, column)
+            if old != new:
+                moves.append((old, new))
+    return moves
+
+
+@event.listens_for(Session, "after_flush")
+def _track_occupancy(session, flush_context):
+    groups, sections = Counter(), Counter()
+    new_groups, new_sections, gone_groups, gone_sections = [], [], [], []
+
+    for obj in session.new:
+        if isinstance(obj, Student):
+            groups.update(getattr(obj, column) for column in GROUP_COLUMNS)
+            sections.update(getattr(obj, column) for column in SECTION_COLUMNS)
+        elif isinstance(obj, Group):
+            new_groups.append(obj.group_id)
+        elif isinstance(obj, Section):
+            new_sections.append(obj.section_id)
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            groups.subtract(getattr(obj, column) for column in GROUP_COLUMNS)
+            sections.subtract(getattr(obj, column) for column in SECTION_COLUMNS)
+        elif isinstance(obj, Group):
+            gone_groups.append(obj.group_id)
+        elif isinstance(obj, Section):
+            gone_sections.append(obj.section_id)
+    for obj in session.dirty:
+        if isinstance(obj, Student):
+            for counter, columns in ((groups, GROUP_COLUMNS), (sections, SECTION_COLUMNS)):
+                for old, new in _placement_history(obj, columns):
+                    counter[old] -= 1
+                    counter[new] += 1
+
+    if not (new_groups or new_sections or gone_groups or gone_sections or any(groups.values()) or any(sections.values())):
+        return
+    connection = session.connection()
+    now = datetime.utcnow()
+    if new_groups:
+        connection.execute(insert(GroupOccupancy.__table__), [
+            {"group_id": group_id, "students": 0, "created_at": now, "updated_at": now} for group_id in new_groups
+        ])
+    if new_sections:
+        connection.execute(insert(SectionOccupancy.__table__), [
+            {"section_id": section_id, "students": 0, "created_at": now, "updated_at": now} for section_id in new_sections
+        ])
+    if gone_groups:
+        connection.execute(delete(GroupOccupancy.__table__).where(GroupOccupancy.group_id.in_(gone_groups)))
+    if gone_sections:
+        connection.execute(delete(SectionOccupancy.__table__).where(SectionOccupancy.section_id.in_(gone_sections)))
+    if any(groups.values()) or any(sections.values()):
+        adjust_occupancy(connection, groups, sections)
+
+
+def reserve_seats(group_seats=None, section_seats=None):
+    """
+    Lock the occupancy rows of the groups and sections that will receive
+    students ({id: seats needed}) until the transaction ends, and check they
+    have room. Rows are locked in id order so concurrent reservations cannot
+    deadlock. Returns an error dict for the first one that is full, else None.
+    """
+    for model, reference_model, seats, label in (
+        (GroupOccupancy, Group, group_seats or {}, "Group"),
+        (SectionOccupancy, Section, section_seats or {}, "Section"),
+    ):
+        seats = {row_id: count for row_id, count in seats.items() if count > 0}
+        if not seats:
+            continue
+        occupied = read_occupancy(model, seats, lock=True)
+        for row_id in sorted(seats):
+            capacity = (reference_row(reference_model, row_id) or {}).get("max_capacity")
+            if capacity is None or row_id not in occupied:
+                return {"error": f"{label} {row_id} not found"}
+            if occupied[row_id] + seats[row_id] > capacity:
+                return {"error": f"{label} {row_id} is full ({occupied[row_id]}/{capacity})"}
+    return None
+
+
+def group_occupancy(section_id=None, group_type=None):
+    query = select(
+        Group.group_id, Group.group_name, Group.group_type, Group.section_id, Group.max_capacity,
+        # counted on the fly for a placement whose counter row is missing
+        func.coalesce(GroupOccupancy.students, _students(GroupOccupancy)),
+    ).outerjoin(GroupOccupancy, GroupOccupancy.group_id == Group.group_id).order_by(Group.group_id)
+    if section_id:
+        query = query.where(Group.section_id == section_id)
+    if group_type:
+        query = query.where(Group.group_type == group_type)
+    return [
+        {
+            "group_id": group_id, "group_name": group_name, "group_type": kind, "section_id": parent_id,
+            "max_capacity": capacity, "students": students, "available": capacity - students,
+        }
+        for group_id, group_name, kind, parent_id, capacity, students in db.session.execute(query)
+    ]
+
+
+def section_occupancy(speciality_id=None):
+    query = select(
+        Section.section_id, Section.name, Section.speciality_id, Section.max_capacity,
+        # counted on the fly for a placement whose counter row is missing
+        func.coalesce(SectionOccupancy.students, _students(SectionOccupancy)),
+    ).outerjoin(SectionOccupancy, SectionOccupancy.section_id == Section.section_id).order_by(Section.section_id)
+    if speciality_id:
+        query = query.where(Section.speciality_id == speciality_id)
+    return [
+        {
+            "section_id": section_id, "name": name, "speciality_id": parent_id,
+            "max_capacity": capacity, "students": students, "available": capacity - students,
+        }
+        for section_id, name, parent_id, capacity, students in db.session.execute(query)
+    ]
+
+
+def rebuild_occupancy():
+    """Recompute both counter tables from the students table."""
+    now = datetime.utcnow()
+    for model in OCCUPANCY:
+        db.session.execute(delete(model))
+        db.session.execute(insert(model).from_select(
+            [OCCUPANCY[model][1], "students", "created_at", "updated_at"], _counted(model, now)
+        ))
+    db.session.commit()
+
+
+@stats_cli.command("rebuild-occupancy")
+def rebuild_occupancy_command():
+    """Recompute the group and section occupancy counters from scratch."""
+    rebuild_occupancy()
+    click.echo("occupancy rebuilt")
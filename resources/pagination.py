@@ -0,0 +1,131 @@
+import base64
+import json
+import math
+from datetime import datetime
+
+from flask import current_app, request
+from sqlalchemy import or_, and_, text
+
+from models import db
+from resources.cache import TTLCache, table_version
+
+# query parameters that only shape the page, not the set of matching rows
+PAGING_PARAMS = {"page", "page_size", "per_page", "cursor", "with_count", "exact_total", "fields", "expand"}
+
+_count_cache = TTLCache()
+
+
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    return datetime.fromisoformat(created_at), int(row_id)
+
+
+def keyset_paginate(query, created_column, id_column, cursor, page_size, with_count=False):
+    """
+    Newest-first page of query seeked from an opaque (created_at, id) cursor.
+    An empty cursor returns the first page. Only page_size + 1 rows are read
+    whatever the depth, and the COUNT only runs when with_count is set.
+    Returns (items, pagination, error).
+    """
+    if page_size < 1:
+        return None, None, {"error": "page_size must be positive"}
+
+    total = query.order_by(None).count() if with_count else None
+
+    if cursor:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except (ValueError, TypeError):
+            return None, None, {"error": "Invalid cursor"}
+        query = query.filter(or_(
+            created_column < created_at,
+            and_(created_column == created_at, id_column < row_id),
+        ))
+
+    rows = query.order_by(None).order_by(created_column.desc(), id_column.desc()).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+
+    pagination = {
+        "pageSize": page_size,
+        "nextCursor": next_cursor,
+    }
+    if with_count:
+        pagination["totalItems"] = total
+    return rows, pagination, None
+
+
+def count_cache_key(endpoint, args):
+    """Endpoint plus its filter parameters, sorted and stripped, ignoring paging parameters."""
+    filters = []
+    for key in sorted(args.keys()):
+        if key in PAGING_PARAMS:
+            continue
+        values = tuple(sorted(value.strip() for value in args.getlist(key) if value.strip()))
+        if values:
+            filters.append((key, values))
+    return endpoint, tuple(filters)
+
+
+def estimated_count(table_name):
+    """Row count from the table statistics, falling back to an exact COUNT(*) outside MySQL."""
+    if db.engine.dialect.name == "mysql":
+        estimate = db.session.execute(text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ), {"table_name": table_name}).scalar()
+        if estimate is not None:
+            return int(estimate)
+    return db.session.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+
+
+def cached_count(query, key, tables):
+    """
+    COUNT(*) of query, cached for COUNT_CACHE_TTL seconds. The key includes the
+    write versions of the tables the query reads, so any committed write to
+    them invalidates the cached total.
+    """
+    versioned_key = (key, tuple(table_version(table) for table in tables))
+    total = _count_cache.get(versioned_key)
+    if total is None:
+        total = query.order_by(None).count()
+        _count_cache.set(versioned_key, total, current_app.config.get("COUNT_CACHE_TTL", 30))
+    return total
+
+
+def paginate(query, page, page_size, tables, exact_total=True):
+    """
+    Offset pagination with a cached total.
+    tables lists the tables the filtered query reads, the first one being the
+    listed table. exact_total=False on an unfiltered list reports the estimate
+    from the table statistics instead of counting.
+    Returns (items, pagination).
+    """
+    page_obj = query.paginate(page=page, per_page=page_size, count=False)
+
+    key = count_cache_key(request.endpoint, request.args)
+    estimated = not exact_total and not key[1]
+    if estimated:
+        total = estimated_count(tables[0])
+    else:
+        total = cached_count(query, key, tables)
+
+    pagination = {
+        "totalItems": total,
+        "currentPage": page_obj.page,
+        "pageSize": page_obj.per_page,
+        "totalPages": math.ceil(total / page_obj.per_page) if page_obj.per_page else 0,
+    }
+    if estimated:
+        pagination["estimated"] = True
+    return page_obj.items, pagination
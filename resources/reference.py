@@ -0,0 +1,118 @@
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import inspect, select
+
+import models.base
+from models import db, Role, Speciality, Section, Group
+from resources.cache import table_version
+
+# Reference tables change a few times a semester but are embedded in almost every
+# response. They are kept in memory as serialized rows and reloaded whenever a
+# commit in this process writes one of them (table versions from resources.cache),
+# or after REFERENCE_CACHE_TTL seconds to pick up writes made by other processes.
+REFERENCE_MODELS = [Role, Speciality, Section, Group]
+REFERENCE_TABLES = {model.__tablename__ for model in REFERENCE_MODELS}
+
+
+class ReferenceData:
+    def __init__(self, version, rows):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.rows = rows  # model -> {id: flat to_dict()}
+        self.role_ids = {row["role_name"]: role_id for role_id, row in rows[Role].items()}
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def reference_version():
+    return tuple(table_version(model.__tablename__) for model in REFERENCE_MODELS)
+
+
+def _load(version):
+    rows = {}
+    for model in REFERENCE_MODELS:
+        id_column = inspect(model).primary_key[0]
+        rows[model] = {
+            getattr(obj, id_column.key): obj.to_dict({})
+            for obj in db.session.execute(select(model)).scalars()
+        }
+    return ReferenceData(version, rows)
+
+
+def _has_pending_reference_writes():
+    # never snapshot rows this transaction wrote but has not committed
+    return bool(REFERENCE_TABLES & db.session.info.get("written_tables", set()))
+
+
+def reference_data():
+    """Current snapshot of the reference tables, reloaded when stale; None if it cannot be trusted."""
+    global _snapshot
+    if not has_app_context() or _has_pending_reference_writes():
+        return None
+
+    version = reference_version()
+    ttl = current_app.config.get("REFERENCE_CACHE_TTL", 60)
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version or time.monotonic() - snapshot.loaded_at > ttl:
+        with _lock:
+            snapshot = _snapshot
+            if snapshot is None or snapshot.version != version or time.monotonic() - snapshot.loaded_at > ttl:
+                snapshot = _snapshot = _load(version)
+    return snapshot
+
+
+def invalidate_reference_data():
+    global _snapshot
+    _snapshot = None
+
+
+def reference_dict(model, row_id, expand=None):
+    """
+    Serialized row of a reference model with its relations embedded like
+    BaseModel.embed() does, or None when the row is not cached.
+    """
+    snapshot = reference_data()
+    if snapshot is None:
+        return None
+    try:
+        return _compose(snapshot, model, row_id, expand)
+    except KeyError:
+        # created by another process since the last load
+        return None
+
+
+def _compose(snapshot, model, row_id, expand):
+    data = dict(snapshot.rows[model][row_id])
+    for relation, column in model.__expandable__.items():
+        if expand is not None and relation not in expand:
+            continue
+        target = inspect(model).relationships[relation].mapper.class_
+        related_id = data[column]
+        data[relation] = None if related_id is None else _compose(
+            snapshot, target, related_id, None if expand is None else expand[relation]
+        )
+    return data
+
+
+def reference_row(model, row_id):
+    """Flat serialized row of a reference model, read from the database only on a cache miss."""
+    row = reference_dict(model, row_id, {})
+    if row is None:
+        obj = db.session.get(model, row_id)
+        row = obj.to_dict({}) if obj else None
+    return row
+
+
+def role_id(role_name):
+    """role_id of a role by name, from the cache when possible."""
+    snapshot = reference_data()
+    if snapshot is not None and role_name in snapshot.role_ids:
+        return snapshot.role_ids[role_name]
+    return db.session.execute(select(Role.role_id).filter_by(role_name=role_name)).scalar()
+
+
+models.base.reference_resolver = reference_dict
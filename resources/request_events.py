@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+
+from models import Request, RequestEvent
+from resources.cache import mark_written
+
+DELETED = "deleted"
+
+
+def _event(request_id, student_id, kind, from_status, to_status, reason=None, comment=None, now=None):
+    now = now or datetime.utcnow()
+    return {
+        "request_id": request_id, "student_id": student_id, "request_type": kind,
+        "from_status": from_status, "to_status": to_status, "reason": reason, "comment": comment,
+        "created_at": now, "updated_at": now,
+    }
+
+
+def record_events(connection, events):
+    """Append events (dicts of request_id, student_id, kind, from_status, to_status[, reason, comment]) on the caller's connection."""
+    if events:
+        now = datetime.utcnow()
+        connection.execute(insert(RequestEvent.__table__), [_event(**row, now=now) for row in events])
+
+
+# Transitions are collected at each flush and written once, just before the
+# commit, so only the status a transaction leaves a request in is recorded.
+# session.info key: {request_id: event} collected over the flushes of a transaction
+_PENDING = "request_events"
+
+
+def _previous(history, current):
+    if history.deleted:
+        return history.deleted[0]
+    return None if history.added else current
+
+
+def _collect(session, obj, from_status, to_status):
+    pending = session.info.setdefault(_PENDING, {})
+    entry = pending.get(obj.request_id)
+    if entry is None:
+        pending[obj.request_id] = dict(
+            request_id=obj.request_id, student_id=obj.student_id, kind=obj.request_type,
+            from_status=from_status, to_status=to_status, reason=obj.reason, comment=obj.comment,
+        )
+    else:
+        # a later flush of the same transaction: keep where the request started from
+        entry.update(to_status=to_status, reason=obj.reason, comment=obj.comment)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_request_changes(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, Request):
+            _collect(session, obj, None, obj.status)
+    for obj in session.dirty:
+        if isinstance(obj, Request):
+            history = inspect(obj).attrs.status.history
+            if history.has_changes():
+                _collect(session, obj, _previous(history, obj.status), obj.status)
+    for obj in session.deleted:
+        if isinstance(obj, Request):
+            _collect(session, obj, obj.status, DELETED)
+
+
+@event.listens_for(Session, "before_commit")
+def _record_request_events(session):
+    # one event per request and transaction, however many flushes it took;
+    # a status set back to where it started is no transition
+    session.flush()
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    events = [entry for entry in pending.values() if entry["from_status"] != entry["to_status"]]
+    if events:
+        record_events(session.connection(), events)
+        mark_written(session, RequestEvent.__tablename__)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_request_changes(session):
+    session.info.pop(_PENDING, None)
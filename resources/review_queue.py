@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect, select, delete, insert, or_
+from sqlalchemy.orm import Session
+
+from models import db, Request, ReviewQueueEntry
+from resources.cache import mark_written
+
+QUEUED_STATUSES = ("pending", "appealed")
+QUEUED_TYPES = ("group", "section")
+
+
+def is_queued(status, kind):
+    return status in QUEUED_STATUSES and kind in QUEUED_TYPES
+
+
+def priority_at(created_at, urgency, status):
+    """
+    When the request would have been created to be reviewed in plain arrival
+    order: each urgency level and an appeal count as that much waiting time.
+    Static, so the queue order lives in an index; a request that waits long
+    enough still overtakes newer urgent ones.
+    """
+    hours = urgency * current_app.config.get("REVIEW_QUEUE_URGENCY_HOURS", 24)
+    if status == "appealed":
+        hours += current_app.config.get("REVIEW_QUEUE_APPEAL_HOURS", 72)
+    return (created_at or datetime.utcnow()) - timedelta(hours=hours)
+
+
+def _entry(request_id, kind, created_at, urgency, status, now):
+    return {
+        "request_id": request_id, "request_type": kind,
+        "priority_at": priority_at(created_at, urgency, status),
+        "claimed_by": None, "lease_expires_at": None, "created_at": now, "updated_at": now,
+    }
+
+
+def dequeue(connection, request_ids):
+    """Drop the entries of requests decided with bulk statements, on the caller's connection."""
+    request_ids = list(request_ids)
+    if request_ids:
+        table = ReviewQueueEntry.__table__
+        connection.execute(delete(table).where(table.c.request_id.in_(request_ids)))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_review_queue(session, flush_context):
+    touched, queued = set(), []
+    for obj in session.new:
+        if isinstance(obj, Request) and is_queued(obj.status, obj.request_type):
+            touched.add(obj.request_id)
+            queued.append(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Request):
+            touched.add(obj.request_id)
+    for obj in session.dirty:
+        if isinstance(obj, Request):
+            state = inspect(obj)
+            if state.attrs.status.history.has_changes() or state.attrs.urgency.history.has_changes():
+                # re-entering the queue drops a running claim
+                touched.add(obj.request_id)
+                if is_queued(obj.status, obj.request_type):
+                    queued.append(obj)
+
+    if not touched:
+        return
+    connection = session.connection()
+    now = datetime.utcnow()
+    dequeue(connection, touched)
+    if queued:
+        connection.execute(insert(ReviewQueueEntry.__table__), [
+            _entry(obj.request_id, obj.request_type, obj.created_at, obj.urgency, obj.status, now) for obj in queued
+        ])
+    mark_written(session, ReviewQueueEntry.__tablename__)
+
+
+def claim_next(staff_id, request_types=None):
+    """
+    Lease the first unclaimed (or expired) entry to staff_id for
+    REVIEW_QUEUE_LEASE_SECONDS, in the caller's transaction. Entries another
+    transaction is claiming are skipped, not waited for. Returns the entry or None.
+    """
+    now = datetime.utcnow()
+    query = (
+        select(ReviewQueueEntry)
+        .where(or_(ReviewQueueEntry.lease_expires_at.is_(None), ReviewQueueEntry.lease_expires_at < now))
+        .order_by(ReviewQueueEntry.priority_at, ReviewQueueEntry.request_id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if request_types:
+        query = query.where(ReviewQueueEntry.request_type.in_(request_types))
+    entry = db.session.execute(query).scalars().first()
+    if entry is None:
+        return None
+    entry.claimed_by = staff_id
+    entry.lease_expires_at = now + timedelta(seconds=current_app.config.get("REVIEW_QUEUE_LEASE_SECONDS", 600))
+    return entry
+
+
+def rebuild_review_queue():
+    """Recompute the queue from the requests; needed after changing the priority weights. Drops running claims."""
+    now = datetime.utcnow()
+    rows = db.session.execute(
+        select(Request.request_id, Request.request_type, Request.created_at, Request.urgency, Request.status)
+        .where(Request.status.in_(QUEUED_STATUSES), Request.request_type.in_(QUEUED_TYPES))
+    ).all()
+    db.session.execute(delete(ReviewQueueEntry))
+    if rows:
+        db.session.execute(insert(ReviewQueueEntry), [_entry(*row, now) for row in rows])
+    db.session.commit()
+    return len(rows)
+
+
+requests_cli = AppGroup("requests", help="Request maintenance.")
+
+
+@requests_cli.command("rebuild-queue")
+def rebuild_review_queue_command():
+    """Recompute the staff review queue from the pending and appealed requests."""
+    click.echo(f"{rebuild_review_queue()} requests queued")
@@ -0,0 +1,150 @@
+import re
+import unicodedata
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect, select, insert, delete, func, literal, case, union_all
+
+from models import db, Student, Teacher, Staff, SearchToken
+
+# entity_type stored in search_tokens -> model whose first/last names are indexed
+SEARCHABLE = {
+    "student": Student,
+    "teacher": Teacher,
+    "staff": Staff,
+}
+ENTITY_TYPES = {model: entity_type for entity_type, model in SEARCHABLE.items()}
+
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TERMS = 8
+
+
+def normalize(value):
+    """Lower-case and strip accents so 'Hélène' and 'helene' index the same."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(*values):
+    tokens = set()
+    for value in values:
+        tokens.update(token[:MAX_TOKEN_LENGTH] for token in re.split(r"[\W_]+", normalize(value)) if token)
+    return tokens
+
+
+def _id_column(model):
+    return inspect(model).primary_key[0]
+
+
+def index_entities(connection, entity_type, people):
+    """
+    Replace the tokens of people, an iterable of (entity_id, first_name, last_name),
+    on the given connection so it joins the caller's transaction.
+    """
+    people = list(people)
+    if not people:
+        return
+    table = SearchToken.__table__
+    connection.execute(delete(table).where(
+        table.c.entity_type == entity_type,
+        table.c.entity_id.in_([entity_id for entity_id, _, _ in people]),
+    ))
+    now = datetime.utcnow()
+    rows = [
+        {"entity_type": entity_type, "entity_id": entity_id, "token": token, "created_at": now, "updated_at": now}
+        for entity_id, first_name, last_name in people
+        for token in tokenize(first_name, last_name)
+    ]
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+def _reindex_target(mapper, connection, target):
+    index_entities(connection, ENTITY_TYPES[mapper.class_], [
+        (mapper.primary_key_from_instance(target)[0], target.first_name, target.last_name)
+    ])
+
+
+def _reindex_changed_names(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.first_name.history.has_changes() or state.attrs.last_name.history.has_changes():
+        _reindex_target(mapper, connection, target)
+
+
+def _drop_target_tokens(mapper, connection, target):
+    table = SearchToken.__table__
+    connection.execute(delete(table).where(
+        table.c.entity_type == ENTITY_TYPES[mapper.class_],
+        table.c.entity_id == mapper.primary_key_from_instance(target)[0],
+    ))
+
+
+# keep the token table in the same transaction as every ORM write of a name
+for _model in SEARCHABLE.values():
+    event.listen(_model, "after_insert", _reindex_target)
+    event.listen(_model, "after_update", _reindex_changed_names)
+    event.listen(_model, "after_delete", _drop_target_tokens)
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_matches(entity_type, text):
+    """
+    Subquery of (entity_id, score) for the entities whose name tokens start with
+    every term of text. Exact token matches weigh more than prefix matches.
+    Returns None when text has no searchable term.
+    """
+    terms = sorted(tokenize(text))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+
+    parts = [
+        select(
+            SearchToken.entity_id.label("entity_id"),
+            literal(position).label("term"),
+            case((SearchToken.token == term, 2), else_=1).label("weight"),
+        ).where(
+            SearchToken.entity_type == entity_type,
+            SearchToken.token.like(_escape_like(term) + "%", escape="\\"),
+        )
+        for position, term in enumerate(terms)
+    ]
+    hits = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+
+    return (
+        select(hits.c.entity_id, func.sum(hits.c.weight).label("score"))
+        .group_by(hits.c.entity_id)
+        .having(func.count(func.distinct(hits.c.term)) == len(terms))
+        .subquery()
+    )
+
+
+search_cli = AppGroup("search", help="Maintain the name search index.")
+
+
+@search_cli.command("reindex")
+@click.option("--batch-size", default=1000, show_default=True)
+def reindex(batch_size):
+    """Rebuild search_tokens from the students, teachers and staffs tables."""
+    for entity_type, model in SEARCHABLE.items():
+        id_column = _id_column(model)
+        db.session.execute(delete(SearchToken).where(SearchToken.entity_type == entity_type))
+        db.session.commit()
+
+        last_id, indexed = 0, 0
+        while True:
+            people = db.session.execute(
+                select(id_column, model.first_name, model.last_name)
+                .where(id_column > last_id)
+                .order_by(id_column)
+                .limit(batch_size)
+            ).all()
+            if not people:
+                break
+            index_entities(db.session.connection(), entity_type, people)
+            db.session.commit()
+            last_id, indexed = people[-1][0], indexed + len(people)
+        click.echo(f"{entity_type}: {indexed} indexed")
@@ -0,0 +1,58 @@
+from sqlalchemy import inspect
+
+
+def relation_target(model, relation):
+    return inspect(model).relationships[relation].mapper.class_
+
+
+def parse_expand(model, value):
+    """
+    Parse "student.user.role,student.section" into {"student": {"user": {"role": {}}, "section": {}}}
+    and check every relation against the models' __expandable__.
+    """
+    tree = {}
+    for path in value.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node, current_model = tree, model
+        for relation in path.split("."):
+            if relation not in current_model.__expandable__:
+                return None, {"error": f"Invalid expand: {path}"}
+            current_model = relation_target(current_model, relation)
+            node = node.setdefault(relation, {})
+    return tree, None
+
+
+def parse_sparse_fieldset(model, args):
+    """
+    Read the fields= and expand= query parameters of a list endpoint.
+    Returns (fields, expand, error); expand is None when the client asked for
+    neither, which keeps the full nested to_dict() output.
+    """
+    fields_param = args.get("fields", type=str)
+    expand_param = args.get("expand", type=str)
+
+    if fields_param is None and expand_param is None:
+        return None, None, None
+
+    expand, error = parse_expand(model, expand_param or "")
+    if error:
+        return None, None, error
+
+    fields = None
+    if fields_param:
+        fields = [field.strip() for field in fields_param.split(",") if field.strip()]
+        # a relation listed in fields is expanded one level
+        for field in fields:
+            if field in model.__expandable__:
+                expand.setdefault(field, {})
+
+    return fields, expand, None
+
+
+def serialize(obj, fields=None, expand=None):
+    data = obj.to_dict(expand)
+    if fields:
+        data = {key: value for key, value in data.items() if key in fields}
+    return data
@@ -0,0 +1,186 @@
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+
+from flask import current_app
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db, User, Student
+from resources.validations import validate_email_format, validate_password_length
+from resources.hashing import hash_passwords
+from resources.search import index_entities
+from resources.counters import adjust_counters
+from resources.occupancy import adjust_occupancy
+from resources.reference import role_id
+
+STUDENT_IMPORT_FIELDS = [
+    "email", "password",
+    "first_name", "last_name",
+    "birth_date", "nationality", "gender",
+    "disability", "phone_number", "observation",
+    "speciality_id", "section_id",
+    "tutorial_group_id", "lab_group_id",
+]
+ID_FIELDS = ["speciality_id", "section_id", "tutorial_group_id", "lab_group_id"]
+
+
+def read_rows(stream, content_format):
+    """Yield (row number, dict or None, parse error) from a CSV or NDJSON text stream."""
+    if content_format == "csv":
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, row, None
+        return
+
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def _clean_row(row):
+    """Field checks that need no database access; returns (student values, error)."""
+    missing = [field for field in STUDENT_IMPORT_FIELDS if row.get(field) in (None, "")]
+    if missing:
+        return None, f"Missing data: {missing}"
+
+    error = validate_email_format(row["email"]) or validate_password_length(row["password"])
+    if error:
+        return None, error["error"]
+
+    try:
+        birth_date = datetime.strptime(str(row["birth_date"]), "%d/%m/%Y").date()
+    except ValueError:
+        return None, "Invalid date format. Please use %d/%m/%Y"
+
+    try:
+        ids = {field: int(row[field]) for field in ID_FIELDS}
+    except (TypeError, ValueError):
+        return None, f"{', '.join(ID_FIELDS)} must be integers"
+
+    return {
+        "email": str(row["email"]).strip(),
+        "password": str(row["password"]),
+        "first_name": row["first_name"],
+        "last_name": row["last_name"],
+        "birth_date": birth_date,
+        "nationality": row["nationality"],
+        "gender": row["gender"],
+        "disability": _parse_bool(row["disability"]),
+        "phone_number": str(row["phone_number"]),
+        "observation": row["observation"],
+        "status": row.get("status") or "active",
+        **ids,
+    }, None
+
+
+def _insert_chunk(rows, student_role_id):
+    """Insert one validated chunk with executemany statements in a single transaction."""
+    now = datetime.utcnow()
+    passwords = hash_passwords([row["password"] for row in rows])
+
+    db.session.execute(insert(User), [
+        {"email": row["email"], "password_hash": password_hash, "role_id": student_role_id, "created_at": now, "updated_at": now}
+        for row, password_hash in zip(rows, passwords)
+    ])
+    user_ids = dict(db.session.execute(
+        select(User.email, User.user_id).where(User.email.in_([row["email"] for row in rows]))
+    ).all())
+
+    student_columns = [field for field in STUDENT_IMPORT_FIELDS if field not in ("email", "password")] + ["status"]
+    db.session.execute(insert(Student), [
+        {"user_id": user_ids[row["email"]], "created_at": now, "updated_at": now,
+         **{column: row[column] for column in student_columns}}
+        for row in rows
+    ])
+
+    # bulk inserts skip the flush hooks, so keep the name index, counters and occupancy here
+    students = db.session.execute(
+        select(Student.student_id, Student.first_name, Student.last_name)
+        .where(Student.user_id.in_(list(user_ids.values())))
+    ).all()
+    connection = db.session.connection()
+    index_entities(connection, "student", students)
+    adjust_counters(connection, {"total_students": len(students)})
+    adjust_occupancy(
+        connection,
+        Counter(group_id for row in rows for group_id in (row["tutorial_group_id"], row["lab_group_id"])),
+        Counter(row["section_id"] for row in rows),
+    )
+
+    db.session.commit()
+
+
+def import_students(parsed_rows):
+    """
+    Validate and insert students chunk by chunk from read_rows() output.
+    Returns (imported count, [{"row": n, "error": ...}]).
+    """
+    chunk_size = current_app.config.get("BULK_IMPORT_CHUNK_SIZE", 500)
+    role = role_id("Student")
+    if role is None:
+        return 0, [{"row": None, "error": "Student role is missing"}]
+
+    imported, errors, seen_emails = 0, [], set()
+    parsed_rows = iter(parsed_rows)
+    while True:
+        chunk = list(islice(parsed_rows, chunk_size))
+        if not chunk:
+            break
+
+        candidates = []
+        for number, raw, error in chunk:
+            row = None
+            if not error:
+                row, error = _clean_row(raw)
+            if not error and row["email"] in seen_emails:
+                error = "email is duplicated in the import"
+            if error:
+                errors.append({"row": number, "error": error})
+                continue
+            seen_emails.add(row["email"])
+            candidates.append((number, row))
+        if not candidates:
+            continue
+
+        existing_emails = set(db.session.execute(
+            select(User.email).where(User.email.in_([row["email"] for _, row in candidates]))
+        ).scalars())
+        placement_errors = Student.validate_students([row for _, row in candidates], db)
+
+        valid = []
+        for (number, row), placement_error in zip(candidates, placement_errors):
+            error = "email already exists" if row["email"] in existing_emails else (placement_error or {}).get("error")
+            if error:
+                errors.append({"row": number, "error": error})
+            else:
+                valid.append((number, row))
+        if not valid:
+            continue
+
+        try:
+            _insert_chunk([row for _, row in valid], role)
+            imported += len(valid)
+        except SQLAlchemyError:
+            db.session.rollback()
+            current_app.logger.exception("bulk student import chunk failed")
+            errors.extend({"row": number, "error": "Chunk rejected by the database"} for number, _ in valid)
+
+    return imported, errors
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import click
+from sqlalchemy import event, inspect, select, delete, insert, literal, or_, true
+from sqlalchemy.orm import Session
+
+from models import db, Request, Student, SwapGroupRequest, SwapSectionRequest, SwapBoardEntry
+from resources.cache import mark_written
+from resources.swap_matching import swap_cli
+
+BOARD_COLUMNS = [
+    "request_id", "swap_type", "swap_request_id", "student_id", "student_name", "speciality_id",
+    "current_id", "requested_id", "requested_student_id", "status", "urgency", "created_at", "updated_at",
+]
+
+# swap type -> (child model, its id, current placement, requested placement)
+SWAP_TABLES = {
+    "group": (SwapGroupRequest, SwapGroupRequest.swap_group_request_id,
+              SwapGroupRequest.current_group_id, SwapGroupRequest.requested_group_id),
+    "section": (SwapSectionRequest, SwapSectionRequest.swap_section_request_id,
+                SwapSectionRequest.current_section_id, SwapSectionRequest.requested_section_id),
+}
+
+# changes to these attributes are copied to the board
+BOARD_ATTRIBUTES = {
+    Request: ["status", "urgency"],
+    SwapGroupRequest: ["requested_student_id", "current_group_id", "requested_group_id"],
+    SwapSectionRequest: ["requested_student_id", "current_section_id", "requested_section_id"],
+    Student: ["first_name", "last_name", "speciality_id"],
+}
+
+
+def _board_rows(where, now):
+    """SELECTs of the board rows of the swaps matching where(child model)."""
+    return [
+        select(
+            Request.request_id, literal(swap_type), swap_id, Request.student_id,
+            Student.first_name + " " + Student.last_name, Student.speciality_id,
+            current, requested, model.requested_student_id,
+            Request.status, Request.urgency, Request.created_at, literal(now),
+        )
+        .join(Request, Request.request_id == model.request_id)
+        .join(Student, Student.student_id == Request.student_id)
+        .where(where(model))
+        for swap_type, (model, swap_id, current, requested) in SWAP_TABLES.items()
+    ]
+
+
+def refresh_swap_board(connection, request_ids=(), student_ids=()):
+    """Rewrite the board rows of the given swap requests and students' swaps on the caller's connection."""
+    request_ids, student_ids = list(request_ids), list(student_ids)
+    if not request_ids and not student_ids:
+        return
+    table = SwapBoardEntry.__table__
+    connection.execute(delete(table).where(or_(
+        table.c.request_id.in_(request_ids), table.c.student_id.in_(student_ids)
+    )))
+    for rows in _board_rows(
+        lambda model: or_(model.request_id.in_(request_ids), model.current_student_id.in_(student_ids)),
+        datetime.utcnow(),
+    ):
+        connection.execute(insert(table).from_select(BOARD_COLUMNS, rows))
+
+
+def _changed(obj, attributes):
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_swap_board(session, flush_context):
+    request_ids, student_ids = set(), set()
+    for obj in session.new:
+        if isinstance(obj, (SwapGroupRequest, SwapSectionRequest)):
+            request_ids.add(obj.request_id)
+    for obj in session.deleted:
+        if isinstance(obj, (Request, SwapGroupRequest, SwapSectionRequest)):
+            request_ids.add(obj.request_id)
+    for obj in session.dirty:
+        attributes = BOARD_ATTRIBUTES.get(type(obj))
+        if attributes is None or not _changed(obj, attributes):
+            continue
+        if isinstance(obj, Student):
+            student_ids.add(obj.student_id)
+        elif not isinstance(obj, Request) or obj.request_type == "swap":
+            request_ids.add(obj.request_id)
+
+    if request_ids or student_ids:
+        refresh_swap_board(session.connection(), request_ids, student_ids)
+        mark_written(session, SwapBoardEntry.__tablename__)
+
+
+def rebuild_swap_board():
+    """Recompute the board from the swap tables."""
+    db.session.execute(delete(SwapBoardEntry))
+    for rows in _board_rows(lambda model: true(), datetime.utcnow()):
+        db.session.execute(insert(SwapBoardEntry).from_select(BOARD_COLUMNS, rows))
+    db.session.commit()
+
+
+@swap_cli.command("rebuild-board")
+def rebuild_swap_board_command():
+    """Recompute the swap board from the swap requests."""
+    rebuild_swap_board()
+    click.echo("swap board rebuilt")
@@ -0,0 +1,193 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+from models import db, Request, Student, Group, SwapGroupRequest, SwapSectionRequest
+from resources.notifications import notify, send_notifications
+from resources.reference import reference_row
+
+PENDING, APPROVED = "pending", "approved"
+
+# Open swaps form a graph whose nodes are placements (a group or a section) and
+# whose edges go from where a student is to where they want to be. A swap is
+# executed when its edge closes a cycle: every student in the cycle takes the
+# placement of the next one, so no group or section gains or loses a student.
+# Finding the cycle is a breadth-first search over the (current, requested)
+# index, one query per step, starting from the swap that was just posted.
+
+SWAP_KINDS = {
+    "group": (SwapGroupRequest, SwapGroupRequest.swap_group_request_id,
+              SwapGroupRequest.current_group_id, SwapGroupRequest.requested_group_id),
+    "section": (SwapSectionRequest, SwapSectionRequest.swap_section_request_id,
+                SwapSectionRequest.current_section_id, SwapSectionRequest.requested_section_id),
+}
+
+GROUP_COLUMNS = {"tutorial": "tutorial_group_id", "lab": "lab_group_id"}
+# a student changing section takes the partner's groups with it
+SECTION_COLUMNS = ["section_id", "tutorial_group_id", "lab_group_id"]
+
+
+def swap_columns(kind, requested_id):
+    """
+    The student fields a swap towards requested_id exchanges: the one group
+    column of that group's type, or the whole placement for a section.
+    None when the group is unknown.
+    """
+    if kind == "section":
+        return SECTION_COLUMNS
+    group = reference_row(Group, requested_id) if requested_id is not None else None
+    if group is None or group["group_type"] not in GROUP_COLUMNS:
+        return None
+    return [GROUP_COLUMNS[group["group_type"]]]
+
+
+def _open_swaps(kind, current_ids=None, swap_ids=None):
+    """Open swaps leaving any of current_ids (or with the given ids), most urgent then oldest first."""
+    model, swap_id, current, requested = SWAP_KINDS[kind]
+    query = (
+        select(
+            swap_id.label("swap_id"), model.request_id, model.current_student_id.label("student_id"),
+            current.label("current_id"), requested.label("requested_id"),
+        )
+        .join(Request, Request.request_id == model.request_id)
+        .where(
+            requested.isnot(None),
+            model.requested_student_id.is_(None),
+            Request.status == PENDING,
+        )
+        .order_by(Request.urgency.desc(), Request.created_at, Request.request_id)
+    )
+    if current_ids is not None:
+        query = query.where(current.in_(current_ids))
+    if swap_ids is not None:
+        query = query.where(swap_id.in_(swap_ids))
+    return db.session.execute(query).all()
+
+
+def find_cycle(kind, swap, max_length=None):
+    """
+    Shortest cycle of open swaps through swap (a row of _open_swaps), as the
+    list of swaps in order starting with it, each wanting the placement of the
+    next one; None when there is none of at most max_length swaps.
+    A direct exchange is a cycle of two.
+    """
+    if max_length is None:
+        max_length = current_app.config.get("SWAP_MAX_CYCLE_LENGTH", 4)
+    start, goal = swap.requested_id, swap.current_id
+    reached_by = {start: None}  # placement -> (swap leading to it, placement it left)
+    frontier = [start]
+
+    for _ in range(max_length - 1):
+        if not frontier:
+            break
+        next_frontier = []
+        for candidate in _open_swaps(kind, current_ids=frontier):
+            if candidate.student_id == swap.student_id:
+                continue
+            if candidate.requested_id == goal:
+                chain, placement = [candidate], candidate.current_id
+                while reached_by[placement] is not None:
+                    previous, placement = reached_by[placement]
+                    chain.append(previous)
+                return [swap] + chain[::-1]
+            if candidate.requested_id not in reached_by:
+                reached_by[candidate.requested_id] = (candidate, candidate.current_id)
+                next_frontier.append(candidate.requested_id)
+        frontier = next_frontier
+    return None
+
+
+def execute_cycle(kind, cycle):
+    """
+    Move every student of the cycle to the placement of the next one and
+    approve their swaps, in the caller's transaction. The requests and students
+    are locked in id order first; returns False without writing anything when a
+    swap was taken or a student moved meanwhile.
+    """
+    model = SWAP_KINDS[kind][0]
+    # the placements of a cycle are all groups of one type, or sections
+    columns = swap_columns(kind, cycle[0].requested_id)
+    if columns is None:
+        return False
+    requests = Request.query.filter(
+        Request.request_id.in_([swap.request_id for swap in cycle]), Request.status == PENDING
+    ).order_by(Request.request_id).with_for_update().all()
+    students = {
+        student.student_id: student
+        for student in Student.query.filter(Student.student_id.in_([swap.student_id for swap in cycle]))
+        .order_by(Student.student_id).with_for_update()
+    }
+    if len(requests) != len(cycle) or any(
+        swap.student_id not in students or getattr(students[swap.student_id], columns[0]) != swap.current_id
+        for swap in cycle
+    ):
+        return False
+
+    before = {
+        student_id: {column: getattr(student, column) for column in columns}
+        for student_id, student in students.items()
+    }
+    swaps = {row.request_id: row for row in model.query.filter(model.request_id.in_([swap.request_id for swap in cycle]))}
+    for position, swap in enumerate(cycle):
+        partner = cycle[(position + 1) % len(cycle)]
+        for column in columns:
+            setattr(students[swap.student_id], column, before[partner.student_id][column])
+        swaps[swap.request_id].requested_student_id = partner.student_id
+    for base_request in requests:
+        base_request.status = APPROVED
+
+    send_notifications([
+        {
+            "user_id": students[swap.student_id].user_id,
+            "title": "Swap Request Accepted",
+            "message": f"Your swap request with ID {swap.swap_id} has been matched and accepted. Your {kind} has been updated.",
+            "notification_type": "success",
+        }
+        for swap in cycle
+    ])
+    notify(
+        "teachers",
+        title="Swap Request Completed",
+        message=f"{len(cycle)} students exchanged their {kind}s through matched swap requests. Please review the updated group assignments.",
+        notification_type="info",
+        group_ids=list({
+            group_id for placement in before.values()
+            for column, group_id in placement.items() if column != "section_id"
+        }),
+        section_ids=list({student.section_id for student in students.values()}),
+    )
+    return True
+
+
+def match_swap(kind, swap_id):
+    """
+    Look for a cycle closed by the open swap swap_id and execute it in the
+    caller's transaction. Returns the request ids of the matched swaps, or None.
+    """
+    rows = _open_swaps(kind, swap_ids=[swap_id])
+    if not rows:
+        return None
+    cycle = find_cycle(kind, rows[0])
+    if cycle is None or not execute_cycle(kind, cycle):
+        return None
+    return [swap.request_id for swap in cycle]
+
+
+swap_cli = AppGroup("swaps", help="Swap request maintenance.")
+
+
+@swap_cli.command("match")
+@click.option("--type", "kinds", type=click.Choice(list(SWAP_KINDS)), multiple=True, help="Swap types to match (default: all).")
+def match_swaps_command(kinds):
+    """Match the open swaps posted before automatic matching, oldest first."""
+    matched = 0
+    for kind in kinds or SWAP_KINDS:
+        for swap in _open_swaps(kind):
+            request_ids = match_swap(kind, swap.swap_id)
+            if request_ids:
+                matched += len(request_ids)
+                db.session.commit()
+            else:
+                db.session.rollback()
+    click.echo(f"{matched} swap requests matched")
@@ -0,0 +1,116 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event, inspect, select, delete, insert, func, literal
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from sqlalchemy.orm import Session
+
+from models import db, Notification, NotificationUnreadCount
+
+# One row per user holding how many of their notifications are unread, so the
+# badge is a primary-key read instead of a COUNT over notifications.
+# ORM writes are tracked by the flush hook below; bulk statements (fan-out,
+# bulk mark-read/delete) adjust the counters themselves in the same transaction.
+
+_UPSERTS = {
+    "mysql": mysql.insert,
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def _upsert(connection, table, now):
+    upsert = _UPSERTS[connection.dialect.name](table)
+    if connection.dialect.name == "mysql":
+        return upsert, lambda stmt: stmt.on_duplicate_key_update(
+            unread=table.c.unread + stmt.inserted.unread, updated_at=now
+        )
+    return upsert, lambda stmt: stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"unread": table.c.unread + stmt.excluded.unread, "updated_at": now},
+    )
+
+
+def adjust_unread(connection, deltas):
+    """Apply {user_id: delta} on the caller's connection with one upsert."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = NotificationUnreadCount.__table__
+    now = datetime.utcnow()
+    upsert, on_conflict = _upsert(connection, table, now)
+    connection.execute(on_conflict(upsert.values([
+        {"user_id": user_id, "unread": delta, "created_at": now, "updated_at": now}
+        for user_id, delta in deltas.items()
+    ])))
+
+
+def adjust_unread_from_select(connection, user_ids, delta=1):
+    """
+    Add delta for every row of user_ids, a SELECT of user_id (repeats count
+    repeatedly). One INSERT ... SELECT on MySQL; elsewhere the ids are read first.
+    """
+    if connection.dialect.name != "mysql":
+        ids = Counter(connection.execute(user_ids).scalars())
+        adjust_unread(connection, {user_id: count * delta for user_id, count in ids.items()})
+        return
+
+    table = NotificationUnreadCount.__table__
+    now = datetime.utcnow()
+    recipients = user_ids.subquery()
+    grouped = (
+        select(recipients.c.user_id, func.count() * delta, literal(now), literal(now))
+        .group_by(recipients.c.user_id)
+    )
+    upsert, on_conflict = _upsert(connection, table, now)
+    connection.execute(on_conflict(
+        upsert.from_select(["user_id", "unread", "created_at", "updated_at"], grouped)
+    ))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_unread_changes(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Notification) and not obj.is_read:
+            deltas[obj.user_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Notification):
+            history = inspect(obj).attrs.is_read.history
+            was_read = history.deleted[0] if history.deleted else obj.is_read
+            if not was_read:
+                deltas[obj.user_id] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Notification):
+            history = inspect(obj).attrs.is_read.history
+            if history.deleted and history.added and bool(history.deleted[0]) != bool(history.added[0]):
+                deltas[obj.user_id] += 1 if not history.added[0] else -1
+    if any(deltas.values()):
+        adjust_unread(session.connection(), deltas)
+
+
+def unread_count(user_id):
+    """The user's counter; counted from notifications when they have no counter row."""
+    unread = db.session.execute(
+        select(NotificationUnreadCount.unread).where(NotificationUnreadCount.user_id == user_id)
+    ).scalar()
+    if unread is None:
+        # an index range read on ix_notifications_user_read_created, empty for most such users
+        unread = db.session.execute(
+            select(func.count()).select_from(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read == False)
+        ).scalar()
+    return unread
+
+
+def rebuild_unread_counts():
+    """Recompute every counter from the notifications table."""
+    now = datetime.utcnow()
+    db.session.execute(delete(NotificationUnreadCount))
+    db.session.execute(insert(NotificationUnreadCount).from_select(
+        ["user_id", "unread", "created_at", "updated_at"],
+        select(Notification.user_id, func.count(), literal(now), literal(now))
+        .where(Notification.is_read == False)
+        .group_by(Notification.user_id),
+    ))
+    db.session.commit()
@@ -9,6 +9,8 @@ from .staff_routes import staff_bp
 from .stats_routes import stats_bp
 from .teacher_routes import teacher_bp
 from .request_routes import request_bp
+from .notification_routes import notification_bp
+from .auth_routes import auth_bp
 
 def register_blueprints(app):
     app.register_blueprint(user_bp, url_prefix='/users')
@@ -21,4 +23,6 @@ def register_blueprints(app):
     app.register_blueprint(stats_bp, url_prefix='/stats')
     app.register_blueprint(teacher_bp, url_prefix='/teachers')
     app.register_blueprint(request_bp, url_prefix="/requests")
+    app.register_blueprint(notification_bp, url_prefix="/notifications")
+    app.register_blueprint(auth_bp, url_prefix="/auth")
 
@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify, request
+from models import db, User
+from resources.auth import generate_token
+
+auth_bp = Blueprint('auth_bp', __name__)
+
+
+@auth_bp.route('/login', methods=["POST"])
+def login():
+    """
+    REQUEST FORM:
+    {
+        "email": "student@example.com",
+        "password": "secret"
+    }
+    """
+    data = request.get_json(silent=True)
+
+    if not data or not data.get("email") or not data.get("password"):
+        return jsonify({"error": "Email and password are required"}), 400
+
+    user = User.query.filter_by(email=data["email"]).first()
+    if not user or not user.verify_password(data["password"]):
+        return jsonify({"error": "Invalid email or password"}), 401
+
+    # verify_password() rehashed the password if BCRYPT_ROUNDS changed since it was set
+    if db.session.is_modified(user):
+        db.session.commit()
+
+    user_info = {
+        "user_id": user.user_id,
+        "email": user.email,
+        "role": user.role.to_dict() if user.role else None
+    }
+    if user.students:
+        user_info["student"] = user.students[0].to_dict()
+    if user.teachers:
+        user_info["teacher"] = user.teachers[0].to_dict()
+
+    return jsonify({
+        "success": True,
+        "token": generate_token(user.user_id, user.role_id),
+        "user": user_info
+    }), 200
@@ -1,18 +1,22 @@
 from flask import Blueprint, jsonify, request
 from models import db, TeacherGroup, Group, Section
 from resources.validations import *
+from resources.loading import group_plan, plan_for
+from resources.serialization import parse_sparse_fieldset, serialize
+from resources.pagination import paginate
+from resources.occupancy import group_occupancy
 
 group_bp = Blueprint('group_bp', __name__)
 
 
 @group_bp.route('/<int:group_id>', methods=["GET"])
 def get_group(group_id):
-    group = Group.query.get(group_id)
+    group = Group.query.options(*group_plan()).get(group_id)
     
     if not group:
         return jsonify({"error": "Group not found"}), 404
     
-    teacher_id = db.session.query(TeacherGroup.teacher_id).filter(TeacherGroup.group_id == group_id).first()
+    teacher_id = db.session.query(TeacherGroup.teacher_id).filter(TeacherGroup.group_id == group_id).scalar()
 
     return jsonify({
             "success": True,
@@ -75,19 +79,35 @@ def delete_group(group_id):
         "message": "Group deleted successfully"
         }), 200
 
+@group_bp.route('/occupancy', methods=["GET"])
+def get_group_occupancy():
+    section_id = request.args.get("section_id", type=int)
+    group_type = request.args.get("type", type=str)
+
+    return jsonify({
+        "success": True,
+        "data": group_occupancy(section_id, group_type)
+    }), 200
+
+
 @group_bp.route('/', methods=["GET"])
 def get_groups():
     # Filters
     search_data = request.args.get("search_data", type=str)
     page = request.args.get("page", default=1, type=int)
     page_size = request.args.get("page_size", default=10, type=int)
+    exact_total = request.args.get("exact_total", default="true", type=str).lower() != "false"
     teacher_id = request.args.get("teacher_id", type=int)
     section_id = request.args.get("section_id", type=int)
     specialization_id = request.args.get("specialization_id", type=int)
     group_type = request.args.get("type", type=str)
     capacity = request.args.get("capacity", type=int)
 
-    groups = Group.query
+    fields, expand, error = parse_sparse_fieldset(Group, request.args)
+    if error:
+        return jsonify(error), 400
+
+    groups = Group.query.options(*plan_for(Group, expand))
 
     if search_data:
         groups = groups.filter(Group.name.ilike(f"%{search_data}%"))
@@ -102,17 +122,12 @@ def get_groups():
     if capacity is not None:
         groups = groups.filter(Group.capacity <= capacity)
         
-    groups = groups.paginate(page=page, per_page=page_size)
+    items, pagination = paginate(groups, page, page_size, ["groups", "sections"], exact_total)
 
     return jsonify({
         "success": True,
-        "data": [group.to_dict() for group in groups.items], 
-        "pagination": {
-            "totalItems": groups.total,
-            "currentPage": groups.page,
-            "pageSize": groups.per_page,
-            "totalPages": groups.pages,
-        }
+        "data": [serialize(group, fields, expand) for group in items],
+        "pagination": pagination
     })
 
 @group_bp.route('/', methods=["POST"])
@@ -1,6 +1,14 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from models import db, Notification
 from resources.validations import *
+from resources.loading import plan_for
+from resources.serialization import parse_sparse_fieldset, serialize
+from resources.pagination import keyset_paginate, paginate
+from resources.notification_stream import stream_notifications
+from resources.unread_counts import unread_count, adjust_unread
+from datetime import datetime
+
+from sqlalchemy import update, delete
 
 notification_bp = Blueprint('notification_bp', __name__)
 
@@ -11,13 +19,19 @@ def get_notifications():
     user_id = request.args.get("user_id", type=int)
     page = request.args.get("page", default=1, type=int)
     page_size = request.args.get("page_size", default=10, type=int)
+    cursor = request.args.get("cursor", type=str)
+    with_count = request.args.get("with_count", default="false", type=str).lower() == "true"
     notif_type = request.args.get("type", type=str)
     read = request.args.get("read", type=str)
 
     if not user_id:
         return jsonify({"error": "user_id is required"}), 400
 
-    notifications = Notification.query.filter_by(user_id=user_id)
+    fields, expand, error = parse_sparse_fieldset(Notification, request.args)
+    if error:
+        return jsonify(error), 400
+
+    notifications = Notification.query.options(*plan_for(Notification, expand)).filter_by(user_id=user_id)
 
     if notif_type:
         if notif_type not in VALID_NOTIFICATION_TYPES:
@@ -27,20 +41,62 @@ def get_notifications():
         read = read.lower() == "true"
         notifications = notifications.filter_by(is_read=read)
 
-    notifications = notifications.order_by(Notification.created_at.desc()).paginate(page=page, per_page=page_size)
+    if cursor is not None:
+        items, pagination, error = keyset_paginate(notifications, Notification.created_at, Notification.notification_id, cursor, page_size, with_count)
+        if error:
+            return jsonify(error), 400
+    else:
+        notifications = notifications.order_by(Notification.created_at.desc())
+        items, pagination = paginate(notifications, page, page_size, ["notifications"])
 
     return jsonify({
         "success": True,
-        "data": [notif.to_dict() for notif in notifications.items],
-        "pagination": {
-            "totalItems": notifications.total,
-            "currentPage": notifications.page,
-            "pageSize": notifications.per_page,
-            "totalPages": notifications.pages,
-        }
+        "data": [serialize(notif, fields, expand) for notif in items],
+        "pagination": pagination
     }), 200
 
 
+@notification_bp.route('/unread_count', methods=["GET"])
+def get_unread_count():
+    user_id = request.args.get("user_id", type=int)
+
+    if not user_id:
+        return jsonify({"error": "user_id is required"}), 400
+
+    count = unread_count(user_id)
+
+    response = jsonify({
+        "success": True,
+        "user_id": user_id,
+        "unread_count": count
+    })
+    # clients revalidate every time; an unchanged count answers 304 without a body
+    response.set_etag(f"{user_id}-{count}")
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+@notification_bp.route('/stream', methods=["GET"])
+def stream_user_notifications():
+    user_id = request.args.get("user_id", type=int)
+    # EventSource sends Last-Event-ID when it reconnects
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+
+    if not user_id:
+        return jsonify({"error": "user_id is required"}), 400
+    if last_id is not None:
+        error = validate_positive_integer(last_id, "Last-Event-ID")
+        if error:
+            return jsonify(error), 400
+        last_id = int(last_id)
+
+    return Response(
+        stream_with_context(stream_notifications(user_id, last_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @notification_bp.route('/read', methods=["PATCH"])
 def mark_notification_as_read():
     notification_id = request.args.get("notification_id", type=int)
@@ -82,43 +138,93 @@ def delete_notification():
     }), 200
 
 
-@notification_bp.route('/readall', methods=["PATCH"])
-def mark_all_notifications_as_read():
-    user_id = request.args.get("user_id", type=int)
-    page = request.args.get("page", type=int)
-    page_size = request.args.get("page_size", type=int)
+def bulk_conditions(args):
+    """
+    WHERE clause of the bulk endpoints: the user's notifications, optionally
+    narrowed by type, before_id, before (ISO timestamp) and ids (comma separated).
+    Returns (conditions, error).
+    """
+    user_id = args.get("user_id", type=int)
+    notif_type = args.get("type", type=str)
+    before_id = args.get("before_id", type=str)
+    before = args.get("before", type=str)
+    ids = args.get("ids", type=str)
+
+    if not user_id:
+        return None, {"error": "user_id is required"}
 
-    if not user_id or not page or not page_size:
-        return jsonify({"error": "user_id, page, and page_size are required"}), 400
+    conditions = [Notification.user_id == user_id]
+    if notif_type:
+        if notif_type not in VALID_NOTIFICATION_TYPES:
+            return None, {"error": f"Invalid notification type. Valid types are: {', '.join(VALID_NOTIFICATION_TYPES)}"}
+        conditions.append(Notification.notification_type == notif_type)
+    if before_id:
+        error = validate_positive_integer(before_id, "before_id")
+        if error:
+            return None, error
+        conditions.append(Notification.notification_id < int(before_id))
+    if before:
+        try:
+            conditions.append(Notification.created_at < datetime.fromisoformat(before))
+        except ValueError:
+            return None, {"error": "before must be an ISO 8601 timestamp"}
+    if ids:
+        id_list = [value.strip() for value in ids.split(",") if value.strip()]
+        for value in id_list:
+            error = validate_positive_integer(value, "ids")
+            if error:
+                return None, error
+        conditions.append(Notification.notification_id.in_([int(value) for value in id_list]))
+    return (user_id, conditions), None
 
-    notifications = Notification.query.filter_by(user_id=user_id).order_by(Notification.created_at.desc()).paginate(page=page, per_page=page_size)
 
-    for notification in notifications.items:
-        notification.is_read = True
+@notification_bp.route('/readall', methods=["PATCH"])
+def mark_all_notifications_as_read():
+    scope, error = bulk_conditions(request.args)
+    if error:
+        return jsonify(error), 400
+    user_id, conditions = scope
+
+    # one UPDATE; rows already read are left alone so the count is exact
+    updated = db.session.execute(
+        update(Notification)
+        .where(*conditions, Notification.is_read == False)
+        .values(is_read=True, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    adjust_unread(db.session.connection(), {user_id: -updated})
     db.session.commit()
 
     return jsonify({
         "success": True,
-        "message": "All notifications on the current page marked as read"
+        "message": "Notifications marked as read",
+        "updated": updated
     }), 200
 
 
 @notification_bp.route('/readall', methods=["DELETE"])
 def delete_all_notifications():
-    user_id = request.args.get("user_id", type=int)
-    page = request.args.get("page", type=int)
-    page_size = request.args.get("page_size", type=int)
-
-    if not user_id or not page or not page_size:
-        return jsonify({"error": "user_id, page, and page_size are required"}), 400
-
-    notifications = Notification.query.filter_by(user_id=user_id).order_by(Notification.created_at.desc()).paginate(page=page, per_page=page_size)
-
-    for notification in notifications.items:
-        db.session.delete(notification)
+    scope, error = bulk_conditions(request.args)
+    if error:
+        return jsonify(error), 400
+    user_id, conditions = scope
+
+    # unread and read rows are deleted apart so the unread counter moves by an exact amount
+    deleted_unread = db.session.execute(
+        delete(Notification)
+        .where(*conditions, Notification.is_read == False)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    deleted_read = db.session.execute(
+        delete(Notification)
+        .where(*conditions, Notification.is_read == True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    adjust_unread(db.session.connection(), {user_id: -deleted_unread})
     db.session.commit()
 
     return jsonify({
         "success": True,
-        "message": "All notifications deleted successfully"
-    }), 200
\ No newline at end of file
+        "message": "Notifications deleted successfully",
+        "deleted": deleted_unread + deleted_read
+    }), 200
@@ -2,13 +2,28 @@ from flask import Blueprint, jsonify, request
 from models import (
     db,
     ChangeGroupRequest, ChangeSectionRequest, SwapGroupRequest, SwapSectionRequest, 
-    Student, Group, Section, Request, Staff,
-    Notification
+    Student, Group, Section, Request,
+    Notification, SwapBoardEntry, Staff, RequestEvent
 )
 from resources.validations import *
+from resources.serialization import parse_sparse_fieldset, serialize
+from resources.pagination import keyset_paginate, paginate
+from resources.search import search_matches
+from resources.notifications import notify
+from resources.reference import reference_row
+from resources.occupancy import reserve_seats
+from resources.batch_review import batch_review
+from resources.review_queue import claim_next
+from resources.swap_matching import match_swap, swap_columns
+import resources.swap_board  # keeps the swap board in sync with the swaps
+import resources.request_events  # records the request history
+from resources.loading import (
+    plan_for, request_plan, student_plan, change_group_request_plan, change_section_request_plan,
+    swap_group_request_plan, swap_section_request_plan
+)
 from datetime import datetime
 
-from sqlalchemy import in_
+from sqlalchemy import false
 
 from enum import Enum
 
@@ -18,11 +33,12 @@ class request_type(Enum):
     SWAP = "swap"
 
 class request_status(Enum):
-    PENDING: "pending"
-    APPROVED: "approved"
-    REJECTED: "rejected"
-    APPEALED: "appealed"
-    ALL: "all"
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+    APPEALED = "appealed"
+    CANCELED = "canceled"
+    ALL = "all"
 
 class request_urgency(Enum):
     LOW = 1
@@ -38,26 +54,26 @@ class notification_type(Enum):
 
 request_bp = Blueprint('request_bp', __name__)
 
-def validate_request_type(request_type):
+def validate_request_type(value):
     try:
-        request_type(request_type)
+        request_type(value)
         return None
     except ValueError:
         return {"error": "Invalid request type"}
 
-def validate_request_status(request_status):
+def validate_request_status(value):
     try:
-        request_status(request_status)
+        request_status(value)
         return None
     except ValueError:
         return {"error": "Invalid request status"}
 
-def validate_request_urgency(request_urgency):
+def validate_request_urgency(value):
     try:
-        int_request_urgency = int(request_urgency)
+        int_request_urgency = int(value)
         request_urgency(int_request_urgency)
         return None
-    except ValueError:
+    except (ValueError, TypeError):
         return {"error": "Invalid Urgency"}
         
 @request_bp.route('/', methods=["GET"])
@@ -66,6 +82,9 @@ def get_requests():
     search_data = request.args.get("search_data", type=str)
     page = request.args.get("page", default=1, type=int)
     page_size = request.args.get("page_size", default=10, type=int)
+    cursor = request.args.get("cursor", type=str)
+    with_count = request.args.get("with_count", default="false", type=str).lower() == "true"
+    exact_total = request.args.get("exact_total", default="true", type=str).lower() != "false"
     student_id = request.args.get("student_id", type=int)
     status = request.args.get("status", type=str)
     request_type = request.args.get("type", type=str)
@@ -73,7 +92,11 @@ def get_requests():
     start_date = request.args.get("start_date", type=str)
     end_date = request.args.get("end_date", type=str)
     
-    requests = db.session.query(Request, Student).join(Student, Request.student_id == Student.student_id)
+    fields, expand, error = parse_sparse_fieldset(Request, request.args)
+    if error:
+        return jsonify(error), 400
+    
+    requests = Request.query.join(Student, Request.student_id == Student.student_id).options(*plan_for(Request, expand))
     
     
     if search_data:
@@ -81,7 +104,11 @@ def get_requests():
             search_id = int(search_data)
             requests = requests.filter(Request.request_id == search_id)
         except ValueError:
-            requests = requests.filter(Student.last_name.ilike(f"%{search_data}%"))
+            matches = search_matches("student", search_data)
+            if matches is None:
+                requests = requests.filter(false())
+            else:
+                requests = requests.join(matches, matches.c.entity_id == Request.student_id).order_by(matches.c.score.desc())
             
     if student_id:
         error = validate_positive_integer(student_id, "student_id")
@@ -112,23 +139,54 @@ def get_requests():
         requests = requests.filter(Request.created_at <= end_date)
         
     
-    # order result
-    requests = requests.order_by(desc(Request.created_at))
-    
-    # Pagination
-    requests = requests.paginate(page=page, per_page=page_size)
+    if cursor is not None:
+        # keyset mode: seek from (created_at, request_id), no OFFSET and no COUNT unless asked
+        items, pagination, error = keyset_paginate(requests, Request.created_at, Request.request_id, cursor, page_size, with_count)
+        if error:
+            return jsonify(error), 400
+    else:
+        # order result
+        requests = requests.order_by(Request.created_at.desc())
+        
+        # Pagination
+        items, pagination = paginate(requests, page, page_size, ["requests", "students"], exact_total)
     
     return jsonify({
         "success": True,
-        "data": [request.to_dict() for request in requests],
-        "pagination": {
-            "totalItems": requests.total,
-            "currentPage": requests.page,
-            "pageSize": requests.per_page,
-            "totalPages": requests.pages,
-        }
+        "data": [serialize(current_request, fields, expand) for current_request in items],
+        "pagination": pagination
     }), 200
 
+@request_bp.route('/queue/next', methods=["GET"])
+def claim_next_request():
+    staff_id = request.args.get("staff_id", type=int)
+    queue_type = request.args.get("type", type=str)
+    
+    error = validate_positive_integer(staff_id, "staff_id")
+    if error:
+        return jsonify(error), 400
+    if queue_type and queue_type not in (request_type.GROUP.value, request_type.SECTION.value):
+        return jsonify({"error": "type must be group or section"}), 400
+    if not Staff.query.get(staff_id):
+        return jsonify({"error": "Invalid staff ID"}), 404
+    
+    # the claimed request is hidden from the other staff until the lease expires
+    # or the request is reviewed
+    entry = claim_next(staff_id, [queue_type] if queue_type else None)
+    if entry is None:
+        db.session.commit()
+        return jsonify({"success": True, "request": None}), 200
+    
+    current_request = Request.query.options(*request_plan()).get(entry.request_id)
+    db.session.flush()
+    response = {
+        "success": True,
+        "request": current_request.to_dict({"student": {}}),
+        "lease_expires_at": entry.lease_expires_at.isoformat()
+    }
+    db.session.commit()
+    return jsonify(response), 200
+
 @request_bp.route('/<int:request_id>', methods=["GET"])
 def get_request(request_id):
     
@@ -137,31 +195,63 @@ def get_request(request_id):
         if swap_type not in ["group", "section"]:
             return jsonify({"error": "Invalid request type"}), 404
     
-    request = Request.query.get(request_id)
-    if not request:
+    current_request = Request.query.options(*request_plan()).get(request_id)
+    if not current_request:
         return jsonify({"error": "Request not found"}), 404
     
     # validate if request type exist
-    error = validate_request_type(request.request_type)
+    error = validate_request_type(current_request.request_type)
     if error:
         return jsonify(error), 400
     
-    
-    if request.request_type == request_type.GROUP.value:
-        request = request.join(ChangeGroupRequest, ChangeGroupRequest.request_id == Request.request_id).first()
-    elif request.request_type == request_type.SECTION.value:
-        request = request.join(ChangeSectionRequest, ChangeSectionRequest.request_id == Request.request_id).first()
-    elif request.request_type == request_type.SWAP.value:
+    # the child row embeds the parent request, so load it with the full plan in one query
+    details = None
+    if current_request.request_type == request_type.GROUP.value:
+        details = ChangeGroupRequest.query.options(*change_group_request_plan()).filter_by(request_id=request_id).first()
+    elif current_request.request_type == request_type.SECTION.value:
+        details = ChangeSectionRequest.query.options(*change_section_request_plan()).filter_by(request_id=request_id).first()
+    elif current_request.request_type == request_type.SWAP.value:
         if swap_type == "group":
-            request = request.join(SwapGroupRequest, SwapGroupRequest.request_id == Request.request_id).first()
+            details = SwapGroupRequest.query.options(*swap_group_request_plan()).filter_by(request_id=request_id).first()
         elif swap_type == "section":
-            request = request.join(SwapSectionRequest, SwapSectionRequest.request_id == Request.request_id).first()
-            
+            details = SwapSectionRequest.query.options(*swap_section_request_plan()).filter_by(request_id=request_id).first()
     
+    return jsonify({
+        "success": True,
+        "data": details.to_dict() if details else current_request.to_dict()
+    }), 200
+
+@request_bp.route('/<int:request_id>/timeline', methods=["GET"])
+def get_request_timeline(request_id):
+    events = RequestEvent.query.filter_by(request_id=request_id).order_by(RequestEvent.event_id).all()
+    if not events:
+        return jsonify({"error": "Request not found"}), 404
     
     return jsonify({
         "success": True,
-        "data": request.to_dict()
+        "data": [event.to_dict() for event in events]
+    }), 200
+
+@request_bp.route('/timeline', methods=["GET"])
+def get_student_timeline():
+    student_id = request.args.get("student_id", type=int)
+    cursor = request.args.get("cursor", type=str)
+    page_size = request.args.get("page_size", default=20, type=int)
+    
+    error = validate_positive_integer(student_id, "student_id")
+    if error:
+        return jsonify(error), 400
+    
+    # newest first, seeked from the cursor on (student_id, created_at, event_id)
+    events = RequestEvent.query.filter(RequestEvent.student_id == student_id)
+    items, pagination, error = keyset_paginate(events, RequestEvent.created_at, RequestEvent.event_id, cursor, page_size)
+    if error:
+        return jsonify(error), 400
+    
+    return jsonify({
+        "success": True,
+        "data": [event.to_dict() for event in items],
+        "pagination": pagination
     }), 200
 
 @request_bp.route('/change', methods=["POST"])
@@ -170,17 +260,14 @@ def create_change_request():
     
     requestType = request.args.get("type")
     
-    if requestType:
-        error = validate_request_type(requestType)
-        if error:
-            return jsonify(error), 400
-        
+    if requestType not in (request_type.GROUP.value, request_type.SECTION.value):
+        return jsonify({"error": "type must be group or section"}), 400
     
     required_fields = ["student_id", "reason", "urgency", "requested_id"]
     error = run_validations([
         (validate_required_fields, [required_fields, data]),
         (validate_positive_integer, [data["student_id"], "student_id"]),
-        (validate_request_urgency, data["urgency"]),
+        (validate_request_urgency, [data["urgency"]]),
         (validate_positive_integer, [data["requested_id"], "requested_id"])
     ])
     if error:
@@ -197,75 +284,52 @@ def create_change_request():
             "error": "You already have an active request of this type. Please wait for it to be processed."
         }), 400
         
-    student = Student.query.get(data["student_id"])
+    student = Student.query.options(*student_plan()).get(data["student_id"])
     if not student:
         return jsonify({"error": "Invalid student"}), 400
     
+    new_request = Request(
+        student_id=student.student_id,
+        status="pending",
+        reason=data["reason"],
+        urgency=data["urgency"],
+        request_type=requestType
+    )
+    
     if requestType == request_type.GROUP.value:
-        
-        requested_group = Group.query.get(data["requested_id"])
+        requested_group = reference_row(Group, int(data["requested_id"]))
         if not requested_group:
             return jsonify({"error": "Invalid group"}), 400
         
-        new_request = Request(
-            student_id=data["student_id"],
-            status="pending",
-            reason=data["reason"],
-            urgency=data["urgency"],
-            request_type=request_type.GROUP.value
-        )
-            
-        db.session.add(new_request)
-        db.session.commit()
-        
-        if requested_group.group_type == "tutorial":
-            new_change_group_request = ChangeGroupRequest(
-                request_id=new_request.request_id,
-                current_group_id=student.tutorial_group_id,
-                requested_group_id=requested_group.group_id
-            )
-        elif requested_group.group_type == "lab":
-            new_change_group_request = ChangeGroupRequest(
-                request_id=new_request.request_id,
-                current_group_id=student.lab_group_id,
-                requested_group_id=requested_group.group_id
-            )
-            
-        db.session.add(new_change_group_request)
-        db.session.commit()
-
+        current_group_id = student.tutorial_group_id if requested_group["group_type"] == "tutorial" else student.lab_group_id
+        db.session.add(ChangeGroupRequest(
+            request=new_request,
+            current_group_id=current_group_id,
+            requested_group_id=requested_group["group_id"]
+        ))
 
     elif requestType == request_type.SECTION.value:
-        requested_section = Section.query.get(data["requested_id"])
-        
+        requested_section = reference_row(Section, int(data["requested_id"]))
         if not requested_section:
             return jsonify({"error": "Invalid Section"}), 400
 
-        
-        new_request = Request(
-            student_id=data["student_id"],
-            status="pending",
-            reason=data["reason"],
-            urgency=data["urgency"],
-            request_type=request_type.SECTION.value
-        )
-        db.session.add(new_request)
-        db.session.commit()
-        
-        new_change_section_request = ChangeSectionRequest(
-            request_id=new_request.request_id,
+        db.session.add(ChangeSectionRequest(
+            request=new_request,
             current_section_id=student.section_id,
-            requested_section_id=requested_section.section_id
-        )
-        db.session.add(new_change_section_request)
-        db.session.commit()
-
-
+            requested_section_id=requested_section["section_id"]
+        ))
+
+    # the request and its child row go in one flush and one commit; the response
+    # is serialized before the commit so nothing is reloaded afterwards
+    db.session.add(new_request)
+    db.session.flush()
+    response = new_request.to_dict()
+    db.session.commit()
 
     return jsonify({
         "success": True,
         "message": "Change request created successfully",
-        "request": new_request.to_dict()
+        "request": response
     }), 201
 
 @request_bp.route('/change/status' , methods = ["PUT"])
@@ -280,99 +344,124 @@ def review_request():
     if error:
         return jsonify(error), 400
     
-    error = validate_request_status(data["status"])
-    if error:
-        return jsonify(error), 400
+    if data["status"] not in (request_status.APPROVED.value, request_status.REJECTED.value):
+        return jsonify({"error": "status must be approved or rejected"}), 400
     
-    request = Request.query.get(data["request_id"])
-    if not request:
+    current_request = Request.query.options(*request_plan()).get(data["request_id"])
+    if not current_request:
         return jsonify({"error":"request id not found"}),400
+    
+    if current_request.status not in (request_status.PENDING.value, request_status.APPEALED.value):
+        return jsonify({"error": "Only pending or appealed requests can be reviewed"}), 409
 
-    if data["status"] == request_status.APPROVED.value:
-        # update request
-        request.status = request_status.APPROVED.value
-        db.session.commit()
-        
-        if request.request_type == request_type.GROUP.value:
-            change_group_request = db.session.query(select(ChangeGroupRequest).filter(ChangeGroupRequest.request_id == request.request_id)).first()
-            
-            student = Student.query.get(request.student_id)
-            requested_group = Group.query.get(change_group_request.requested_group_id)
-            
-            if requested_group.group_type == "tutorial":
-                student.tutorial_group_id = change_group_request.requested_group_id
-            elif requested_group.group_type == "lab":
-                student.lab_group_id = change_group_request.requested_group_id
+    # nothing is modified before the lookups below, so their autoflush has
+    # nothing to write: the request gets one UPDATE with status and comment
+    student = current_request.student
+    titles = {
+        request_type.GROUP.value: "Change Group Request Response",
+        request_type.SECTION.value: "Change Section Request Response",
+    }
 
-            db.session.commit()
-            
-            # create notification for student
-            student_notification = Notification(
-                user_id = student.student_id,
-                title = "Change Group Request Response",
-                message = "request approved, you have been moved!",
-                notification_type = notification_type.SUCCESS.value,
-                is_read = False
-            )
-            db.session.add(student_notification)
-            db.session.commit()
-        elif request.request_type == request_type.SECTION.value:
-            change_section_request = db.session.query(select(ChangeSectionRequest).filter(ChangeSectionRequest.request_id == request.request_id)).first()
-
-            student = Student.query.get(request.student_id)
-            requested_section = Section.query.get(change_section_request.requested_section_id)
-            
-            student.section_id = change_section_request.requested_section_id
-            
-            db.session.commit()
-            
-            # create notification for student
-            student_notification = Notification(
-                user_id = student.student_id,
-                title = "Change Section Request Response",
+    if data["status"] == request_status.APPROVED.value:
+        # the target's occupancy row stays locked until the commit, so two
+        # approvals cannot both take the last seat
+        if current_request.request_type == request_type.GROUP.value:
+            change_group_request = ChangeGroupRequest.query.filter_by(request_id=current_request.request_id).first()
+            requested_group_id = change_group_request.requested_group_id
+            requested_group = reference_row(Group, requested_group_id)
+            column = "tutorial_group_id" if requested_group["group_type"] == "tutorial" else "lab_group_id"
+
+            if getattr(student, column) != requested_group_id:
+                error = reserve_seats(group_seats={requested_group_id: 1})
+                if error:
+                    db.session.rollback()
+                    return jsonify(error), 409
+            setattr(student, column, requested_group_id)
+
+        elif current_request.request_type == request_type.SECTION.value:
+            change_section_request = ChangeSectionRequest.query.filter_by(request_id=current_request.request_id).first()
+            requested_section_id = change_section_request.requested_section_id
+
+            if student.section_id != requested_section_id:
+                error = reserve_seats(section_seats={requested_section_id: 1})
+                if error:
+                    db.session.rollback()
+                    return jsonify(error), 409
+            student.section_id = requested_section_id
+
+        current_request.status = request_status.APPROVED.value
+        current_request.comment = data["comment"]
+
+        if current_request.request_type in titles:
+            db.session.add(Notification(
+                user_id = student.user_id,
+                title = titles[current_request.request_type],
                 message = "request approved, you have been moved!",
                 notification_type = notification_type.SUCCESS.value,
                 is_read = False
-            )
-            db.session.add(student_notification)
-            
-            db.session.commit()
+            ))
             
     elif data["status"] == request_status.REJECTED.value:
-        # update request
-        request.status = request_status.REJECTED.value
-        db.session.commit()
+        current_request.status = request_status.REJECTED.value
+        current_request.comment = data["comment"]
         
-        if request.request_type == request_type.GROUP.value:
-            # create notification for student
-            student = Student.query.get(request.student_id)
-            student_notification = Notification(
-                user_id = student.student_id,
-                title = "Change Group Request Response",
+        if current_request.request_type in titles:
+            db.session.add(Notification(
+                user_id = student.user_id,
+                title = titles[current_request.request_type],
                 message = "request rejected.",
                 notification_type = notification_type.WARNING.value,
                 is_read = False
-            )
-            db.session.add(student_notification)
-            db.session.commit()
-        elif request.request_type == request_type.SECTION.value:
-            # create notification for student
-            student = Student.query.get(request.student_id)
-            student_notification = Notification(
-                user_id = student.student_id,
-                title = "Change Section Request Response",
-                message = "request appealed.",
-                notification_type = notification_type.WARNING.value,
-                is_read = False
-            )
-            db.session.add(student_notification)
-            db.session.commit()
+            ))
+
+    # status, student move and notification are one unit of work
+    db.session.flush()
+    response = current_request.to_dict()
+    db.session.commit()
         
     return {
         "success": True,
-        "data": request.to_dict()
+        "data": response
     }
 
+@request_bp.route('/change/batch-review', methods=["POST"])
+def batch_review_requests():
+    """
+    {
+        "type": "group" | "section" | "all",
+        "limit": max requests to decide,
+        "reject_unplaced": reject the requests left without a seat instead of keeping them pending,
+        "dry_run": report the decisions without applying them
+    }
+    """
+    data = request.get_json(silent=True) or {}
+    
+    scope = data.get("type", "all")
+    limit = data.get("limit")
+    dry_run = bool(data.get("dry_run")) or request.args.get("dry_run", default="false", type=str).lower() == "true"
+    
+    if scope not in ("all", request_type.GROUP.value, request_type.SECTION.value):
+        return jsonify({"error": "type must be group, section or all"}), 400
+    if limit is not None:
+        error = validate_positive_integer(limit, "limit")
+        if error:
+            return jsonify(error), 400
+    
+    request_types = (request_type.GROUP.value, request_type.SECTION.value) if scope == "all" else (scope,)
+    summary, results = batch_review(request_types, int(limit) if limit else None, bool(data.get("reject_unplaced")), dry_run)
+    
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    
+    return jsonify({
+        "success": True,
+        "dry_run": dry_run,
+        "summary": summary,
+        "results": results
+    }), 200
+
 @request_bp.route('/appeal', methods=["POST"])
 def appeal_request():
     data = request.get_json()
@@ -392,32 +481,31 @@ def appeal_request():
     student_id = data["studentId"]
     reason = data["reason"]
 
-    current_request = Request.query.get(request_id)
+    current_request = Request.query.options(*request_plan()).get(request_id)
     if not current_request:
         return jsonify({"error": "Invalid request ID"}), 404
 
-    # Validate the student
-    student = Student.query.get(student_id)
-    if not student:
-        return jsonify({"error": "Invalid student ID"}), 404
+    if current_request.student_id != int(student_id):
+        return jsonify({"error": "This request belongs to another student"}), 403
+
+    # an appeal moves the request up the review queue, so only a rejection can be appealed
+    if current_request.status != request_status.REJECTED.value:
+        return jsonify({"error": "Only rejected requests can be appealed"}), 400
+
+    student = current_request.student
 
     # Update the request status and reason
     current_request.status = request_status.APPEALED.value
     current_request.reason = reason
-    db.session.commit()
 
-    # Generate a notification for administrators
-    staffs = Staff.query.all()
-    for staff in staffs:
-        admin_notification = Notification(
-            user_id=staff.staff_id,  # Assuming admin notifications are broadcasted
-            title="Request Appeal Submitted",
-            message=f"Student {student.first_name} {student.last_name} has appealed request ID {request_id}.",
-            notification_type=notification_type.INFO.value,
-            is_read=False
-        )
-        db.session.add(admin_notification)
-        db.session.commit()
+    # Notify every staff member, committed together with the appeal
+    notify(
+        "staff",
+        title="Request Appeal Submitted",
+        message=f"Student {student.first_name} {student.last_name} has appealed request ID {request_id}.",
+        notification_type=notification_type.INFO.value,
+    )
+    db.session.commit()
 
     return jsonify({
         "success": True,
@@ -443,21 +531,22 @@ def cancel_request():
     request_id = data["requestId"]
     student_id = data["studentId"]
 
-    current_request = Request.query.get(request_id)
+    current_request = Request.query.options(*request_plan()).get(request_id)
     if not current_request:
         return jsonify({"error": "Invalid request ID"}), 404
 
+    if current_request.student_id != int(student_id):
+        return jsonify({"error": "This request belongs to another student"}), 403
+
     # Ensure the request is in 'pending' status
     if current_request.status != request_status.PENDING.value:
         return jsonify({"error": "Only pending requests can be canceled"}), 400
 
-    # Delete the request
-    db.session.delete(current_request)
-    db.session.commit()
+    # Cancel the request, kept with its history; notify in the same commit
+    current_request.status = request_status.CANCELED.value
 
-    # Create a notification for the student
     student_notification = Notification(
-        user_id=student_id,
+        user_id=current_request.student.user_id,
         title="Request Canceled",
         message=f"Your request with ID {request_id} has been canceled successfully.",
         notification_type=notification_type.SUCCESS.value,
@@ -480,6 +569,8 @@ def get_swap_requests():
     student_id = request.args.get("student_id", type=int)
     status = request.args.get("status", type=str)
     urgency = request.args.get("urgency", type=int)
+    swap_type = request.args.get("type", type=str)
+    requested_id = request.args.get("requested_id", type=int)
     start_date = request.args.get("start_date", type=str)
     end_date = request.args.get("end_date", type=str)
     opportunity = request.args.get("opportunity", default="false", type=str).lower() == "true"
@@ -487,106 +578,90 @@ def get_swap_requests():
     if not student_id:
         return jsonify({"error": "student_id is required"}), 400
 
+    # every filter below narrows a range of one of the swap_board indexes
+    if opportunity:
+        # open swaps of other students of the same speciality
+        student = Student.query.get(student_id)
+        if not student:
+            return jsonify({"error": "Invalid student"}), 404
+        swaps = SwapBoardEntry.query.filter(
+            SwapBoardEntry.speciality_id == student.speciality_id,
+            SwapBoardEntry.status == request_status.PENDING.value,
+            SwapBoardEntry.requested_student_id == None,
+            SwapBoardEntry.student_id != student_id
+        )
+    else:
+        swaps = SwapBoardEntry.query.filter(SwapBoardEntry.student_id == student_id)
 
-    swap_group_query = db.session.query(
-        SwapGroupRequest.swap_group_request_id.label("swap_request_id"),
-        Request.request_id,
-        Request.student_id,
-        Student.first_name.label("student_name"),
-        Request.status,
-        Request.urgency,
-        Request.created_at,
-        Request.updated_at,
-        Group.group_name.label("current_group"),
-        None.label("current_section"),  # Placeholder for section
-        Group.group_id.label("current_group_id"),
-        None.label("current_section_id"),  # Placeholder for section
-        None.label("requested_group"),  # Placeholder for requested group
-        None.label("requested_section"),  # Placeholder for requested section
-        SwapGroupRequest.requested_student_id
-    ).join(Request, SwapGroupRequest.request_id == Request.request_id) \
-     .join(Student, Request.student_id == Student.student_id) \
-     .join(Group, SwapGroupRequest.current_group_id == Group.group_id)
-
-    swap_section_query = db.session.query(
-        SwapSectionRequest.swap_section_request_id.label("swap_request_id"),
-        Request.request_id,
-        Request.student_id,
-        Student.first_name.label("student_name"),
-        Request.status,
-        Request.urgency,
-        Request.created_at,
-        Request.updated_at,
-        None.label("current_group"),  # Placeholder for group
-        Section.section_name.label("current_section"),
-        None.label("current_group_id"),  # Placeholder for group
-        Section.section_id.label("current_section_id"),
-        None.label("requested_group"),  # Placeholder for requested group
-        None.label("requested_section"),  # Placeholder for requested section
-        SwapSectionRequest.requested_student_id
-    ).join(Request, SwapSectionRequest.request_id == Request.request_id) \
-     .join(Student, Request.student_id == Student.student_id) \
-     .join(Section, SwapSectionRequest.current_section_id == Section.section_id)
-
-    combined_query = swap_group_query.union_all(swap_section_query)
-
-    # Apply filters
+    if swap_type:
+        if swap_type not in (request_type.GROUP.value, request_type.SECTION.value):
+            return jsonify({"error": "type must be group or section"}), 400
+        swaps = swaps.filter(SwapBoardEntry.swap_type == swap_type)
+    if requested_id:
+        if not swap_type:
+            return jsonify({"error": "type is required with requested_id"}), 400
+        swaps = swaps.filter(SwapBoardEntry.requested_id == requested_id)
     if search_data:
-        combined_query = combined_query.filter(
-            (Student.first_name.ilike(f"%{search_data}%")) |
-            (Student.last_name.ilike(f"%{search_data}%")) |
-            (Request.student_id == search_data)
-        )
-    if status:
-        combined_query = combined_query.filter(Request.status == status)
+        try:
+            swaps = swaps.filter(SwapBoardEntry.student_id == int(search_data))
+        except ValueError:
+            matches = search_matches("student", search_data)
+            if matches is None:
+                swaps = swaps.filter(false())
+            else:
+                swaps = swaps.join(matches, matches.c.entity_id == SwapBoardEntry.student_id).order_by(matches.c.score.desc())
+    if status and not opportunity:
+        error = validate_request_status(status)
+        if error: return jsonify(error), 400
+        swaps = swaps.filter(SwapBoardEntry.status == status)
     if urgency:
-        combined_query = combined_query.filter(Request.urgency == urgency)
+        error = validate_request_urgency(urgency)
+        if error: return jsonify(error), 400
+        swaps = swaps.filter(SwapBoardEntry.urgency == urgency)
     if start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        combined_query = combined_query.filter(Request.created_at >= start_date)
+        swaps = swaps.filter(SwapBoardEntry.created_at >= start_date)
     if end_date:
         end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        combined_query = combined_query.filter(Request.created_at <= end_date)
+        swaps = swaps.filter(SwapBoardEntry.created_at <= end_date)
 
     if opportunity:
-        combined_query = combined_query.filter(SwapGroupRequest.requested_student_id == None)
-
-    combined_query = combined_query.order_by(Request.created_at.desc())
-
-
-    total_items = combined_query.count()
-    paginated_query = combined_query.limit(page_size).offset((page - 1) * page_size).all()
-
-    data = [
-        {
+        swaps = swaps.order_by(SwapBoardEntry.urgency.desc(), SwapBoardEntry.created_at.desc(), SwapBoardEntry.request_id.desc())
+    else:
+        swaps = swaps.order_by(SwapBoardEntry.created_at.desc(), SwapBoardEntry.request_id.desc())
+
+    # the name index follows the students table
+    items, pagination = paginate(swaps, page, page_size, ["swap_board", "students"])
+
+    data = []
+    for row in items:
+        is_group = row.swap_type == request_type.GROUP.value
+        model, name = (Group, "group_name") if is_group else (Section, "name")
+        current = reference_row(model, row.current_id) if row.current_id else None
+        requested = reference_row(model, row.requested_id) if row.requested_id else None
+        data.append({
             "swap_request_id": row.swap_request_id,
             "request_id": row.request_id,
+            "type": row.swap_type,
             "student_id": row.student_id,
             "student_name": row.student_name,
             "status": row.status,
             "urgency": row.urgency,
             "created_at": row.created_at.isoformat() if row.created_at else None,
             "updated_at": row.updated_at.isoformat() if row.updated_at else None,
-            "current_group": row.current_group,
-            "current_section": row.current_section,
-            "current_group_id": row.current_group_id,
-            "current_section_id": row.current_section_id,
-            "requested_group": row.requested_group,
-            "requested_section": row.requested_section,
+            "current_group": current[name] if is_group and current else None,
+            "current_section": current[name] if not is_group and current else None,
+            "current_group_id": row.current_id if is_group else None,
+            "current_section_id": row.current_id if not is_group else None,
+            "requested_group": requested[name] if is_group and requested else None,
+            "requested_section": requested[name] if not is_group and requested else None,
             "requested_student_id": row.requested_student_id
-        }
-        for row in paginated_query
-    ]
+        })
 
     return jsonify({
         "success": True,
         "data": data,
-        "pagination": {
-            "totalItems": total_items,
-            "currentPage": page,
-            "pageSize": page_size,
-            "totalPages": (total_items + page_size - 1) // page_size
-        }
+        "pagination": pagination
     }), 200
 
 @request_bp.route('/swap', methods=["POST"])
@@ -598,16 +673,19 @@ def create_swap_request():
     error = run_validations([
         (validate_required_fields, [required_fields, data]),
         (validate_positive_integer, [data["requesting_student_id"], "requesting_student_id"]),
-        (validate_positive_integer, [data["group_id"], "groupId"]),
-        (validate_request_urgency, data["urgency"])
+        (validate_positive_integer, [data["requested_id"], "requested_id"]),
+        (validate_request_urgency, [data["urgency"]])
     ])
     if error:
         return jsonify(error), 400
     
+    if data["swap_type"] not in (request_type.GROUP.value, request_type.SECTION.value):
+        return jsonify({"error": "swap_type must be group or section"}), 400
+    
     # check if the user already has an active request of the same type
     active_request = Request.query.filter_by(
-        student_id=data["student_id"],
-        request_type=requestType
+        student_id=data["requesting_student_id"],
+        request_type=request_type.SWAP.value
     ).filter(Request.status.in_(['pending', 'appealed'])).first()
     
     if active_request:
@@ -615,78 +693,93 @@ def create_swap_request():
             "error": "You already have an active request of this type. Please wait for it to be processed."
         }), 400
         
-    student = Student.query.get(data["student_id"])
+    student = Student.query.get(data["requesting_student_id"])
     if not student:
         return jsonify({"error": "Invalid student"}), 400
     
+    new_request = Request(
+        student_id=student.student_id,
+        status="pending",
+        reason=data["reason"],
+        urgency=data["urgency"],
+        request_type=request_type.SWAP.value
+    )
+    
     if data["swap_type"] == request_type.GROUP.value:
-        requested_group = Group.query.get(data["requested_id"])
-        if not requested_group:
+        requested_group = reference_row(Group, int(data["requested_id"]))
+        if not requested_group or requested_group["section_id"] != student.section_id:
             return jsonify({"error": "Invalid group"}), 400
         
-        new_request = Request(
-            student_id=data["student_id"],
-            status="pending",
-            reason=data["reason"],
-            urgency=data["urgency"],
-            request_type=request_type.GROUP.value
-        )
-            
-        db.session.add(new_request)
-        db.session.commit()
+        current_group_id = student.tutorial_group_id if requested_group["group_type"] == "tutorial" else student.lab_group_id
+        if current_group_id == requested_group["group_id"]:
+            return jsonify({"error": "You are already in this group"}), 400
         
-        new_swap_group_request = SwapGroupRequest(
-            request_id=new_request.request_id,
+        new_swap_request = SwapGroupRequest(
+            request=new_request,
             current_student_id=student.student_id,
-            requested_student_id=None
+            requested_student_id=None,
+            current_group_id=current_group_id,
+            requested_group_id=requested_group["group_id"]
         )
-            
-        db.session.add(new_swap_group_request)
-        db.session.commit()
     
     elif data["swap_type"] == request_type.SECTION.value:
-        requested_section = Section.query.get(data["requested_id"])
-        if not requested_section:
+        requested_section = reference_row(Section, int(data["requested_id"]))
+        if not requested_section or requested_section["speciality_id"] != student.speciality_id:
             return jsonify({"error": "Invalid Section"}), 400
+        if student.section_id == requested_section["section_id"]:
+            return jsonify({"error": "You are already in this section"}), 400
         
-        new_request = Request(
-            student_id=data["student_id"],
-            status="pending",
-            reason=data["reason"],
-            urgency=data["urgency"],
-            request_type=request_type.SECTION.value
-        )
-        
-        db.session.add(new_request)
-        db.session.commit()
-        
-        new_swap_section_request = SwapSectionRequest(
-            request_id=new_request.request_id,
+        new_swap_request = SwapSectionRequest(
+            request=new_request,
             current_student_id=student.student_id,
-            requested_student_id=None
+            requested_student_id=None,
+            current_section_id=student.section_id,
+            requested_section_id=requested_section["section_id"]
         )
+    
+    db.session.add(new_request)
+    db.session.add(new_swap_request)
+    db.session.flush()
+    
+    # swaps that close a cycle with the open ones are executed right away
+    swap_id = getattr(new_swap_request, f"swap_{data['swap_type']}_request_id")
+    matched = match_swap(data["swap_type"], swap_id)
+    request_id = new_request.request_id
+    db.session.commit()
         
     return jsonify({
         "success": True,
-        "message": "Swap request submitted successfully",
-        "requestId": new_request.request_id
+        "message": "Swap request matched and accepted" if matched else "Swap request submitted successfully",
+        "requestId": request_id,
+        "matched": matched
     }), 201
    
 @request_bp.route('/swap', methods=["PATCH"])
 def update_swap_request():
     data = request.get_json()
     
-    required_fields = ["swap_request_id", "responding_student_id", "response", "opportunity", "type"]
+    required_fields = ["swap_request_id", "responding_student_id", "response", "type"]
     error = run_validations([
         (validate_required_fields, [required_fields, data]),
         (validate_positive_integer, [data["swap_request_id"], "swap_request_id"]),
         (validate_positive_integer, [data["responding_student_id"], "responding_student_id"]),
     ])
+    if error:
+        return jsonify(error), 400
+    
+    # validate_required_fields() would take false for missing
+    if not isinstance(data.get("opportunity"), bool):
+        return jsonify({"error": "opportunity must be true or false"}), 400
+    
+    if data["response"] not in ("accept", "reject"):
+        return jsonify({"error": "response must be accept or reject"}), 400
     
     if data["type"] == request_type.GROUP.value:
         swap_request = SwapGroupRequest.query.get(data["swap_request_id"])
     elif data["type"] == request_type.SECTION.value:
         swap_request = SwapSectionRequest.query.get(data["swap_request_id"])
+    else:
+        return jsonify({"error": "type must be group or section"}), 400
         
     if not swap_request:
         return jsonify({"error": "Invalid swap request ID"}), 404
@@ -695,104 +788,104 @@ def update_swap_request():
     if not responding_student:
         return jsonify({"error": "Invalid responding student ID"}), 404
     
-    request = Request.query.get(swap_request.request_id)
+    base_request = Request.query.options(*request_plan()).get(swap_request.request_id)
+    opportunity = data["opportunity"]
+    
+    # every check runs before anything is modified, and the response is one commit
+    if base_request.status != request_status.PENDING.value:
+        return jsonify({"error": "Only pending swap requests can be answered"}), 409
+    
+    requesting_student = base_request.student
+    if requesting_student.student_id == responding_student.student_id:
+        return jsonify({"error": "A student cannot answer their own swap request"}), 400
+    
+    # a group swap exchanges only the group of the requested type
+    requested_id = getattr(swap_request, f"requested_{data['type']}_id")
+    columns = swap_columns(data["type"], requested_id)
+    
+    # only the addressed student answers a directed swap, and only a student
+    # holding the requested group or section can take an open one
+    if opportunity:
+        if swap_request.requested_student_id is not None:
+            return jsonify({"error": "This is not an open opportunity"}), 400
+        if columns is None or requested_id is None or getattr(responding_student, columns[0]) != requested_id:
+            return jsonify({"error": f"Only a student of the requested {data['type']} can answer this swap request"}), 409
+    elif swap_request.requested_student_id != responding_student.student_id:
+        return jsonify({"error": "This swap request is addressed to another student"}), 403
     
     if data["response"] == "reject":
-        request.status = request_status.REJECTED.value
-        db.session.commit()
+        base_request.status = request_status.REJECTED.value
         
         notification = Notification(
-            user_id=request.student_id,
+            user_id=base_request.student.user_id,
             title="Swap Request Rejected",
-            message=f"Your swap request with ID {data["swap_request_id"]} has been rejected.",
+            message=f"Your swap request with ID {data['swap_request_id']} has been rejected.",
             notification_type=notification_type.WARNING.value,
             is_read=False
         )
         db.session.add(notification)
+        db.session.flush()
+        response = base_request.to_dict()
         db.session.commit()
         
         return jsonify({
             "success": True,
             "message": "Swap request rejected successfully",
-            "request": base_request.to_dict()
+            "request": response
         }), 200
         
-    if data["response"] == "accept":
-        request.status = request_status.APPROVED.value
-        db.session.commit()
-        
-        if opportunity:
-            if swap_request.requested_student_id is not None:
-                return jsonify({"error": "This is not an open opportunity"}), 400
-            swap_request.requested_student_id = data["responding_student_id"]
-            
-        requesting_student = Student.query.get(base_request.student_id)
-        if not requesting_student:
-            return jsonify({"error": "Requesting student not found"}), 404
+    if columns is None:
+        return jsonify({"error": "This swap request does not name the group it wants"}), 409
     
-        if data["type"] == request_type.GROUP.value:
-            tmp_tutorial = requesting_student.tutorial_group_id
-            tmp_lab = requesting_student.lab_group_id
-
-            requesting_student.tutorial_group_id = responding_student.tutorial_group_id
-            requesting_student.lab_group_id = responding_student.lab_group_id
-
-            responding_student.tutorial_group_id = tmp_tutorial
-            responding_student.lab_group_id = tmp_lab
-
-        elif data["type"] == request_type.SECTION.value:
-            tmp_section = requesting_student.section_id
-            requesting_student.section_id = responding_student.section_id
-            responding_student.section_id = tmp_section
-
-            tmp_tutorial = requesting_student.tutorial_group_id
-            tmp_lab = requesting_student.lab_group_id
-
-            requesting_student.tutorial_group_id = responding_student.tutorial_group_id
-            requesting_student.lab_group_id = responding_student.lab_group_id
-
-            responding_student.tutorial_group_id = tmp_tutorial
-            responding_student.lab_group_id = tmp_lab
-    
-        db.session.commit()
-        
-        # Notify both students
-        requesting_student_notification = Notification(
-            user_id=requesting_student.student_id,
-            title="Swap Request Accepted",
-            message=f"Your swap request with ID {data["swap_request_id"]} has been accepted. Your group has been updated.",
-            notification_type=notification_type.SUCCESS.value,
-            is_read=False
-        )
-        responding_student_notification = Notification(
-            user_id=responding_student.student_id,
-            title="Swap Request Accepted",
-            message=f"You have accepted a swap request with ID {data["swap_request_id"]}. Your group has been updated.",
-            notification_type=notification_type.SUCCESS.value,
-            is_read=False
-        )
-        db.session.add(requesting_student_notification)
-        db.session.add(responding_student_notification)
-
-        # Notify relevant teachers
-        teachers = Staff.query.filter_by(role="teacher").all()
-        for teacher in teachers:
-            teacher_notification = Notification(
-                user_id=teacher.user_id,
-                title="Swap Request Completed",
-                message=f"A swap request with ID {data["swap_request_id"]} has been completed. Please review the updated group assignments.",
-                notification_type=notification_type.INFO.value,
-                is_read=False
-            )
-            db.session.add(teacher_notification)
+    base_request.status = request_status.APPROVED.value
+    if opportunity:
+        swap_request.requested_student_id = responding_student.student_id
+
+    for column in columns:
+        requesting_value, responding_value = getattr(requesting_student, column), getattr(responding_student, column)
+        setattr(requesting_student, column, responding_value)
+        setattr(responding_student, column, requesting_value)
+    
+    # Notify both students
+    requesting_student_notification = Notification(
+        user_id=requesting_student.user_id,
+        title="Swap Request Accepted",
+        message=f"Your swap request with ID {data['swap_request_id']} has been accepted. Your group has been updated.",
+        notification_type=notification_type.SUCCESS.value,
+        is_read=False
+    )
+    responding_student_notification = Notification(
+        user_id=responding_student.user_id,
+        title="Swap Request Accepted",
+        message=f"You have accepted a swap request with ID {data['swap_request_id']}. Your group has been updated.",
+        notification_type=notification_type.SUCCESS.value,
+        is_read=False
+    )
+    db.session.add(requesting_student_notification)
+    db.session.add(responding_student_notification)
+
+    # Notify the teachers of the groups and sections the two students moved between
+    notify(
+        "teachers",
+        title="Swap Request Completed",
+        message=f"A swap request with ID {data['swap_request_id']} has been completed. Please review the updated group assignments.",
+        notification_type=notification_type.INFO.value,
+        group_ids=[
+            requesting_student.tutorial_group_id, requesting_student.lab_group_id,
+            responding_student.tutorial_group_id, responding_student.lab_group_id,
+        ],
+        section_ids=list({requesting_student.section_id, responding_student.section_id}),
+    )
 
-        db.session.commit()
+    db.session.flush()
+    response = base_request.to_dict()
+    db.session.commit()
 
-        return jsonify({
-            "success": True,
-            "message": "Swap request accepted successfully",
-            "request": base_request.to_dict()
-        }), 200
+    return jsonify({
+        "success": True,
+        "message": "Swap request accepted successfully",
+        "request": response
+    }), 200
         
 @request_bp.route('/swap/verify', methods=["GET"])
 def verify_swap_eligibility():
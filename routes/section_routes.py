@@ -1,11 +1,25 @@
 from flask import Blueprint, jsonify, request
 from models.section import Section
+from models.speciality import Speciality
 from models import db
 from resources.validations import *
+from resources.loading import section_plan
+from resources.pagination import paginate
+from resources.occupancy import section_occupancy
 
 section_bp = Blueprint('section_bp', __name__)
 
 
+@section_bp.route('/occupancy', methods=["GET"])
+def get_section_occupancy():
+    speciality_id = request.args.get("speciality_id", type=int)
+
+    return jsonify({
+        "success": True,
+        "data": section_occupancy(speciality_id)
+    }), 200
+
+
 @section_bp.route('/', methods=["GET"])
 def get_sections():
     # filters
@@ -16,7 +30,7 @@ def get_sections():
     speciality_id = request.args.get("speciality_id", type = int)
     level = request.args.get("level")
 
-    sections = Section.query
+    sections = Section.query.options(*section_plan())
 
     if name:
         sections = sections.filter(Section.name.ilike(f"{name}"))
@@ -27,13 +41,13 @@ def get_sections():
     if level:
         sections = sections.join(Speciality).filter(Speciality.education_level == level)
     
-    sections = sections.paginate(page=page, per_page=page_size)
+    items, pagination = paginate(sections, page, page_size, ["sections", "teacher_sections", "specialities"])
 
     return jsonify({
-        "count" : sections.total,
-        "page" : sections.page,
-        "total_pages" : sections.pages,
-        "sections": [section.to_dict() for section in sections.items],
+        "count" : pagination["totalItems"],
+        "page" : pagination["currentPage"],
+        "total_pages" : pagination["totalPages"],
+        "sections": [section.to_dict() for section in items],
         
     })
 
@@ -99,7 +113,7 @@ def delete_section(section_id):
         
 @section_bp.route('/<int:section_id>', methods=["GET"])
 def get_section(section_id):
-    section = Section.query.get(section_id)
+    section = Section.query.options(*section_plan()).get(section_id)
 
     if section:
         return jsonify(section.to_dict()), 200
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from models.speciality import Speciality
 from models import db
 from resources.validations import *
+from resources.pagination import paginate
 
 speciality_bp = Blueprint('speciality_bp', __name__)
 
@@ -25,21 +26,18 @@ def get_specialities():
         query = query.filter(Speciality.education_level == level_filter)
     
     # Pagination
-    paginated_specialities = query.paginate(
-        page=page,
-        per_page=per_page,
-    )
+    items, pagination = paginate(query, page, per_page, ["specialities"])
     
     # Prepare response
-    specialities_data = [speciality.to_dict() for speciality in paginated_specialities.items]
+    specialities_data = [speciality.to_dict() for speciality in items]
     
     return jsonify({
         'data': specialities_data,
         'pagination': {
-            'total': paginated_specialities.total,
-            'pages': paginated_specialities.pages,
-            'current_page': paginated_specialities.page,
-            'per_page': paginated_specialities.per_page,
+            'total': pagination["totalItems"],
+            'pages': pagination["totalPages"],
+            'current_page': pagination["currentPage"],
+            'per_page': pagination["pageSize"],
         }
     })
 
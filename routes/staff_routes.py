@@ -1,8 +1,13 @@
 from flask import Blueprint, jsonify, request
 from models import db, Staff, User, Role
 from resources.validations import *
+from resources.loading import staff_plan, plan_for
+from resources.serialization import parse_sparse_fieldset, serialize
+from resources.search import search_matches
+from resources.pagination import paginate
+from resources.reference import role_id
 
-from sqlalchemy import or_
+from sqlalchemy import false
 
 staff_bp = Blueprint('staff_bp', __name__)
 
@@ -13,10 +18,15 @@ def get_staffs():
     search_data = request.args.get("search_data", type=str)
     page = request.args.get("page", default=1, type=int)
     page_size = request.args.get("page_size", default=10, type=int)
+    exact_total = request.args.get("exact_total", default="true", type=str).lower() != "false"
     role_id = request.args.get("role_id", type=int)
     email = request.args.get("email", type=str)
 
-    staffs = Staff.query
+    fields, expand, error = parse_sparse_fieldset(Staff, request.args)
+    if error:
+        return jsonify(error), 400
+
+    staffs = Staff.query.options(*plan_for(Staff, expand))
 
     if search_data:
         search_data = search_data.strip()
@@ -24,31 +34,28 @@ def get_staffs():
             search_id = int(search_data)
             staffs = staffs.filter(Staff.staff_id == search_id)
         except ValueError:
-            staffs = staffs.filter(or_(
-                Staff.first_name.ilike(f"%{search_data}%"),
-                Staff.last_name.ilike(f"%{search_data}%"),
-            ))
+            # ranked match on the name token index
+            matches = search_matches("staff", search_data)
+            if matches is None:
+                staffs = staffs.filter(false())
+            else:
+                staffs = staffs.join(matches, matches.c.entity_id == Staff.staff_id).order_by(matches.c.score.desc(), Staff.staff_id)
     if role_id:
         staffs = staffs.join(User).filter(User.role_id == role_id)
     if email:
         staffs = staffs.join(User).filter(User.email.ilike(f"%{email}%"))
 
-    staffs = staffs.paginate(page=page, per_page=page_size)
+    items, pagination = paginate(staffs, page, page_size, ["staffs", "users"], exact_total)
 
     return jsonify({
         "success": True,
-        "data": [staff.to_dict() for staff in staffs.items],
-        "pagination": {
-            "totalItems": staffs.total,
-            "currentPage": staffs.page,
-            "pageSize": staffs.per_page,
-            "totalPages": staffs.pages,
-        }
+        "data": [serialize(staff, fields, expand) for staff in items],
+        "pagination": pagination
     }), 200
 
 @staff_bp.route('/<int:staff_id>', methods=["GET"])
 def get_staff(staff_id):
-    staff = Staff.query.get(staff_id)
+    staff = Staff.query.options(*staff_plan()).get(staff_id)
     if not staff:
         return jsonify({"error": "Staff not found"}), 404
 
@@ -72,13 +79,12 @@ def add_staff():
         return jsonify(error), 400
 
     # Assign the "Admin" role by default
-    role = db.session.execute(db.select(Role).filter_by(role_name="Admin")).first()
-    data["role_id"] = role[0].role_id
+    data["role_id"] = role_id("Admin")
 
     # Create the user
     new_user = User(
         email=data["email"],
-        hashed_password=User.hash_password(data["password"]),
+        password_hash=User.hash_password(str(data["password"])),
         role_id=data["role_id"]
     )
     db.session.add(new_user)
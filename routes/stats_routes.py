@@ -1,9 +1,44 @@
 from flask import Blueprint, jsonify, request
 from models import db, Student, Teacher, Staff, Section, Group, Request, Role, ChangeSectionRequest, ChangeGroupRequest,  SwapGroupRequest, SwapSectionRequest, TeacherGroup, TeacherSection
 from resources.auth import token_required
+from resources.counters import read_counters, rebuild_counters
+
+from sqlalchemy import select, func, or_
 
 stats_bp = Blueprint('stats_bp', __name__)
 
+
+def teacher_rollup_query(user_id):
+    """
+    The whole teacher dashboard as one statement of scalar subqueries, each an
+    index range read on teacher_groups/teacher_sections/students.
+    """
+    teacher_ids = select(Teacher.teacher_id).where(Teacher.user_id == user_id)
+    teacher_sections = select(TeacherSection.section_id).where(TeacherSection.teacher_id.in_(teacher_ids))
+    teacher_groups = select(TeacherGroup.group_id).where(TeacherGroup.teacher_id.in_(teacher_ids))
+
+    return select(
+        select(func.count(func.distinct(TeacherGroup.group_id)))
+            .where(TeacherGroup.teacher_id.in_(teacher_ids))
+            .scalar_subquery().label("active_groups"),
+        select(func.count(func.distinct(TeacherSection.section_id)))
+            .where(TeacherSection.teacher_id.in_(teacher_ids))
+            .scalar_subquery().label("active_sections"),
+        # a student is covered through their section or either of their groups
+        select(func.count(Student.student_id))
+            .where(or_(
+                Student.section_id.in_(teacher_sections),
+                Student.tutorial_group_id.in_(teacher_groups),
+                Student.lab_group_id.in_(teacher_groups),
+            ))
+            .scalar_subquery().label("total_students"),
+        select(func.count(Request.request_id))
+            .join(Student, Request.student_id == Student.student_id)
+            .where(Request.status == "new_student", Student.section_id.in_(teacher_sections))
+            .scalar_subquery().label("new_students"),
+    )
+
+
 @stats_bp.route('/dashboard', methods=["GET"])
 @token_required
 def get_stats():
@@ -14,58 +49,22 @@ def get_stats():
     role_name = user.role.role_name  # Get the user's role name
 
     if role_name == "Staff":
-        total_students = Student.query.count()
-        total_teachers = Teacher.query.count()
-        total_staff = Staff.query.count()
-        total_sections = Section.query.count()
-        group_changes = ChangeGroupRequest.query.count() + SwapGroupRequest.query.count()
-        section_changes = ChangeSectionRequest.query.count() + SwapSectionRequest.query.count()
-        appeals = Request.query.filter_by(status="appeal").count()
-
+        # counters are kept current by the writes themselves, see resources/counters.py
         return jsonify({
             "success": True,
-            "stats": {
-                "total_students": total_students,
-                "total_teachers": total_teachers,
-                "total_staff": total_staff,
-                "total_sections": total_sections,
-                "group_changes": group_changes,
-                "section_changes": section_changes,
-                "appeals": appeals
-            }
+            "stats": read_counters()
         }), 200
 
     elif role_name == "Teacher":
-        teacher_id = user.teacher.teacher_id 
-        active_groups = Group.query.join(Group.teacher_groups, Group.group_id == TeacherGroup.group_id).filter_by(teacher_id=teacher_id).count()
-        active_sections = Section.query.join(Section.teacher_sections, Section.section_id == TeacherSection.section_id).filter_by(teacher_id=teacher_id).count()
-        
-        section_students = (
-            db.session.query(Student.student_id)
-            .join(Group, Student.group_id == Group.group_id)
-            .join(Section, Group.section_id == Section.section_id)
-            .join(TeacherSection, Section.section_id == TeacherSection.section_id)
-            .filter(TeacherSection.teacher_id == teacher_id)
-        )
-        group_students = (
-            db.session.query(Student.student_id)
-            .join(Group, Student.group_id == Group.group_id)
-            .join(TeacherGroup, Group.group_id == TeacherGroup.group_id)
-            .filter(TeacherGroup.teacher_id == teacher_id)
-        )
-        
-        union_query = section_students.union(group_students).subquery()
-        total_students = db.session.query(func.count(func.distinct(union_query.c.student_id))).scalar()
-        
-        new_students = Request.query.filter_by(status="new_student").join(Student).join(Section.teacher_sections).filter_by(teacher_id=teacher_id).count()
+        rollup = db.session.execute(teacher_rollup_query(user.user_id)).one()
 
         return jsonify({
             "success": True,
             "stats": {
-                "active_groups": active_groups,
-                "total_students": total_students,
-                "active_sections": active_sections,
-                "new_students": new_students
+                "active_groups": rollup.active_groups,
+                "total_students": rollup.total_students,
+                "active_sections": rollup.active_sections,
+                "new_students": rollup.new_students
             }
         }), 200
 
@@ -73,3 +72,19 @@ def get_stats():
         # If the user is not Staff or Teacher, return an error
         return jsonify({"error": "Unauthorized access"}), 403
 
+
+@stats_bp.route('/counters/rebuild', methods=["POST"])
+@token_required
+def rebuild_dashboard_counters():
+    """
+    Recomputes the dashboard counters from the source tables (staff only);
+    the same as `flask stats rebuild-counters`.
+    """
+    user = getattr(request, 'user')
+    if user.role.role_name != "Staff":
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    return jsonify({
+        "success": True,
+        "stats": rebuild_counters()
+    }), 200
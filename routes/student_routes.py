@@ -1,8 +1,16 @@
 from flask import Blueprint, jsonify, request
 from models import db, Student, User, Role
 from resources.validations import *
+from resources.loading import student_plan, plan_for
+from resources.serialization import parse_sparse_fieldset, serialize
+from resources.search import search_matches
+from resources.pagination import keyset_paginate, paginate
+from resources.student_import import read_rows, import_students
+from resources.reference import role_id
 
-from sqlalchemy import or_
+import io
+
+from sqlalchemy import false
 
 
 student_bp = Blueprint('student_bp', __name__)
@@ -15,12 +23,19 @@ def get_students():
     search_data = request.args.get("search_data", type=str)
     page = request.args.get("page", default=1, type=int)
     page_size = request.args.get("page_size", default=10, type=int)
+    cursor = request.args.get("cursor", type=str)
+    with_count = request.args.get("with_count", default="false", type=str).lower() == "true"
+    exact_total = request.args.get("exact_total", default="true", type=str).lower() != "false"
     section_id = request.args.get("section_id", type=int)
     tutorial_group_id = request.args.get("tutorial_group_id", type=int)
     lab_group_id = request.args.get("lab_group_id", type=int)
     status = request.args.get("status", type=str)
     
-    students = Student.query
+    fields, expand, error = parse_sparse_fieldset(Student, request.args)
+    if error:
+        return jsonify(error), 400
+
+    students = Student.query.options(*plan_for(Student, expand))
     
     if search_data:
         search_data = search_data.strip()
@@ -28,10 +43,12 @@ def get_students():
             search_id = int(search_data)
             students = students.filter(Student.student_id == search_id)
         except ValueError:
-            students = students.filter(or_(
-                Student.first_name.ilike(f"%{search_data}%"),
-                Student.last_name.ilike(f"%{search_data}%"),
-            ))        
+            # ranked match on the name token index
+            matches = search_matches("student", search_data)
+            if matches is None:
+                students = students.filter(false())
+            else:
+                students = students.join(matches, matches.c.entity_id == Student.student_id).order_by(matches.c.score.desc(), Student.student_id)
     if section_id:
         students = students.filter(Student.section_id == section_id)
     if tutorial_group_id:
@@ -41,17 +58,18 @@ def get_students():
     if status:
         students = students.filter(Student.status == status)
     
-    students = students.paginate(page=page, per_page=page_size)
+    if cursor is not None:
+        # keyset mode: seek from (created_at, student_id) instead of OFFSET
+        items, pagination, error = keyset_paginate(students, Student.created_at, Student.student_id, cursor, page_size, with_count)
+        if error:
+            return jsonify(error), 400
+    else:
+        items, pagination = paginate(students, page, page_size, ["students"], exact_total)
     
     return jsonify({
         "success": True,
-        "data": [student.to_dict() for student in students.items], 
-        "pagination": {
-            "totalItems": students.total,
-            "currentPage": students.page,
-            "pageSize": students.per_page,
-            "totalPages": students.pages,
-        }
+        "data": [serialize(student, fields, expand) for student in items], 
+        "pagination": pagination
     })
 
 @student_bp.route('/', methods=["POST"])
@@ -80,12 +98,11 @@ def add_student():
     
     validation_error = Student.validate_student(data, db)
     if validation_error:
-        return jsonify(error), 400
+        return jsonify(validation_error), 400
     
     
     # give the student the role "Student" by default
-    role = db.session.execute(db.select(Role).filter_by(role_name="Student")).first()
-    data["role_id"] = role[0].role_id
+    data["role_id"] = role_id("Student")
     
     
     # create student
@@ -119,9 +136,29 @@ def add_student():
             "student": new_student.to_dict()
         }), 201
     
+@student_bp.route('/bulk', methods=["POST"])
+def bulk_add_students():
+    # CSV with a header row or NDJSON (one student object per line), read as a stream
+    content_format = request.args.get("format") or (
+        "csv" if request.mimetype in ("text/csv", "application/csv") else
+        "ndjson" if request.mimetype in ("application/x-ndjson", "application/jsonl", "application/json-seq") else None
+    )
+    if content_format not in ("csv", "ndjson"):
+        return jsonify({"error": "Send text/csv or application/x-ndjson (or ?format=csv|ndjson)"}), 415
+
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8-sig", newline="")
+    imported, errors = import_students(read_rows(stream, content_format))
+
+    return jsonify({
+        "success": not errors,
+        "imported": imported,
+        "failed": len(errors),
+        "errors": errors,
+    }), (201 if not errors else 207) if imported else 400
+
 @student_bp.route('/<int:student_id>', methods=["GET"])
 def get_student(student_id):
-    student = Student.query.get(student_id)
+    student = Student.query.options(*student_plan()).get(student_id)
     if student:
         return jsonify(student.to_dict())
     else:
@@ -1,8 +1,13 @@
 from flask import Blueprint, jsonify, request
 from models import db, User, Teacher, TeacherSection, TeacherGroup, Role
 from resources.validations import *
+from resources.loading import teacher_plan, plan_for
+from resources.serialization import parse_sparse_fieldset, serialize
+from resources.search import search_matches
+from resources.pagination import paginate
+from resources.reference import role_id
 
-from sqlalchemy import or_
+from sqlalchemy import false
 
 teacher_bp  = Blueprint('teacher_bp',__name__)
 
@@ -12,11 +17,16 @@ def get_teachers():
     search_data = request.args.get("search_data", type=str)
     page = request.args.get("page", default=1, type=int)
     page_size = request.args.get("page_size", default=10, type=int)
+    exact_total = request.args.get("exact_total", default="true", type=str).lower() != "false"
     section_id = request.args.get("section_id", type=int)
     tutorial_group_id = request.args.get("tutorial_group_id", type=int)
     lab_group_id = request.args.get("lab_group_id", type=int)
     
-    teachers = Teacher.query
+    fields, expand, error = parse_sparse_fieldset(Teacher, request.args)
+    if error:
+        return jsonify(error), 400
+
+    teachers = Teacher.query.options(*plan_for(Teacher, expand))
     
     if search_data:
         search_data = search_data.strip()
@@ -24,10 +34,12 @@ def get_teachers():
             search_id = int(search_data)
             teachers = teachers.filter(Teacher.teacher_id == search_id)
         except ValueError:
-            teachers = teachers.filter(or_(
-                Teacher.first_name.ilike(f"%{search_data}%"),
-                Teacher.last_name.ilike(f"%{search_data}%"),
-            ))
+            # ranked match on the name token index
+            matches = search_matches("teacher", search_data)
+            if matches is None:
+                teachers = teachers.filter(false())
+            else:
+                teachers = teachers.join(matches, matches.c.entity_id == Teacher.teacher_id).order_by(matches.c.score.desc(), Teacher.teacher_id)
     if section_id:
         teachers = teachers.join(TeacherSection).filter(TeacherSection.section_id == section_id)
     if tutorial_group_id:
@@ -35,23 +47,17 @@ def get_teachers():
     if lab_group_id:
         teachers = teachers.join(TeacherGroup).filter(TeacherGroup.group_id == lab_group_id)
     
-    teachers = teachers.paginate(page=page, per_page=page_size)
-    
-    
+    items, pagination = paginate(teachers, page, page_size, ["teachers", "teacher_sections", "teacher_groups"], exact_total)
+
     return jsonify({
         "success": True,
-        "data": [teacher.to_dict() for teacher in teachers.items], 
-        "pagination": {
-            "totalItems": teachers.total,
-            "currentPage": teachers.page,
-            "pageSize": teachers.per_page,
-            "totalPages": teachers.pages,
-        }
+        "data": [serialize(teacher, fields, expand) for teacher in items],
+        "pagination": pagination
     })
 
 @teacher_bp.route('/<int:teacher_id>',methods=["GET"])
 def get_teacher(teacher_id):
-    teacher = Teacher.query.get(teacher_id)
+    teacher = Teacher.query.options(*teacher_plan()).get(teacher_id)
     if not teacher:
         return jsonify({"error" : "no teacher found"}),404
     return jsonify(teacher.to_dict()),200
@@ -70,8 +76,7 @@ def add_teacher():
         return jsonify(error), 400
 
     # give the teacher the role "Teacher" by default
-    role = db.session.execute(db.select(Role).filter_by(role_name="Teacher")).first()
-    data["role_id"] = role[0].role_id
+    data["role_id"] = role_id("Teacher")
     
     # create new user
     new_user = User(email=data["email"], password_hash=User.hash_password(str(data["password"])), role_id=data["role_id"])
@@ -0,0 +1,123 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config import Config
+from models import (
+    db, Role, User, Speciality, Section, Group, Student, Staff, Teacher, TeacherGroup, TeacherSection,
+    Request, ChangeGroupRequest, Notification
+)
+from routes import register_blueprints
+from resources import pagination
+from resources.auth import invalidate_principal
+from resources.reference import invalidate_reference_data
+
+STUDENTS = 30
+
+
+def seed(students=STUDENTS):
+    """One speciality and section, two tutorial groups and a lab; every student has a pending group request."""
+    roles = [Role(role_name=name, permission_level=level) for level, name in enumerate(["Student", "Teacher", "Admin", "Staff"])]
+    db.session.add_all(roles)
+    db.session.flush()
+    speciality = Speciality(name="CS", education_level=1)
+    db.session.add(speciality)
+    db.session.flush()
+    section = Section(speciality_id=speciality.speciality_id, name="A", max_capacity=100)
+    db.session.add(section)
+    db.session.flush()
+    tutorial = Group(section_id=section.section_id, group_type="tutorial", group_name="T1", max_capacity=50)
+    lab = Group(section_id=section.section_id, group_type="lab", group_name="L1", max_capacity=50)
+    other_tutorial = Group(section_id=section.section_id, group_type="tutorial", group_name="T2", max_capacity=50)
+    db.session.add_all([tutorial, lab, other_tutorial])
+    db.session.flush()
+
+    for number in range(students):
+        user = User(email=f"student{number}@test.local", password_hash="x", role_id=roles[0].role_id)
+        db.session.add(user)
+        db.session.flush()
+        student = Student(
+            user_id=user.user_id, first_name=f"First{number}", last_name=f"Last{number}", birth_date=date(2000, 1, 1),
+            nationality="DZ", gender="male", disability=False, phone_number="0", observation="",
+            speciality_id=speciality.speciality_id, section_id=section.section_id,
+            tutorial_group_id=tutorial.group_id, lab_group_id=lab.group_id, status="active",
+        )
+        db.session.add(student)
+        db.session.flush()
+        new_request = Request(student_id=student.student_id, status="pending", reason="seed", urgency=2, request_type="group")
+        db.session.add(new_request)
+        db.session.flush()
+        db.session.add(ChangeGroupRequest(
+            request_id=new_request.request_id, current_group_id=tutorial.group_id, requested_group_id=other_tutorial.group_id
+        ))
+        db.session.add(Notification(user_id=user.user_id, title="t", message="m", notification_type="info", is_read=False))
+
+    staff_user = User(email="staff@test.local", password_hash="x", role_id=roles[3].role_id)
+    teacher_user = User(email="teacher@test.local", password_hash="x", role_id=roles[1].role_id)
+    db.session.add_all([staff_user, teacher_user])
+    db.session.flush()
+    db.session.add(Staff(user_id=staff_user.user_id, first_name="S", last_name="T", grade="g"))
+    teacher = Teacher(user_id=teacher_user.user_id, first_name="T", last_name="T", grade="g")
+    db.session.add(teacher)
+    db.session.flush()
+    db.session.add(TeacherGroup(teacher_id=teacher.teacher_id, group_id=tutorial.group_id))
+    db.session.add(TeacherSection(teacher_id=teacher.teacher_id, section_id=section.section_id))
+    db.session.commit()
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["SECRET_KEY"] = "test"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    register_blueprints(app)
+    with app.app_context():
+        # the in-process caches outlive an app; start each test from a cold state
+        invalidate_reference_data()
+        invalidate_principal()
+        pagination._count_cache.clear()
+        db.create_all()
+        seed()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class StatementLog:
+    """SQL statements sent on the engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def __len__(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def statements(app):
+    return lambda: StatementLog(db.engine)
@@ -0,0 +1,46 @@
+from models import db, User
+from resources import hashing
+
+
+def _user_with_password(app, password, rounds):
+    app.config["BCRYPT_ROUNDS"] = rounds
+    user = db.session.get(User, 1)
+    user.password_hash = User.hash_password(password)
+    db.session.commit()
+    return user
+
+
+def test_login_rehashes_when_the_cost_changes(app, client):
+    user = _user_with_password(app, "secret-password", 4)
+    app.config["BCRYPT_ROUNDS"] = 5
+
+    response = client.post("/auth/login", json={"email": user.email, "password": "secret-password"})
+
+    assert response.status_code == 200
+    assert response.get_json()["token"]
+    db.session.expire_all()
+    stored = db.session.get(User, 1).password_hash
+    assert hashing.hash_rounds(stored) == 5
+    assert User.check_password("secret-password", stored)
+
+
+def test_login_keeps_a_current_hash(app, client):
+    user = _user_with_password(app, "secret-password", 4)
+    stored = user.password_hash
+
+    assert client.post("/auth/login", json={"email": user.email, "password": "secret-password"}).status_code == 200
+    db.session.expire_all()
+    assert db.session.get(User, 1).password_hash == stored
+
+
+def test_login_rejects_a_wrong_password(app, client):
+    user = _user_with_password(app, "secret-password", 4)
+    stored = user.password_hash
+    app.config["BCRYPT_ROUNDS"] = 5
+
+    response = client.post("/auth/login", json={"email": user.email, "password": "wrong-password"})
+
+    assert response.status_code == 401
+    db.session.expire_all()
+    assert db.session.get(User, 1).password_hash == stored
+    assert client.post("/auth/login", json={"email": user.email}).status_code == 400
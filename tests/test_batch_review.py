@@ -0,0 +1,73 @@
+from models import db, ChangeGroupRequest, Group, GroupOccupancy, Request, Student
+from resources.occupancy import rebuild_occupancy
+
+
+def _occupancy():
+    db.session.expire_all()
+    return {entry.group_id: entry.students for entry in GroupOccupancy.query}
+
+
+def _assert_counters_exact():
+    counters = _occupancy()
+    rebuild_occupancy()
+    assert counters == _occupancy()
+
+
+def _set_capacity(group_id, capacity):
+    db.session.get(Group, group_id).max_capacity = capacity
+    db.session.commit()
+
+
+def _batch_review(client, **options):
+    response = client.post("/requests/change/batch-review", json={"type": "group", **options})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_batch_review_stops_at_capacity(client):
+    _set_capacity(3, 2)
+
+    body = _batch_review(client)
+
+    assert body["summary"] == {"considered": 30, "approved": 2, "rejected": 0, "left_pending": 28}
+    assert _occupancy()[3] == 2
+    assert Request.query.filter_by(status="approved").count() == 2
+    _assert_counters_exact()
+
+    # nothing left to take
+    assert _batch_review(client)["summary"]["approved"] == 0
+
+
+def test_batch_review_reuses_a_seat_freed_in_the_run(client):
+    t3 = Group(section_id=1, group_type="tutorial", group_name="T3", max_capacity=5)
+    db.session.add(t3)
+    for seeded in Request.query.filter(Request.student_id.notin_([1, 2])):
+        seeded.status = "rejected"
+    db.session.commit()
+    _set_capacity(3, 1)
+
+    # student 1 holds the only seat of T2 and wants T3, student 2 wants that seat
+    db.session.get(Student, 1).tutorial_group_id = 3
+    moving_out = Request.query.filter_by(student_id=1).one()
+    moving_out.urgency = 3
+    db.session.get(ChangeGroupRequest, moving_out.request_id).requested_group_id = t3.group_id
+    db.session.commit()
+
+    body = _batch_review(client)
+
+    assert body["summary"]["approved"] == 2
+    assert [result["student_id"] for result in body["results"]] == [1, 2]
+    db.session.expire_all()
+    assert db.session.get(Student, 1).tutorial_group_id == t3.group_id
+    assert db.session.get(Student, 2).tutorial_group_id == 3
+    _assert_counters_exact()
+
+
+def test_dry_run_changes_nothing(client):
+    _set_capacity(3, 2)
+    before = _occupancy()
+
+    assert _batch_review(client, dry_run=True)["summary"]["approved"] == 2
+
+    assert _occupancy() == before
+    assert Request.query.filter_by(status="pending").count() == 30
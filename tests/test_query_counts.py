@@ -0,0 +1,89 @@
+"""
+Statements per endpoint call. A page must cost the same number of statements
+whatever its size, and no more than the bound listed here; raise a bound only
+together with the change that needs it.
+"""
+import pytest
+
+from models import db, Request
+
+# (url, statements for a warm call)
+ENDPOINTS = [
+    ("/students/", 1),
+    ("/students/1", 1),
+    ("/requests/", 1),
+    ("/requests/1", 2),
+    ("/teachers/", 1),
+    ("/teachers/1", 1),
+    ("/staffs/", 1),
+    ("/staffs/1", 1),
+    ("/groups/", 1),
+    ("/groups/1", 2),
+    ("/sections/", 1),
+    ("/sections/1", 1),
+    ("/specialities/", 1),
+    ("/specialities/1", 1),
+    ("/users/", 1),
+    ("/users/1", 1),
+    ("/roles/", 1),
+    ("/notifications/?user_id=1", 1),
+    ("/notifications/unread_count?user_id=1", 1),
+    ("/requests/swap?student_id=1", 1),
+    ("/requests/swap?student_id=1&opportunity=true&search_data=First1", 2),
+    ("/requests/1/timeline", 1),
+    ("/requests/timeline?student_id=1", 1),
+    ("/groups/occupancy", 1),
+    ("/sections/occupancy", 1),
+]
+
+
+def _page(url, page_size):
+    return f"{url}{'&' if '?' in url else '?'}page_size={page_size}"
+
+
+@pytest.mark.parametrize("url, bound", ENDPOINTS)
+def test_endpoint_statements(client, statements, url, bound):
+    # the first call fills the reference and count caches
+    assert client.get(_page(url, 5)).status_code == 200
+
+    counts = []
+    for page_size in (5, 25):
+        with statements() as log:
+            response = client.get(_page(url, page_size))
+        assert response.status_code == 200
+        counts.append(len(log))
+
+    assert counts[0] == counts[1], f"{url}: {counts[0]} statements for 5 rows, {counts[1]} for 25"
+    assert counts[0] <= bound, f"{url}: {counts[0]} statements, expected at most {bound}"
+
+
+def _updates_of_requests(log):
+    return [statement for statement in log.statements if statement.lstrip().upper().startswith("UPDATE REQUESTS")]
+
+
+def test_create_change_request_statements(client, statements):
+    # a student may only have one pending request
+    for request_id in (1, 2):
+        db.session.get(Request, request_id).status = "rejected"
+    db.session.commit()
+    client.post("/requests/change?type=group", json={"student_id": 1, "reason": "warm", "urgency": 1, "requested_id": 3})
+
+    with statements() as log:
+        response = client.post("/requests/change?type=group", json={
+            "student_id": 2, "reason": "test", "urgency": 1, "requested_id": 3,
+        })
+    assert response.status_code == 201
+    assert len(log) <= 8
+
+
+def test_review_request_statements(client, statements):
+    client.put("/requests/change/status", json={"request_id": 1, "status": "rejected", "type": "group", "comment": "warm"})
+
+    with statements() as log:
+        response = client.put("/requests/change/status", json={
+            "request_id": 2, "status": "approved", "type": "group", "comment": "test",
+        })
+    assert response.status_code == 200
+    assert len(log) <= 11
+    # status and comment go out in the same UPDATE
+    assert len(_updates_of_requests(log)) == 1
@@ -0,0 +1,61 @@
+from models import db, Request, RequestEvent
+
+
+def _transitions(request_id):
+    db.session.expire_all()
+    return [
+        (event.from_status, event.to_status)
+        for event in RequestEvent.query.filter_by(request_id=request_id).order_by(RequestEvent.event_id)
+    ]
+
+
+def _review(client, request_id, status, comment="reviewed"):
+    response = client.put("/requests/change/status", json={
+        "request_id": request_id, "status": status, "type": "group", "comment": comment,
+    })
+    assert response.status_code == 200, response.get_json()
+
+
+def test_one_event_per_transition(client):
+    _review(client, 1, "rejected", "no room")
+    assert client.post("/requests/appeal", json={"requestId": 1, "studentId": 1, "reason": "please"}).status_code == 201
+    _review(client, 1, "approved")
+
+    assert _transitions(1) == [(None, "pending"), ("pending", "rejected"), ("rejected", "appealed"), ("appealed", "approved")]
+
+    response = client.get("/requests/1/timeline")
+    assert [(event["from_status"], event["to_status"]) for event in response.get_json()["data"]] == _transitions(1)
+    assert response.get_json()["data"][1]["comment"] == "no room"
+
+
+def test_cancel_and_batch_review_record_their_transition(client):
+    assert client.post("/requests/cancel", json={"requestId": 2, "studentId": 2}).status_code == 200
+    response = client.post("/requests/change/batch-review", json={"type": "group", "limit": 1})
+    assert response.status_code == 200
+
+    assert _transitions(2) == [(None, "pending"), ("pending", "canceled")]
+    assert _transitions(1) == [(None, "pending"), ("pending", "approved")]
+
+
+def test_one_transaction_records_where_it_ended(client):
+    current_request = db.session.get(Request, 3)
+    current_request.status = "rejected"
+    db.session.flush()
+    current_request.status = "approved"
+    db.session.flush()
+    current_request.comment = "only a comment"
+    db.session.commit()
+    assert _transitions(3) == [(None, "pending"), ("pending", "approved")]
+
+    current_request = db.session.get(Request, 4)
+    current_request.status = "rejected"
+    db.session.flush()
+    current_request.status = "pending"
+    db.session.commit()
+    assert _transitions(4) == [(None, "pending")]
+
+    current_request = db.session.get(Request, 5)
+    current_request.status = "rejected"
+    db.session.flush()
+    db.session.rollback()
+    assert _transitions(5) == [(None, "pending")]
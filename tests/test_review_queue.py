@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from models import db, Request, ReviewQueueEntry, Staff, User
+
+
+def _add_staff():
+    user = User(email="staff2@test.local", password_hash="x", role_id=4)
+    db.session.add(user)
+    db.session.flush()
+    staff = Staff(user_id=user.user_id, first_name="S", last_name="U", grade="g")
+    db.session.add(staff)
+    db.session.commit()
+    return staff.staff_id
+
+
+def _claim(client, staff_id):
+    response = client.get(f"/requests/queue/next?staff_id={staff_id}")
+    assert response.status_code == 200, response.get_json()
+    claimed = response.get_json()["request"]
+    return claimed and claimed["request_id"]
+
+
+def _appeal(client, request_id, student_id):
+    return client.post("/requests/appeal", json={"requestId": request_id, "studentId": student_id, "reason": "please"})
+
+
+def test_claims_from_concurrent_staff_never_share_a_lease(client):
+    first_staff, second_staff = 1, _add_staff()
+
+    claimed = [_claim(client, first_staff), _claim(client, second_staff), _claim(client, first_staff)]
+    assert len(set(claimed)) == 3
+    leases = {entry.request_id: entry.claimed_by for entry in ReviewQueueEntry.query.filter(ReviewQueueEntry.claimed_by.isnot(None))}
+    assert leases == {claimed[0]: first_staff, claimed[1]: second_staff, claimed[2]: first_staff}
+
+    # an expired lease goes back to the front of the queue
+    entry = db.session.get(ReviewQueueEntry, claimed[0])
+    entry.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert _claim(client, second_staff) == claimed[0]
+    assert db.session.get(ReviewQueueEntry, claimed[0]).claimed_by == second_staff
+
+
+def test_only_the_owner_appeals_a_rejected_request(client):
+    # pending, and someone else's
+    assert _appeal(client, 1, 1).status_code == 400
+    assert _appeal(client, 1, 2).status_code == 403
+
+    response = client.put("/requests/change/status", json={"request_id": 1, "status": "rejected", "type": "group", "comment": "full"})
+    assert response.status_code == 200
+    assert db.session.get(ReviewQueueEntry, 1) is None
+    assert _appeal(client, 1, 2).status_code == 403
+    assert db.session.get(Request, 1).status == "rejected"
+
+    assert _appeal(client, 1, 1).status_code == 201
+    db.session.expire_all()
+    assert db.session.get(Request, 1).status == "appealed"
+    # the appeal outranks requests that were created at the same time
+    assert _claim(client, 1) == 1
+    assert _appeal(client, 1, 1).status_code == 400
@@ -0,0 +1,60 @@
+from models import db, Student, SwapBoardEntry
+from resources.swap_board import rebuild_swap_board
+
+COMPARED = [column for column in SwapBoardEntry.__table__.columns.keys() if column != "updated_at"]
+
+
+def _board():
+    db.session.expire_all()
+    return {
+        entry.request_id: {column: getattr(entry, column) for column in COMPARED}
+        for entry in SwapBoardEntry.query
+    }
+
+
+def _assert_board_matches_a_rebuild():
+    board = _board()
+    rebuild_swap_board()
+    assert board == _board()
+    return board
+
+
+def _post_swap(client, student_id, requested_id=3):
+    response = client.post("/requests/swap", json={
+        "requesting_student_id": student_id, "requested_id": requested_id,
+        "reason": "swap", "urgency": 2, "swap_type": "group",
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["requestId"]
+
+
+def _opportunities(client, student_id, **filters):
+    query = "&".join(f"{key}={value}" for key, value in filters.items())
+    response = client.get(f"/requests/swap?student_id={student_id}&opportunity=true&{query}")
+    assert response.status_code == 200, response.get_json()
+    return [entry["request_id"] for entry in response.get_json()["data"]]
+
+
+def test_board_follows_status_changes(client):
+    first, second = _post_swap(client, 1), _post_swap(client, 2)
+    board = _assert_board_matches_a_rebuild()
+    assert {board[first]["status"], board[second]["status"]} == {"pending"}
+    assert sorted(_opportunities(client, 5)) == sorted([first, second])
+
+    assert client.post("/requests/cancel", json={"requestId": first, "studentId": 1}).status_code == 200
+
+    board = _assert_board_matches_a_rebuild()
+    assert board[first]["status"] == "canceled"
+    assert _opportunities(client, 5) == [second]
+
+
+def test_board_follows_student_renames(client):
+    request_id = _post_swap(client, 1)
+    student = db.session.get(Student, 1)
+    student.first_name, student.last_name = "Nadia", "Haddad"
+    db.session.commit()
+
+    board = _assert_board_matches_a_rebuild()
+    assert board[request_id]["student_name"] == "Nadia Haddad"
+    assert _opportunities(client, 5, search_data="nadia") == [request_id]
+    assert _opportunities(client, 5, search_data="First0") == []
@@ -0,0 +1,69 @@
+from models import db, Group, Request, Student, SwapGroupRequest
+
+
+def _add_group(name, group_type):
+    group = Group(section_id=1, group_type=group_type, group_name=name, max_capacity=50)
+    db.session.add(group)
+    db.session.commit()
+    return group.group_id
+
+
+def _place(student_id, tutorial_group_id, lab_group_id):
+    student = db.session.get(Student, student_id)
+    student.tutorial_group_id, student.lab_group_id = tutorial_group_id, lab_group_id
+    db.session.commit()
+
+
+def _post_swap(client, student_id, requested_id):
+    response = client.post("/requests/swap", json={
+        "requesting_student_id": student_id, "requested_id": requested_id,
+        "reason": "swap", "urgency": 2, "swap_type": "group",
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()
+
+
+def _placements(*student_ids):
+    db.session.expire_all()
+    return {
+        student_id: (student.tutorial_group_id, student.lab_group_id)
+        for student_id in student_ids
+        for student in [db.session.get(Student, student_id)]
+    }
+
+
+def test_three_way_cycle_moves_only_the_tutorial_groups(client):
+    t1, t2, t3 = 1, 3, _add_group("T3", "tutorial")
+    l1, l2, l3 = 2, _add_group("L2", "lab"), _add_group("L3", "lab")
+    _place(1, t1, l1)
+    _place(2, t2, l2)
+    _place(3, t3, l3)
+
+    first = _post_swap(client, 1, t2)
+    second = _post_swap(client, 2, t3)
+    assert first["message"] == second["message"] == "Swap request submitted successfully"
+    assert _placements(1, 2, 3) == {1: (t1, l1), 2: (t2, l2), 3: (t3, l3)}
+
+    # student 3 wanting T1 closes T1 -> T2 -> T3 -> T1
+    third = _post_swap(client, 3, t1)
+    assert third["message"] == "Swap request matched and accepted"
+    assert _placements(1, 2, 3) == {1: (t2, l1), 2: (t3, l2), 3: (t1, l3)}
+    swaps = SwapGroupRequest.query.order_by(SwapGroupRequest.swap_group_request_id).all()
+    assert [db.session.get(Request, swap.request_id).status for swap in swaps] == ["approved"] * 3
+    assert [swap.requested_student_id for swap in swaps] == [2, 3, 1]
+
+
+def test_accepted_swap_keeps_the_other_group(client):
+    lab = _add_group("L2", "lab")
+    _place(1, 1, 2)
+    _place(2, 3, lab)
+    request_id = _post_swap(client, 1, 3)["requestId"]
+    swap = SwapGroupRequest.query.filter_by(request_id=request_id).one()
+
+    response = client.patch("/requests/swap", json={
+        "swap_request_id": swap.swap_group_request_id, "responding_student_id": 2,
+        "response": "accept", "opportunity": True, "type": "group",
+    })
+
+    assert response.status_code == 200, response.get_json()
+    assert _placements(1, 2) == {1: (3, 2), 2: (1, lab)}
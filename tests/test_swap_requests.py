@@ -0,0 +1,58 @@
+from models import db, Request, Student, SwapGroupRequest
+
+
+def _move(student_id, **placement):
+    student = db.session.get(Student, student_id)
+    for column, value in placement.items():
+        setattr(student, column, value)
+    db.session.commit()
+
+
+def _post_swap(client, student_id, requested_id, swap_type="group"):
+    response = client.post("/requests/swap", json={
+        "requesting_student_id": student_id, "requested_id": requested_id,
+        "reason": "swap", "urgency": 2, "swap_type": swap_type,
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["requestId"]
+
+
+def _answer(client, swap_id, student_id, opportunity=True, response="accept"):
+    return client.patch("/requests/swap", json={
+        "swap_request_id": swap_id, "responding_student_id": student_id,
+        "response": response, "opportunity": opportunity, "type": "group",
+    })
+
+
+def test_open_swap_needs_a_student_of_the_requested_group(client):
+    request_id = _post_swap(client, 1, 3)  # student 1 wants tutorial T2 (group 3)
+    swap_id = SwapGroupRequest.query.filter_by(request_id=request_id).one().swap_group_request_id
+
+    # student 2 is in T1 like the requester
+    for response in ("accept", "reject"):
+        assert _answer(client, swap_id, 2, response=response).status_code == 409
+    assert db.session.get(Request, request_id).status == "pending"
+
+    _move(3, tutorial_group_id=3)
+    answer = _answer(client, swap_id, 3)
+    assert answer.status_code == 200, answer.get_json()
+    db.session.expire_all()
+    assert db.session.get(Student, 1).tutorial_group_id == 3
+    assert db.session.get(Student, 3).tutorial_group_id == 1
+
+
+def test_directed_swap_is_answered_by_its_student_only(client):
+    _move(3, tutorial_group_id=3)
+    request_id = _post_swap(client, 1, 3)
+    swap = SwapGroupRequest.query.filter_by(request_id=request_id).one()
+    swap.requested_student_id = 3
+    db.session.commit()
+
+    for student_id in (2, 4):
+        assert _answer(client, swap.swap_group_request_id, student_id, opportunity=False).status_code == 403
+    # a directed swap is not an open opportunity either
+    assert _answer(client, swap.swap_group_request_id, 3, opportunity=True).status_code == 400
+    assert db.session.get(Request, request_id).status == "pending"
+
+    assert _answer(client, swap.swap_group_request_id, 3, opportunity=False).status_code == 200
+    assert db.session.get(Request, request_id).status == "approved"